@@ -0,0 +1,65 @@
+"""
+Warm Chromium shared by the crews' Playwright runs.
+
+The backend launches `scripts/browser-server.mjs` (Playwright's
+`launchServer`) once and exports its ws endpoint as PLAYWRIGHT_BROWSER_WS,
+so CustomPlaywrightTool runs in every crew connect to it through
+`connectOptions` instead of cold-launching Chromium on each repair
+iteration. Each test still gets a fresh browser context. The process is
+managed by test_agent.servers.BrowserServer (the same code a standalone crew
+uses), driven from a thread. The tool prints `[browser] mode=warm run=...s`
+per run; those lines are collected here to report what the warm browser saves.
+"""
+import asyncio
+import re
+from typing import Dict, Optional
+
+from test_agent.servers import BrowserServer
+
+RUN_RE = re.compile(r'\[browser\] mode=(warm|cold) run=([\d.]+)s')
+
+
+class PlaywrightBrowserServer:
+    def __init__(self, cwd: str, script: str = 'scripts/browser-server.mjs'):
+        self.server = BrowserServer(cwd=cwd, script=script)
+        # per mode: running count / total seconds
+        self._runs: Dict[str, Dict[str, float]] = {}
+
+    @property
+    def ws(self) -> Optional[str]:
+        return self.server.ws
+
+    @property
+    def launch_s(self) -> Optional[float]:
+        return self.server.launch_s
+
+    async def start(self, timeout: float = 60.0) -> bool:
+        if await asyncio.to_thread(self.server.start, timeout):
+            return True
+        print('[browser-server] not available; crews launch their own browsers')
+        return False
+
+    async def stop(self) -> None:
+        await asyncio.to_thread(self.server.stop)
+
+    def record_run(self, mode: str, seconds: float) -> None:
+        agg = self._runs.setdefault(mode, {'count': 0, 'total_s': 0.0})
+        agg['count'] += 1
+        agg['total_s'] += seconds
+
+    def stats(self) -> Dict:
+        runs = {
+            m: {'count': int(a['count']), 'avg_s': round(a['total_s'] / a['count'], 3)}
+            for m, a in self._runs.items() if a['count']
+        }
+        warm = runs.get('warm', {}).get('count', 0)
+        # every warm run skips one browser launch
+        saved = self.launch_s
+        return {
+            'ws': self.ws,
+            'running': self.server.running,
+            'launch_s': round(self.launch_s, 3) if self.launch_s is not None else None,
+            'runs': runs,
+            'saved_per_run_s': round(saved, 3) if saved is not None else None,
+            'saved_total_s': round(saved * warm, 3) if saved is not None else None,
+        }
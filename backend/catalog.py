@@ -0,0 +1,66 @@
+"""
+Incrementally maintained test catalog behind `/api/tests`.
+
+The tests directory is re-scanned only when its mtime changes (adding,
+removing or renaming a spec touches it; editing one in place does not, and
+does not need to). Only specs not seen before are inserted into the index,
+in one transaction. Listings are served from the index with filtering,
+sorting and pagination, and carry an ETag derived from the directory
+snapshot and the index version, so an unchanged catalog answers 304.
+"""
+import hashlib
+import os
+import threading
+import time
+import uuid
+from typing import Dict, List, Optional, Set, Tuple
+
+from .index_store import TestIndexStore
+
+SPEC_SUFFIX = '.spec.ts'
+
+
+class TestCatalog:
+    def __init__(self, tests_dir: str, index: TestIndexStore):
+        self.tests_dir = str(tests_dir)
+        self.index = index
+        self._lock = threading.Lock()
+        self._dir_mtime_ns: Optional[int] = None
+        self._known: Set[str] = set()
+        # ETags must not survive a restart: index.version starts over at zero
+        self._boot = uuid.uuid4().hex[:8]
+
+    def refresh(self) -> bool:
+        """Sync new specs into the index if the directory changed. Returns True if it was rescanned."""
+        try:
+            mtime_ns = os.stat(self.tests_dir).st_mtime_ns
+        except OSError:
+            mtime_ns = -1
+        if mtime_ns == self._dir_mtime_ns:
+            return False
+        with self._lock:
+            if mtime_ns == self._dir_mtime_ns:
+                return False
+            found: Dict[str, int] = {}
+            if mtime_ns >= 0:
+                with os.scandir(self.tests_dir) as it:
+                    for entry in it:
+                        if entry.name.endswith(SPEC_SUFFIX) and entry.is_file():
+                            found[entry.name[:-len(SPEC_SUFFIX)]] = entry.stat().st_mtime_ns
+            new = [(name, time.strftime('%Y-%m-%dT%H:%M:%SZ', time.gmtime(m / 1e9)))
+                   for name, m in found.items() if name not in self._known]
+            self.index.ensure_many(new)
+            self._known = set(found)
+            self._dir_mtime_ns = mtime_ns
+        return True
+
+    def etag(self, *query) -> str:
+        key = repr((self._dir_mtime_ns, self.index.version) + query).encode()
+        return f'W/"{self._boot}-{self.index.version}-{hashlib.sha1(key).hexdigest()[:16]}"'
+
+    def page(self, status: Optional[str] = None, order_by: str = 'name', descending: bool = False,
+             limit: Optional[int] = None, offset: int = 0) -> Tuple[List[Dict], int]:
+        """One page of index rows and the total number of rows matching the filter."""
+        rows = self.index.list(status=status, order_by=order_by, descending=descending,
+                               limit=limit, offset=offset)
+        return rows, self.index.count(status=status)
@@ -0,0 +1,233 @@
+"""
+Pool of pre-warmed crew worker processes.
+
+Each worker runs `test_agent.worker`, which imports the crew once and then
+executes jobs sent over stdin. Output lines are handed to a per-job callback
+until the worker reports the job as done. Workers are recycled after
+`max_jobs` jobs (or when they die) so leaked state does not accumulate.
+Each worker runs in its own process group; closing the pool stops idle
+workers and takes down busy ones with their MCP/browser children.
+"""
+import asyncio
+import json
+import os
+import shlex
+import sys
+import time
+from shutil import which
+from typing import Awaitable, Callable, Dict, List, Optional, Set
+
+from test_agent.playwright_runs import kill_process_group_async, process_group_kwargs
+
+READY = "\x1e[crew-worker] ready"
+JOB_DONE = "\x1e[crew-worker] job-done "
+
+LineSink = Callable[[str], Awaitable[None]]
+
+
+class CrewPoolUnavailable(RuntimeError):
+    """Raised when no worker could be started; callers fall back to `crewai run`."""
+
+
+def worker_cmd() -> List[str]:
+    """
+    Return the command that starts one crew worker.
+    CREW_WORKER_CMD overrides; otherwise mirror `crewai run` and go through uv
+    when it is available so the worker uses the project environment.
+    """
+    override = os.environ.get("CREW_WORKER_CMD", "").strip()
+    if override:
+        return shlex.split(override, posix=os.name != "nt")
+    uv = which("uv")
+    if uv:
+        return [uv, "run", "crew_worker"]
+    return [sys.executable, "-m", "test_agent.worker"]
+
+
+class _Worker:
+    def __init__(self, proc: asyncio.subprocess.Process):
+        self.proc = proc
+        self.jobs_done = 0
+        self.busy = False
+
+    @property
+    def alive(self) -> bool:
+        return self.proc.returncode is None
+
+    async def readline(self) -> Optional[str]:
+        assert self.proc.stdout is not None
+        line = await self.proc.stdout.readline()
+        if not line:
+            return None
+        return line.decode(errors='ignore').rstrip()
+
+    async def stop(self, timeout: float = 10.0, grace_s: float = 5.0) -> None:
+        """Close stdin so the worker exits after its current job; kill its process group after `timeout`."""
+        if not self.alive:
+            return
+        try:
+            if self.proc.stdin is not None:
+                self.proc.stdin.close()
+            await asyncio.wait_for(self.proc.wait(), timeout)
+        except (asyncio.TimeoutError, ProcessLookupError, BrokenPipeError):
+            await kill_process_group_async(self.proc, grace_s)
+
+
+class CrewWorkerPool:
+    def __init__(self, size: int, max_jobs: int, cwd: str,
+                 env: Optional[Dict[str, str]] = None, cmd: Optional[List[str]] = None,
+                 startup_timeout: float = 180.0, retry_after: float = 60.0):
+        self.size = max(1, size)
+        self.max_jobs = max(1, max_jobs)
+        self.cwd = cwd
+        self.env = env
+        self.cmd = cmd or worker_cmd()
+        self.startup_timeout = startup_timeout
+        self.retry_after = retry_after
+        self._idle: asyncio.Queue = asyncio.Queue()
+        self._workers: Set[_Worker] = set()
+        self._live = 0
+        self._last_failure = 0.0
+        self._closed = False
+        self.jobs_total = 0
+        self.recycled = 0
+
+    async def start(self) -> None:
+        """Pre-spawn all workers in the background."""
+        for _ in range(self.size):
+            asyncio.create_task(self._replenish())
+
+    async def close(self, grace_s: float = 5.0) -> None:
+        """Stop every worker: idle ones via stdin EOF, busy ones by terminating their process group."""
+        self._closed = True
+        while not self._idle.empty():
+            self._idle.get_nowait()
+        workers = list(self._workers)
+        await asyncio.gather(*(
+            kill_process_group_async(w.proc, grace_s) if w.busy else w.stop(timeout=grace_s, grace_s=1.0)
+            for w in workers
+        ), return_exceptions=True)
+        self._workers.difference_update(workers)
+
+    async def _retire(self, worker: _Worker, timeout: float = 10.0) -> None:
+        try:
+            await worker.stop(timeout)
+        finally:
+            self._workers.discard(worker)
+
+    def stats(self) -> Dict:
+        return {
+            'size': self.size,
+            'max_jobs': self.max_jobs,
+            'live': self._live,
+            'idle': self._idle.qsize(),
+            'jobs_total': self.jobs_total,
+            'recycled': self.recycled,
+            'cmd': self.cmd,
+        }
+
+    async def _spawn(self) -> _Worker:
+        env = dict(self.env if self.env is not None else os.environ)
+        env.update({'PYTHONUNBUFFERED': '1', 'PYTHONIOENCODING': 'utf-8'})
+        proc = await asyncio.create_subprocess_exec(
+            *self.cmd,
+            cwd=self.cwd,
+            stdin=asyncio.subprocess.PIPE,
+            stdout=asyncio.subprocess.PIPE,
+            stderr=asyncio.subprocess.STDOUT,
+            env=env,
+            limit=1024 * 1024,
+            **process_group_kwargs(),
+        )
+        worker = _Worker(proc)
+        self._workers.add(worker)
+
+        async def _wait_ready() -> bool:
+            while True:
+                line = await worker.readline()
+                if line is None:
+                    return False
+                if line == READY:
+                    return True
+                print("[crew-pool]", line)
+
+        try:
+            ready = await asyncio.wait_for(_wait_ready(), self.startup_timeout)
+        except asyncio.TimeoutError:
+            ready = False
+        if not ready:
+            await self._retire(worker, timeout=1.0)
+            raise CrewPoolUnavailable(f"crew worker failed to start: {' '.join(self.cmd)}")
+        return worker
+
+    async def _replenish(self) -> None:
+        if self._closed:
+            return
+        self._live += 1
+        try:
+            worker = await self._spawn()
+        except (CrewPoolUnavailable, OSError) as e:
+            self._live -= 1
+            self._last_failure = time.monotonic()
+            print("[crew-pool]", e)
+            # wake one waiter so it can notice the pool is empty
+            self._idle.put_nowait(None)
+            return
+        self._last_failure = 0.0
+        self._idle.put_nowait(worker)
+
+    async def _acquire(self) -> _Worker:
+        while True:
+            if self._live == 0:
+                if self._last_failure and time.monotonic() - self._last_failure < self.retry_after:
+                    raise CrewPoolUnavailable("no crew workers available")
+                await self._replenish()
+                continue
+            worker = await self._idle.get()
+            if worker is None:
+                continue
+            if worker.alive:
+                return worker
+            self._live -= 1
+            self._workers.discard(worker)
+            asyncio.create_task(self._replenish())
+
+    async def run(self, job_env: Dict[str, str], on_line: LineSink) -> int:
+        """Run one crew job on a warm worker, streaming its output to `on_line`."""
+        worker = await self._acquire()
+        job_id = f"{id(worker)}-{worker.jobs_done}"
+        returncode = 1
+        finished = False
+        worker.busy = True
+        try:
+            assert worker.proc.stdin is not None
+            worker.proc.stdin.write((json.dumps({'id': job_id, 'env': job_env}) + "\n").encode())
+            await worker.proc.stdin.drain()
+            while True:
+                line = await worker.readline()
+                if line is None:
+                    break
+                if line.startswith(JOB_DONE):
+                    try:
+                        returncode = int(json.loads(line[len(JOB_DONE):]).get('returncode', 1))
+                    except ValueError:
+                        pass
+                    finished = True
+                    break
+                await on_line(line)
+        except (BrokenPipeError, ConnectionResetError):
+            pass
+        finally:
+            worker.busy = False
+            worker.jobs_done += 1
+            self.jobs_total += 1
+            if finished and worker.alive and worker.jobs_done < self.max_jobs and not self._closed:
+                self._idle.put_nowait(worker)
+            else:
+                self._live -= 1
+                self.recycled += 1
+                asyncio.create_task(self._retire(worker))
+                asyncio.create_task(self._replenish())
+        if not finished and worker.proc.returncode not in (None, 0):
+            returncode = worker.proc.returncode
+        return returncode
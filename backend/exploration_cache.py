@@ -0,0 +1,140 @@
+"""
+Content-addressed cache of cleaned exploration data.
+
+Entries are keyed by the normalized application URL plus a hash of the test
+description and stored one file per key. Entries expire after `ttl_s`; beyond
+`max_entries` the least recently used ones (by file mtime, refreshed on every
+hit) are evicted. Only a non-empty array of element objects is stored, so a
+crashed or truncated exploration cannot stand in for a real one.
+"""
+import hashlib
+import json
+import os
+import time
+from typing import Dict, Optional
+from urllib.parse import parse_qsl, urlencode, urlsplit, urlunsplit
+
+_DEFAULT_PORTS = {'http': 80, 'https': 443}
+
+
+def normalize_url(url: str) -> str:
+    parts = urlsplit(url.strip())
+    scheme = parts.scheme.lower()
+    host = (parts.hostname or '').lower()
+    if parts.port and parts.port != _DEFAULT_PORTS.get(scheme):
+        host = f'{host}:{parts.port}'
+    path = parts.path.rstrip('/') or '/'
+    query = urlencode(sorted(parse_qsl(parts.query, keep_blank_values=True)))
+    return urlunsplit((scheme, host, path, query, ''))
+
+
+def valid_exploration(data) -> bool:
+    """The exploration task's output shape: a non-empty JSON array of element objects."""
+    return isinstance(data, list) and bool(data) and all(isinstance(e, dict) and e for e in data)
+
+
+def description_hash(desc: str) -> str:
+    canonical = ' '.join(desc.split()).lower()
+    return hashlib.sha256(canonical.encode('utf-8')).hexdigest()
+
+
+class ExplorationCache:
+    def __init__(self, root: str, ttl_s: float, max_entries: int):
+        self.root = root
+        self.ttl_s = ttl_s
+        self.max_entries = max(1, max_entries)
+        os.makedirs(root, exist_ok=True)
+        self.hits = 0
+        self.misses = 0
+        self.refreshes = 0
+        self.stores = 0
+        self.rejected = 0
+        self.evictions = 0
+
+    def key(self, url: str, desc: str) -> str:
+        return hashlib.sha256(f'{normalize_url(url)}\n{description_hash(desc)}'.encode('utf-8')).hexdigest()
+
+    def _path(self, key: str) -> str:
+        return os.path.join(self.root, f'{key}.json')
+
+    def get(self, url: str, desc: str) -> Optional[str]:
+        """Return the cached exploration JSON text, or None on a miss."""
+        path = self._path(self.key(url, desc))
+        try:
+            with open(path, 'r', encoding='utf-8') as f:
+                entry = json.load(f)
+        except (OSError, ValueError):
+            self.misses += 1
+            return None
+        if time.time() - float(entry.get('created_at', 0)) > self.ttl_s or not valid_exploration(entry.get('data')):
+            self._remove(path)
+            self.misses += 1
+            return None
+        try:
+            os.utime(path)  # LRU bookkeeping
+        except OSError:
+            pass
+        self.hits += 1
+        return json.dumps(entry['data'], indent=2, ensure_ascii=False)
+
+    def put(self, url: str, desc: str, text: str) -> bool:
+        """Store exploration output if it is a valid exploration; returns False otherwise."""
+        try:
+            data = json.loads(text)
+        except ValueError:
+            return False
+        if not valid_exploration(data):
+            self.rejected += 1
+            return False
+        key = self.key(url, desc)
+        entry = {
+            'url': normalize_url(url),
+            'description_sha256': description_hash(desc),
+            'created_at': time.time(),
+            'data': data,
+        }
+        path = self._path(key)
+        tmp = f'{path}.{os.getpid()}.tmp'
+        with open(tmp, 'w', encoding='utf-8') as f:
+            json.dump(entry, f, ensure_ascii=False)
+        os.replace(tmp, path)
+        self.stores += 1
+        self._evict()
+        return True
+
+    def _remove(self, path: str) -> None:
+        try:
+            os.remove(path)
+            self.evictions += 1
+        except OSError:
+            pass
+
+    def _evict(self) -> None:
+        try:
+            entries = [e for e in os.scandir(self.root) if e.name.endswith('.json')]
+        except OSError:
+            return
+        if len(entries) <= self.max_entries:
+            return
+        entries.sort(key=lambda e: e.stat().st_mtime)
+        for e in entries[:len(entries) - self.max_entries]:
+            self._remove(e.path)
+
+    def stats(self) -> Dict:
+        lookups = self.hits + self.misses
+        try:
+            entries = sum(1 for e in os.scandir(self.root) if e.name.endswith('.json'))
+        except OSError:
+            entries = 0
+        return {
+            'entries': entries,
+            'max_entries': self.max_entries,
+            'ttl_s': self.ttl_s,
+            'hits': self.hits,
+            'misses': self.misses,
+            'refreshes': self.refreshes,
+            'stores': self.stores,
+            'rejected': self.rejected,
+            'evictions': self.evictions,
+            'hit_rate': round(self.hits / lookups, 3) if lookups else None,
+        }
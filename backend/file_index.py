@@ -0,0 +1,195 @@
+"""
+In-memory lookup of test names to spec and scenario files.
+
+Built once at startup from `tests/` and the scenarios directory, then kept
+current by the code paths that write or move those files (`note`/`forget`);
+a hit whose file has since disappeared is dropped instead of returned. Lookups
+are dictionary hits with exact-match semantics: a name resolves to the spec
+whose path under `tests/` (minus `.spec.ts`/`.test.ts`/`.spec.js`/`.test.js`/`.ts`) is that name,
+or, failing that, to the only spec anywhere under `tests/` with that file
+stem. Files dropped in by hand are picked up on the next miss after the
+directory's mtime changed.
+"""
+import os
+import pathlib
+import threading
+from typing import Dict, Optional, Set
+
+SPEC_EXTS = ('.spec.ts', '.test.ts', '.spec.js', '.test.js', '.ts')
+# the extensions Playwright collects as test files
+TEST_FILE_EXTS = SPEC_EXTS[:-1]
+SCENARIOS_SUFFIX = '_test_cases.json'
+
+
+def spec_key(rel: str) -> Optional[str]:
+    """'login/basic.spec.ts' -> 'login/basic'; None for files that are not specs."""
+    rel = rel.replace('\\', '/')
+    if '.codegen.' in rel or '.bak.' in rel:
+        return None
+    for ext in SPEC_EXTS:
+        if rel.endswith(ext):
+            return rel[:-len(ext)]
+    return None
+
+
+def _rank(rel: str, key: str) -> int:
+    return SPEC_EXTS.index(rel[len(key):])
+
+
+def is_test_file(rel: str) -> bool:
+    """True for a spec Playwright runs; False for backups, codegen scratch and plain modules."""
+    key = spec_key(rel)
+    return key is not None and rel.replace('\\', '/')[len(key):] in TEST_FILE_EXTS
+
+
+class FileIndex:
+    def __init__(self, repo_root: pathlib.Path, tests_dir: pathlib.Path, scenario_dir: pathlib.Path):
+        self.repo_root = pathlib.Path(repo_root)
+        self.tests_dir = pathlib.Path(tests_dir)
+        self.scenario_dir = pathlib.Path(scenario_dir)
+        self._lock = threading.Lock()
+        self._specs: Dict[str, str] = {}          # key under tests/ -> repo-relative path
+        self._ranks: Dict[str, int] = {}          # key -> SPEC_EXTS index of the indexed file
+        self._stems: Dict[str, Set[str]] = {}     # file stem -> keys with that stem
+        self._scenarios: Dict[str, str] = {}      # test name -> absolute path
+        self._mtimes: Dict[str, int] = {}
+
+    def _dir_mtime(self, d: pathlib.Path) -> int:
+        try:
+            return os.stat(d).st_mtime_ns
+        except OSError:
+            return -1
+
+    def _spec_rel(self, rel: str) -> str:
+        return f'{self.tests_dir.relative_to(self.repo_root).as_posix()}/{rel}'
+
+    def _build_specs(self) -> None:
+        specs: Dict[str, str] = {}
+        ranks: Dict[str, int] = {}
+        stems: Dict[str, Set[str]] = {}
+        mtime = self._dir_mtime(self.tests_dir)
+        if mtime >= 0:
+            for root, _, files in os.walk(self.tests_dir):
+                for f in files:
+                    rel = os.path.relpath(os.path.join(root, f), self.tests_dir).replace('\\', '/')
+                    key = spec_key(rel)
+                    if not key:
+                        continue
+                    rank = _rank(rel, key)
+                    if rank < ranks.get(key, len(SPEC_EXTS)):  # earlier in SPEC_EXTS wins
+                        specs[key], ranks[key] = self._spec_rel(rel), rank
+                        stems.setdefault(key.rsplit('/', 1)[-1], set()).add(key)
+        with self._lock:
+            self._specs, self._ranks, self._stems = specs, ranks, stems
+            self._mtimes['tests'] = mtime
+
+    def _build_scenarios(self) -> None:
+        scenarios: Dict[str, str] = {}
+        mtime = self._dir_mtime(self.scenario_dir)
+        if mtime >= 0:
+            for f in os.listdir(self.scenario_dir):
+                if f.endswith(SCENARIOS_SUFFIX) and not f.startswith('.'):
+                    scenarios[f[:-len(SCENARIOS_SUFFIX)]] = str(self.scenario_dir / f)
+        with self._lock:
+            self._scenarios = scenarios
+            self._mtimes['scenarios'] = mtime
+
+    def build(self) -> None:
+        self._build_specs()
+        self._build_scenarios()
+
+    def _rebuild_if_changed(self, which: str) -> bool:
+        d = self.tests_dir if which == 'tests' else self.scenario_dir
+        if self._dir_mtime(d) == self._mtimes.get(which):
+            return False
+        (self._build_specs if which == 'tests' else self._build_scenarios)()
+        return True
+
+    def note(self, path) -> None:
+        """Record a spec or scenarios file that was just written."""
+        p = pathlib.Path(path).resolve()
+        with self._lock:
+            if p.parent == self.scenario_dir.resolve() and p.name.endswith(SCENARIOS_SUFFIX):
+                self._scenarios[p.name[:-len(SCENARIOS_SUFFIX)]] = str(self.scenario_dir / p.name)
+                return
+            try:
+                rel = p.relative_to(self.tests_dir.resolve()).as_posix()
+            except ValueError:
+                return
+            key = spec_key(rel)
+            if not key:
+                return
+            rank = _rank(rel, key)
+            # same precedence as the startup build: a .spec.ts beside a .ts keeps the key
+            if rank <= self._ranks.get(key, len(SPEC_EXTS)) or not self._exists(self._specs[key]):
+                self._specs[key], self._ranks[key] = self._spec_rel(rel), rank
+                self._stems.setdefault(key.rsplit('/', 1)[-1], set()).add(key)
+
+    def forget(self, path) -> None:
+        """Drop a spec or scenarios file that was removed or moved away."""
+        p = pathlib.Path(path).resolve()
+        with self._lock:
+            if p.parent == self.scenario_dir.resolve():
+                name = p.name[:-len(SCENARIOS_SUFFIX)] if p.name.endswith(SCENARIOS_SUFFIX) else None
+                if name and self._scenarios.get(name) == str(self.scenario_dir / p.name):
+                    del self._scenarios[name]
+                return
+            try:
+                rel = p.relative_to(self.tests_dir.resolve()).as_posix()
+            except ValueError:
+                return
+            key = spec_key(rel)
+            if key and self._specs.get(key, '').endswith('/' + rel):
+                self._drop_spec(key)
+
+    def _drop_spec(self, key: str) -> None:
+        # caller holds the lock
+        self._specs.pop(key, None)
+        self._ranks.pop(key, None)
+        self._stems.get(key.rsplit('/', 1)[-1], set()).discard(key)
+
+    def _exists(self, spec_rel: str) -> bool:
+        return os.path.isfile(self.repo_root / spec_rel)
+
+    def _spec_lookup(self, key: str) -> Optional[str]:
+        with self._lock:
+            hit = self._specs.get(key)
+            if not hit:
+                keys = self._stems.get(key.rsplit('/', 1)[-1]) or set()
+                if len(keys) != 1:
+                    return None
+                key = next(iter(keys))
+                hit = self._specs[key]
+            if self._exists(hit):
+                return hit
+            # deleted or moved behind our back: drop it so the rebuild below can find its replacement
+            self._drop_spec(key)
+            return None
+
+    def spec(self, name: str) -> Optional[str]:
+        """Repo-relative path of the spec for a name like 'login', 'tests/login' or 'login.spec.ts'."""
+        s = name.replace('\\', '/')
+        while s.startswith('./'):
+            s = s[2:]
+        tests_rel = self.tests_dir.relative_to(self.repo_root).as_posix() + '/'
+        if s.startswith(tests_rel):
+            s = s[len(tests_rel):]
+        key = spec_key(s) or s
+        hit = self._spec_lookup(key)
+        if hit is None and self._rebuild_if_changed('tests'):
+            hit = self._spec_lookup(key)
+        return hit
+
+    def scenarios(self, test_name: str) -> Optional[str]:
+        """Scenarios file for a test name; 'foo_test' also matches 'foo_test_cases.json'."""
+        candidates = [test_name]
+        if test_name.endswith('_test'):
+            candidates.append(test_name[:-5])
+        for attempt in range(2):
+            for c in candidates:
+                hit = self._scenarios.get(c)
+                if hit and os.path.isfile(hit):
+                    return hit
+            if attempt == 0 and not self._rebuild_if_changed('scenarios'):
+                break
+        return None
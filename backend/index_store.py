@@ -0,0 +1,351 @@
+"""
+Test metadata store backed by SQLite in WAL mode.
+
+Replaces the read-modify-write cycle on data/tests_index.json with point
+updates inside short transactions, so concurrent runs finishing together no
+longer lose each other's writes. Rows keep the shape of the old JSON entries.
+Per-test Playwright results of recent runs live in `test_results`, and
+per-task crew telemetry spans in `task_spans`.
+`version` counts committed changes to `tests` in this process, so callers can
+tell cheaply whether a listing could have changed.
+"""
+import json
+import os
+import sqlite3
+import threading
+from typing import Dict, List, Optional
+
+FIELDS = ('name', 'created_at', 'last_run_at', 'last_status', 'last_report_file', 'last_app_url')
+SORTABLE = ('name', 'created_at', 'last_run_at', 'last_status')
+# per-test rows parsed from the Playwright JSON reporter
+RESULT_FIELDS = ('file', 'line', 'title', 'project', 'status', 'duration_ms', 'retries', 'error', 'error_location')
+# per-task spans from the crew's telemetry.json
+SPAN_FIELDS = ('task', 'agent', 'model', 'status', 'started_at', 'duration_s', 'attempts', 'llm_calls',
+               'llm_failures', 'llm_s', 'prompt_tokens', 'completion_tokens', 'cached_prompt_tokens',
+               'total_tokens', 'cost_usd', 'tool_calls_mcp', 'tool_calls_playwright', 'tool_calls_other',
+               'tool_s', 'tool_errors', 'tool_retries')
+SPAN_GROUPS = ('task', 'agent')
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS tests (
+    name             TEXT PRIMARY KEY,
+    created_at       TEXT,
+    last_run_at      TEXT,
+    last_status      TEXT,
+    last_report_file TEXT,
+    last_app_url     TEXT
+);
+CREATE INDEX IF NOT EXISTS idx_tests_status ON tests(last_status);
+CREATE INDEX IF NOT EXISTS idx_tests_last_run_at ON tests(last_run_at);
+CREATE TABLE IF NOT EXISTS test_results (
+    id             INTEGER PRIMARY KEY AUTOINCREMENT,
+    test_name      TEXT NOT NULL,
+    run_at         TEXT NOT NULL,
+    file           TEXT,
+    line           INTEGER,
+    title          TEXT,
+    project        TEXT,
+    status         TEXT,
+    duration_ms    INTEGER,
+    retries        INTEGER,
+    error          TEXT,
+    error_location TEXT
+);
+CREATE INDEX IF NOT EXISTS idx_results_test ON test_results(test_name, run_at);
+CREATE TABLE IF NOT EXISTS task_spans (
+    id                    INTEGER PRIMARY KEY AUTOINCREMENT,
+    run_id                TEXT NOT NULL,
+    job                   TEXT,
+    test_name             TEXT,
+    mode                  TEXT,
+    task                  TEXT,
+    agent                 TEXT,
+    model                 TEXT,
+    status                TEXT,
+    started_at            REAL,
+    duration_s            REAL,
+    attempts              INTEGER,
+    llm_calls             INTEGER,
+    llm_failures          INTEGER,
+    llm_s                 REAL,
+    prompt_tokens         INTEGER,
+    completion_tokens     INTEGER,
+    cached_prompt_tokens  INTEGER,
+    total_tokens          INTEGER,
+    cost_usd              REAL,
+    tool_calls_mcp        INTEGER,
+    tool_calls_playwright INTEGER,
+    tool_calls_other      INTEGER,
+    tool_s                REAL,
+    tool_errors           INTEGER,
+    tool_retries          INTEGER
+);
+CREATE INDEX IF NOT EXISTS idx_spans_run ON task_spans(run_id);
+CREATE INDEX IF NOT EXISTS idx_spans_started ON task_spans(started_at);
+CREATE TABLE IF NOT EXISTS meta (
+    key   TEXT PRIMARY KEY,
+    value TEXT
+);
+"""
+
+
+class TestIndexStore:
+    def __init__(self, db_path: str, results_keep: int = 20):
+        self.db_path = db_path
+        self.results_keep = max(1, results_keep)
+        self._lock = threading.RLock()
+        self.version = 0
+        self._conn = sqlite3.connect(db_path, check_same_thread=False, isolation_level=None, timeout=30)
+        self._conn.row_factory = sqlite3.Row
+        self._conn.execute('PRAGMA journal_mode=WAL')
+        self._conn.execute('PRAGMA synchronous=NORMAL')
+        self._conn.executescript(_SCHEMA)
+
+    def _write(self, sql: str, params=()) -> sqlite3.Cursor:
+        with self._lock:
+            self._conn.execute('BEGIN IMMEDIATE')
+            try:
+                cur = self._conn.execute(sql, params)
+                self._conn.execute('COMMIT')
+                if cur.rowcount:
+                    self.version += 1
+                return cur
+            except Exception:
+                self._conn.execute('ROLLBACK')
+                raise
+
+    def _read(self, sql: str, params=()) -> List[sqlite3.Row]:
+        with self._lock:
+            return self._conn.execute(sql, params).fetchall()
+
+    def migrate_json(self, json_path: str) -> int:
+        """One-time import of the legacy JSON index; the file is renamed afterwards."""
+        if not os.path.exists(json_path):
+            return 0
+        if self._read("SELECT 1 FROM meta WHERE key = 'migrated_from_json'"):
+            return 0
+        try:
+            with open(json_path, 'r', encoding='utf-8') as f:
+                legacy = json.load(f)
+        except Exception:
+            legacy = {}
+        rows = []
+        for name, entry in (legacy or {}).items():
+            entry = entry or {}
+            rows.append(tuple([name] + [entry.get(k) for k in FIELDS[1:]]))
+        with self._lock:
+            self._conn.execute('BEGIN IMMEDIATE')
+            try:
+                self._conn.executemany(
+                    f"INSERT OR IGNORE INTO tests ({', '.join(FIELDS)}) VALUES ({', '.join('?' * len(FIELDS))})",
+                    rows,
+                )
+                self._conn.execute(
+                    "INSERT OR REPLACE INTO meta (key, value) VALUES ('migrated_from_json', ?)", (json_path,))
+                self._conn.execute('COMMIT')
+                self.version += 1
+            except Exception:
+                self._conn.execute('ROLLBACK')
+                raise
+        try:
+            os.replace(json_path, json_path + '.migrated')
+        except OSError:
+            pass
+        return len(rows)
+
+    def get(self, name: str) -> Optional[Dict]:
+        rows = self._read('SELECT * FROM tests WHERE name = ?', (name,))
+        return dict(rows[0]) if rows else None
+
+    def ensure(self, name: str, created_at: str) -> bool:
+        """Insert a fresh entry unless one exists. Returns True if inserted."""
+        cur = self._write('INSERT OR IGNORE INTO tests (name, created_at) VALUES (?, ?)', (name, created_at))
+        return cur.rowcount > 0
+
+    def ensure_many(self, entries: List[tuple]) -> int:
+        """Bulk `ensure` of (name, created_at) rows in one transaction. Returns how many were inserted."""
+        if not entries:
+            return 0
+        with self._lock:
+            self._conn.execute('BEGIN IMMEDIATE')
+            try:
+                before = self._conn.total_changes
+                self._conn.executemany('INSERT OR IGNORE INTO tests (name, created_at) VALUES (?, ?)', entries)
+                inserted = self._conn.total_changes - before
+                self._conn.execute('COMMIT')
+            except Exception:
+                self._conn.execute('ROLLBACK')
+                raise
+            if inserted:
+                self.version += 1
+        return inserted
+
+    def update(self, name: str, **fields) -> None:
+        """Point update of the given columns; creates the row if needed."""
+        unknown = set(fields) - set(FIELDS[1:])
+        if unknown:
+            raise ValueError(f'Unknown index fields: {sorted(unknown)}')
+        if not fields:
+            return
+        cols = list(fields)
+        sql = (
+            f"INSERT INTO tests (name, {', '.join(cols)}) VALUES (?, {', '.join('?' * len(cols))}) "
+            f"ON CONFLICT(name) DO UPDATE SET {', '.join(f'{c} = excluded.{c}' for c in cols)}"
+        )
+        self._write(sql, [name] + [fields[c] for c in cols])
+
+    def record_run(self, name: str, run_at: str, status: Optional[str], report_file: Optional[str]) -> None:
+        """Stamp a finished run; status/report are only overwritten when known."""
+        self._write(
+            "INSERT INTO tests (name, created_at, last_run_at, last_status, last_report_file) "
+            "VALUES (?, ?, ?, ?, ?) "
+            "ON CONFLICT(name) DO UPDATE SET last_run_at = excluded.last_run_at, "
+            "last_status = COALESCE(excluded.last_status, last_status), "
+            "last_report_file = COALESCE(excluded.last_report_file, last_report_file)",
+            (name, run_at, run_at, status, report_file),
+        )
+
+    def record_runs(self, runs: List[tuple]) -> int:
+        """Bulk `record_run` of (name, run_at, status, report_file) rows in one transaction."""
+        if not runs:
+            return 0
+        with self._lock:
+            self._conn.execute('BEGIN IMMEDIATE')
+            try:
+                self._conn.executemany(
+                    "INSERT INTO tests (name, created_at, last_run_at, last_status, last_report_file) "
+                    "VALUES (?1, ?2, ?2, ?3, ?4) "
+                    "ON CONFLICT(name) DO UPDATE SET last_run_at = excluded.last_run_at, "
+                    "last_status = COALESCE(excluded.last_status, last_status), "
+                    "last_report_file = COALESCE(excluded.last_report_file, last_report_file)",
+                    runs,
+                )
+                self._conn.execute('COMMIT')
+                self.version += 1
+            except Exception:
+                self._conn.execute('ROLLBACK')
+                raise
+        return len(runs)
+
+    def record_results(self, run_at: str, rows: List[Dict]) -> int:
+        """
+        Store per-test results of one Playwright run (rows carry `test_name`) and
+        keep only the newest `results_keep` runs per test.
+        """
+        if not rows:
+            return 0
+        cols = ('test_name', 'run_at') + RESULT_FIELDS
+        names = sorted({r['test_name'] for r in rows})
+        with self._lock:
+            self._conn.execute('BEGIN IMMEDIATE')
+            try:
+                self._conn.executemany(
+                    f"INSERT INTO test_results ({', '.join(cols)}) VALUES ({', '.join('?' * len(cols))})",
+                    [tuple([r['test_name'], run_at] + [r.get(c) for c in RESULT_FIELDS]) for r in rows],
+                )
+                self._conn.executemany(
+                    "DELETE FROM test_results WHERE test_name = ?1 AND run_at NOT IN "
+                    "(SELECT DISTINCT run_at FROM test_results WHERE test_name = ?1 ORDER BY run_at DESC LIMIT ?2)",
+                    [(n, self.results_keep) for n in names],
+                )
+                self._conn.execute('COMMIT')
+            except Exception:
+                self._conn.execute('ROLLBACK')
+                raise
+        return len(rows)
+
+    def results(self, name: str, runs: int = 1) -> List[Dict]:
+        """Per-test rows of the newest `runs` runs of a test, newest first."""
+        sql = (
+            f"SELECT test_name, run_at, {', '.join(RESULT_FIELDS)} FROM test_results WHERE test_name = ?1 AND run_at IN "
+            "(SELECT DISTINCT run_at FROM test_results WHERE test_name = ?1 ORDER BY run_at DESC LIMIT ?2) "
+            "ORDER BY run_at DESC, id ASC"
+        )
+        return [dict(r) for r in self._read(sql, (name, max(1, runs)))]
+
+    def slowest(self, limit: int = 20) -> List[Dict]:
+        """Slowest tests across all specs, using each test's latest run."""
+        sql = (
+            f"SELECT r.test_name, r.run_at, {', '.join('r.' + c for c in RESULT_FIELDS)} FROM test_results r "
+            "JOIN (SELECT test_name, MAX(run_at) AS run_at FROM test_results GROUP BY test_name) latest "
+            "ON r.test_name = latest.test_name AND r.run_at = latest.run_at "
+            "ORDER BY r.duration_ms DESC LIMIT ?"
+        )
+        return [dict(r) for r in self._read(sql, (limit,))]
+
+    def record_spans(self, run_id: str, job: str, test_name: Optional[str], mode: Optional[str],
+                     tasks: List[Dict], keep: int = 5000) -> int:
+        """Store the task spans of one crew job; keeps the newest `keep` spans overall."""
+        if not tasks:
+            return 0
+        cols = ('run_id', 'job', 'test_name', 'mode') + SPAN_FIELDS
+        rows = []
+        for t in tasks:
+            calls = t.get('tool_calls') or {}
+            flat = dict(t, tool_calls_mcp=calls.get('mcp', 0), tool_calls_playwright=calls.get('playwright', 0),
+                        tool_calls_other=calls.get('other', 0))
+            rows.append(tuple([run_id, job, test_name, mode] + [flat.get(c) for c in SPAN_FIELDS]))
+        with self._lock:
+            self._conn.execute('BEGIN IMMEDIATE')
+            try:
+                self._conn.executemany(
+                    f"INSERT INTO task_spans ({', '.join(cols)}) VALUES ({', '.join('?' * len(cols))})", rows)
+                self._conn.execute(
+                    'DELETE FROM task_spans WHERE id <= (SELECT id FROM task_spans ORDER BY id DESC LIMIT 1 OFFSET ?)',
+                    (max(1, keep),))
+                self._conn.execute('COMMIT')
+            except Exception:
+                self._conn.execute('ROLLBACK')
+                raise
+        return len(rows)
+
+    def run_spans(self, run_id: str) -> List[Dict]:
+        return [dict(r) for r in self._read('SELECT * FROM task_spans WHERE run_id = ? ORDER BY id', (run_id,))]
+
+    def span_summary(self, by: str = 'task', runs: int = 50, mode: Optional[str] = None) -> List[Dict]:
+        """Per-task (or per-agent) aggregates over the newest `runs` runs, slowest total first."""
+        if by not in SPAN_GROUPS:
+            raise ValueError(f'Cannot group spans by {by!r}')
+        where, params = '', []
+        if mode:
+            where, params = 'WHERE mode = ?', [mode]
+        sql = (
+            f"SELECT {by} AS name, COUNT(*) AS spans, COUNT(DISTINCT run_id) AS runs, "
+            "SUM(duration_s) AS total_s, AVG(duration_s) AS avg_s, MAX(duration_s) AS max_s, "
+            "AVG(llm_calls) AS avg_llm_calls, AVG(llm_s) AS avg_llm_s, "
+            "SUM(prompt_tokens) AS prompt_tokens, SUM(completion_tokens) AS completion_tokens, "
+            "SUM(total_tokens) AS total_tokens, AVG(total_tokens) AS avg_tokens, SUM(cost_usd) AS cost_usd, "
+            "SUM(tool_calls_mcp) AS tool_calls_mcp, SUM(tool_calls_playwright) AS tool_calls_playwright, "
+            "SUM(tool_calls_other) AS tool_calls_other, SUM(tool_errors) AS tool_errors, "
+            "SUM(attempts - 1) + SUM(tool_retries) AS retries, "
+            "SUM(CASE WHEN status = 'failed' THEN 1 ELSE 0 END) AS failed "
+            f"FROM task_spans WHERE run_id IN (SELECT run_id FROM task_spans {where} "
+            "GROUP BY run_id ORDER BY MAX(id) DESC LIMIT ?) "
+            f"{'AND mode = ?' if mode else ''} GROUP BY {by} ORDER BY total_s DESC"
+        )
+        params = params + [max(1, runs)] + ([mode] if mode else [])
+        return [dict(r) for r in self._read(sql, params)]
+
+    def list(self, status: Optional[str] = None, order_by: str = 'name', descending: bool = False,
+             limit: Optional[int] = None, offset: int = 0) -> List[Dict]:
+        if order_by not in SORTABLE:
+            raise ValueError(f'Cannot sort by {order_by!r}')
+        sql = 'SELECT * FROM tests'
+        params: list = []
+        if status:
+            sql += ' WHERE last_status = ?'
+            params.append(status)
+        sql += f" ORDER BY {order_by} {'DESC' if descending else 'ASC'}, name ASC"
+        if limit is not None:
+            sql += ' LIMIT ? OFFSET ?'
+            params += [limit, offset]
+        return [dict(r) for r in self._read(sql, params)]
+
+    def count(self, status: Optional[str] = None) -> int:
+        if status:
+            return self._read('SELECT COUNT(*) FROM tests WHERE last_status = ?', (status,))[0][0]
+        return self._read('SELECT COUNT(*) FROM tests')[0][0]
+
+    def close(self) -> None:
+        with self._lock:
+            self._conn.close()
@@ -0,0 +1,111 @@
+"""
+Long-running Playwright MCP server shared by all crew runs.
+
+The backend starts `@playwright/mcp` once in SSE mode; crews connect to it
+instead of launching their own `npx -y @playwright/mcp@latest` over stdio.
+The server runs with `--isolated`, so every client session (one per crew
+run) gets its own in-memory browser context. Crews fall back to stdio when
+the server is not reachable.
+"""
+import asyncio
+import os
+import time
+from shutil import which
+from typing import Dict, List, Optional
+
+from test_agent.servers import endpoint_reachable as server_reachable
+
+DEFAULT_PORT = 8931
+
+
+class PlaywrightMCPServer:
+    def __init__(self, port: int = DEFAULT_PORT, host: str = '127.0.0.1',
+                 package: str = '@playwright/mcp@latest', extra_args: Optional[List[str]] = None):
+        self.host = host
+        self.port = port
+        self.package = package
+        self.extra_args = extra_args or []
+        self.proc: Optional[asyncio.subprocess.Process] = None
+        self.external = False
+        self.boot_seconds: Optional[float] = None
+        # per transport: running count / total / max of connect times (bounded however long we run)
+        self._connects: Dict[str, Dict[str, float]] = {}
+
+    @property
+    def url(self) -> str:
+        return f"http://{self.host}:{self.port}/sse"
+
+    def cmd(self) -> List[str]:
+        npx = which("npx") or "npx"
+        return [npx, "-y", self.package, "--host", self.host, "--port", str(self.port),
+                "--isolated", *self.extra_args]
+
+    async def start(self, timeout: float = 120.0) -> bool:
+        """Start the server (or adopt one already listening) and wait until it accepts connections."""
+        # the probe is a blocking socket connect; keep it off the event loop
+        if await asyncio.to_thread(server_reachable, self.url):
+            self.external = True
+            return True
+        t0 = time.perf_counter()
+        try:
+            self.proc = await asyncio.create_subprocess_exec(
+                *self.cmd(),
+                stdout=asyncio.subprocess.PIPE,
+                stderr=asyncio.subprocess.STDOUT,
+            )
+        except OSError as e:
+            print("[mcp-server] failed to launch:", e)
+            return False
+        asyncio.create_task(self._drain())
+
+        deadline = t0 + timeout
+        while time.perf_counter() < deadline:
+            if self.proc.returncode is not None:
+                print(f"[mcp-server] exited during startup (code {self.proc.returncode})")
+                return False
+            if await asyncio.to_thread(server_reachable, self.url, 0.2):
+                self.boot_seconds = time.perf_counter() - t0
+                print(f"[mcp-server] listening on {self.url} (boot {self.boot_seconds:.2f}s)")
+                return True
+            await asyncio.sleep(0.25)
+        print("[mcp-server] did not become ready in time")
+        await self.stop()
+        return False
+
+    async def _drain(self) -> None:
+        assert self.proc is not None and self.proc.stdout is not None
+        async for line in self.proc.stdout:
+            print("[mcp-server]", line.decode("utf-8", "ignore").rstrip())
+
+    async def stop(self) -> None:
+        if self.proc is None or self.proc.returncode is not None:
+            return
+        self.proc.terminate()
+        try:
+            await asyncio.wait_for(self.proc.wait(), 10)
+        except asyncio.TimeoutError:
+            self.proc.kill()
+            await self.proc.wait()
+
+    def record_connect(self, transport: str, seconds: float) -> None:
+        agg = self._connects.setdefault(transport, {'count': 0, 'total_s': 0.0, 'max_s': 0.0})
+        agg['count'] += 1
+        agg['total_s'] += seconds
+        agg['max_s'] = max(agg['max_s'], seconds)
+
+    def stats(self) -> Dict:
+        connects = {
+            t: {'count': int(a['count']), 'avg_s': round(a['total_s'] / a['count'], 3), 'max_s': round(a['max_s'], 3)}
+            for t, a in self._connects.items() if a['count']
+        }
+        # What each run would pay to boot its own server, minus what it pays to connect.
+        cold = connects.get('stdio', {}).get('avg_s', self.boot_seconds)
+        warm = connects.get('sse', {}).get('avg_s')
+        return {
+            'url': self.url,
+            'running': self.external or (self.proc is not None and self.proc.returncode is None),
+            'external': self.external,
+            'boot_s': round(self.boot_seconds, 3) if self.boot_seconds is not None else None,
+            'connects': connects,
+            'saved_per_run_s': round(cold - warm, 3) if cold is not None and warm is not None else None,
+        }
@@ -0,0 +1,72 @@
+"""
+Subprocess helpers for long-running Playwright commands.
+
+Children are started in their own process group (session on POSIX) so a
+timeout can take down the whole tree (test runner, workers, browsers); the
+group helpers live in test_agent.playwright_runs, shared with
+CustomPlaywrightTool. Output is kept in memory only up to a cap: the first
+and last lines survive, with a truncation marker in between. The full output
+lives in the run log.
+"""
+import asyncio
+from collections import deque
+from typing import Awaitable, Callable, Deque, List
+
+OVERLONG_LINE = '[... overlong output line dropped ...]'
+
+
+class CappedOutput:
+    """Keeps about `cap` bytes of output: half from the start, half from the end."""
+
+    def __init__(self, cap: int):
+        self.cap = max(2, cap)
+        self.head: List[str] = []
+        self.head_bytes = 0
+        self.tail: Deque[str] = deque()
+        self.tail_bytes = 0
+        self.total_bytes = 0
+        self.dropped_lines = 0
+        self.dropped_bytes = 0
+
+    def add(self, line: str) -> None:
+        n = len(line.encode('utf-8', errors='replace')) + 1
+        self.total_bytes += n
+        if not self.tail and self.head_bytes + n <= self.cap // 2:
+            self.head.append(line)
+            self.head_bytes += n
+            return
+        self.tail.append(line)
+        self.tail_bytes += n
+        while self.tail and self.tail_bytes > self.cap - self.cap // 2:
+            dropped = self.tail.popleft()
+            size = len(dropped.encode('utf-8', errors='replace')) + 1
+            self.tail_bytes -= size
+            self.dropped_lines += 1
+            self.dropped_bytes += size
+
+    @property
+    def truncated(self) -> bool:
+        return self.dropped_lines > 0
+
+    def text(self) -> str:
+        lines = list(self.head)
+        if self.truncated:
+            lines.append(f'[... {self.dropped_lines} line(s), {self.dropped_bytes} bytes truncated; '
+                         f'the run log has the full output ...]')
+        lines.extend(self.tail)
+        return '\n'.join(lines)
+
+
+async def pump_lines(stream: asyncio.StreamReader, buf: CappedOutput,
+                     sink: Callable[[str], Awaitable[None]]) -> None:
+    """Forward a child's output line by line into `buf` and `sink` until EOF."""
+    while True:
+        try:
+            raw = await stream.readline()
+        except ValueError:  # line longer than the stream limit; asyncio has discarded it
+            raw = (OVERLONG_LINE + '\n').encode()
+        if not raw:
+            return
+        line = raw.decode(errors='replace').rstrip('\r\n')
+        buf.add(line)
+        await sink(line)
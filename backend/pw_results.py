@@ -0,0 +1,80 @@
+"""
+Playwright JSON reporter ingestion.
+
+Every Playwright run started by the backend (and by CustomPlaywrightTool in
+the crew) adds the `json` reporter next to `list`, writing to a file named
+through PLAYWRIGHT_JSON_OUTPUT_NAME. This module flattens that report into
+per-test rows (status, duration, retries, error and its location) and derives
+the overall run status from the reporter's stats. The report walk is shared
+with the tool's failure digest (test_agent.playwright_runs).
+"""
+import json
+import os
+from typing import Dict, List, Optional
+
+from test_agent.playwright_runs import error_location, final_result, iter_tests, result_error, strip_ansi
+
+JSON_REPORT_NAME = 'playwright-results.json'
+
+# Playwright's test outcome -> the status we store
+_OUTCOME = {'expected': 'passed', 'unexpected': 'failed', 'flaky': 'flaky', 'skipped': 'skipped'}
+
+
+def json_reporter_env(path) -> Dict[str, str]:
+    # older Playwright releases read _NAME, newer ones _FILE
+    return {'PLAYWRIGHT_JSON_OUTPUT_NAME': str(path), 'PLAYWRIGHT_JSON_OUTPUT_FILE': str(path)}
+
+
+def load_report(path) -> Optional[Dict]:
+    try:
+        with open(path, 'r', encoding='utf-8') as f:
+            report = json.load(f)
+    except (OSError, ValueError):
+        return None
+    return report if isinstance(report, dict) and 'suites' in report else None
+
+
+def _error(result: Dict) -> tuple:
+    error = result_error(result)
+    if not error:
+        return None, None
+    message = strip_ansi(error.get('message') or error.get('value'))
+    return (message.splitlines()[0][:500] if message else None), error_location(error)
+
+
+def test_rows(report: Dict) -> List[Dict]:
+    """One row per (spec, project) with the outcome of its final attempt."""
+    rows = []
+    for file, line, title, test in iter_tests(report):
+        final = final_result(test)
+        message, location = _error(final)
+        rows.append({
+            'file': file,
+            'line': line,
+            'title': title,
+            'project': test.get('projectName') or '',
+            'status': _OUTCOME.get(test.get('status'), test.get('status') or 'unknown'),
+            'duration_ms': int(final.get('duration') or 0),
+            'retries': max(0, len(test.get('results') or []) - 1),
+            'error': message,
+            'error_location': location,
+        })
+    return rows
+
+
+def overall_status(report: Dict) -> Optional[str]:
+    stats = report.get('stats') or {}
+    if stats.get('unexpected') or report.get('errors'):
+        return 'failed'
+    if stats.get('expected') or stats.get('flaky'):
+        return 'passed'
+    return None
+
+
+def spec_test_name(file: str) -> str:
+    """Test name for a spec path relative to testDir ('login.spec.ts' -> 'login')."""
+    name = file.replace('\\', '/')
+    for ext in ('.spec.ts', '.test.ts', '.spec.js', '.test.js'):
+        if name.endswith(ext):
+            return name[:-len(ext)]
+    return os.path.splitext(name)[0]
@@ -0,0 +1,115 @@
+"""
+Append-only on-disk run logs.
+
+Every message a run streams is appended to `<run_id>.log` as it is produced:
+output lines verbatim, other events (queue position, status, ...) as
+`[event] {json}`. A sparse offset index, `<run_id>.idx`, stores the byte
+offset of every INDEX_EVERY-th line as a big-endian uint64, so readers can
+start at a line number without scanning the file. Reads are byte-ranged and
+never load a whole log.
+"""
+import json
+import os
+import struct
+from typing import Dict, Optional
+
+INDEX_EVERY = 1000
+_OFFSET = struct.Struct('>Q')
+
+
+class RunLog:
+    def __init__(self, path: str):
+        self.path = path
+        self.index_path = os.path.splitext(path)[0] + '.idx'
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        self._f = open(path, 'ab')
+        self._idx = open(self.index_path, 'ab')
+        self.size = self._f.tell()
+        self.lines = 0
+
+    @property
+    def closed(self) -> bool:
+        return self._f.closed
+
+    def append(self, msg: Dict) -> None:
+        if self._f.closed:
+            return
+        if 'line' in msg and len(msg) == 1:
+            text = str(msg['line'])
+        else:
+            text = '[event] ' + json.dumps(msg, ensure_ascii=False)
+        data = (text.replace('\n', ' ') + '\n').encode('utf-8', errors='replace')
+        if self.lines % INDEX_EVERY == 0:
+            self._idx.write(_OFFSET.pack(self.size))
+            self._idx.flush()
+        self._f.write(data)
+        self._f.flush()  # late readers see lines as they are produced
+        self.size += len(data)
+        self.lines += 1
+
+    def close(self) -> None:
+        for f in (self._f, self._idx):
+            if not f.closed:
+                f.close()
+
+
+def line_offset(log_path: str, line: int) -> int:
+    """Byte offset where `line` (0-based) starts, or the file size if past the end."""
+    index_path = os.path.splitext(log_path)[0] + '.idx'
+    slot = line // INDEX_EVERY
+    offset = 0
+    try:
+        with open(index_path, 'rb') as f:
+            f.seek(slot * _OFFSET.size)
+            raw = f.read(_OFFSET.size)
+        if len(raw) == _OFFSET.size:
+            offset = _OFFSET.unpack(raw)[0]
+            remaining = line - slot * INDEX_EVERY
+        else:
+            remaining = line
+    except OSError:
+        remaining = line
+    with open(log_path, 'rb') as f:
+        f.seek(offset)
+        for _ in range(remaining):
+            if not f.readline():
+                break
+        return f.tell()
+
+
+def read_range(log_path: str, offset: Optional[int] = None, limit: int = 65536,
+               tail: Optional[int] = None, line: Optional[int] = None) -> Dict:
+    """
+    Read up to `limit` bytes from `offset` (or from the start of `line`, or the
+    last `tail` bytes). Windows are trimmed to whole lines, except when a
+    single line is longer than the window.
+    """
+    size = os.path.getsize(log_path)
+    if tail is not None:
+        start = max(0, size - tail)
+        limit = size - start
+    elif line is not None:
+        start = line_offset(log_path, max(0, line))
+    else:
+        start = min(max(0, offset or 0), size)
+    with open(log_path, 'rb') as f:
+        f.seek(start)
+        data = f.read(max(0, limit))
+    if tail is not None and start > 0:
+        nl = data.find(b'\n')
+        if 0 <= nl < len(data) - 1:
+            start += nl + 1
+            data = data[nl + 1:]
+    end = start + len(data)
+    if end < size:
+        nl = data.rfind(b'\n')
+        if nl >= 0:
+            data = data[:nl + 1]
+            end = start + len(data)
+    return {
+        'offset': start,
+        'next_offset': end,
+        'size': size,
+        'eof': end >= size,
+        'text': data.decode('utf-8', errors='replace'),
+    }
@@ -0,0 +1,80 @@
+"""
+Per-run event log with fan-out to any number of SSE subscribers.
+
+Producers call `put`/`put_nowait` (the asyncio.Queue API the run code already
+used). Events are numbered and kept in a bounded ring buffer, so a reloaded
+page can resume from its Last-Event-ID and a run nobody watches holds at most
+`maxlen` events. Subscribers receive everything that arrived during one flush
+interval as a single batch. A run is finished once a `{'status': 'finished'}`
+event is put; the server evicts finished runs after a TTL. With a RunLog
+attached, every event is also appended to the run's log file.
+"""
+import asyncio
+import time
+from collections import deque
+from typing import AsyncIterator, Deque, Dict, List, Optional, Tuple
+
+from .run_log import RunLog
+
+
+class RunStream:
+    def __init__(self, maxlen: int = 2000):
+        self.events: Deque[Tuple[int, Dict]] = deque(maxlen=max(1, maxlen))
+        self.seq = 0
+        self.finished_at: Optional[float] = None
+        self._changed = asyncio.Event()
+        self.log: Optional[RunLog] = None
+
+    def attach_log(self, log: RunLog) -> None:
+        """Persist events from now on, starting with whatever is already buffered."""
+        self.log = log
+        for _, msg in self.events:
+            log.append(msg)
+        if self.finished:
+            log.close()
+
+    def put_nowait(self, msg: Dict) -> None:
+        self.seq += 1
+        self.events.append((self.seq, msg))
+        if self.log is not None:
+            self.log.append(msg)
+        if msg.get('status') == 'finished':
+            self.finished_at = time.monotonic()
+            if self.log is not None:
+                self.log.close()
+        # wake every subscriber, then arm a fresh event for the next wait
+        self._changed.set()
+        self._changed = asyncio.Event()
+
+    async def put(self, msg: Dict) -> None:
+        self.put_nowait(msg)
+
+    @property
+    def finished(self) -> bool:
+        return self.finished_at is not None
+
+    def since(self, after: int) -> Tuple[List[Dict], int]:
+        """Events newer than `after` still in the buffer, and how many were dropped before them."""
+        first = self.events[0][0] if self.events else self.seq + 1
+        dropped = max(0, first - after - 1)
+        return [msg for seq, msg in self.events if seq > after], dropped
+
+    async def subscribe(self, after: int = 0, flush_s: float = 0.25) -> AsyncIterator[Tuple[int, List[Dict]]]:
+        """Yield (last seq, batch) until the finished event has been delivered."""
+        cursor = max(0, after)
+        while True:
+            if self.seq <= cursor:
+                if self.finished:
+                    return
+                await self._changed.wait()
+                if not self.finished:
+                    # let lines accumulate so a chatty run costs one event per interval
+                    await asyncio.sleep(flush_s)
+            batch, dropped = self.since(cursor)
+            if dropped:
+                batch.insert(0, {'line': f'... {dropped} earlier log line(s) dropped from the buffer ...'})
+            cursor = self.seq
+            if batch:
+                # events put while the batch is being sent are picked up on the next pass,
+                # so only the check at the top (cursor caught up) may end the stream
+                yield cursor, batch
@@ -0,0 +1,187 @@
+"""
+Bounded scheduler for crew, Playwright and codegen jobs.
+
+Each job type has its own concurrency limit and a priority queue (lower
+number first, FIFO within a priority). `submit` does admission control and
+raises SchedulerFull once the backlog is at its limit; the returned ticket
+is an async context manager that waits for a slot and releases it on exit.
+Queued tickets are told their position and an ETA whenever the queue moves.
+Interactive jobs submit with `wait=False` and get LaneBusy instead of a
+place in the queue.
+"""
+import asyncio
+import heapq
+import itertools
+import math
+import time
+from typing import Callable, Dict, List, Optional, Tuple
+
+# rough per-job durations used for ETAs until real ones have been observed
+DEFAULT_DURATION_S = {'crew': 300.0, 'playwright': 60.0, 'codegen': 600.0}
+
+
+class SchedulerFull(Exception):
+    def __init__(self, job_type: str, backlog: int):
+        super().__init__(f'Scheduler backlog is full ({backlog} queued); retry later.')
+        self.job_type = job_type
+        self.backlog = backlog
+
+
+class LaneBusy(Exception):
+    def __init__(self, job_type: str, position: int, eta_s: float):
+        super().__init__(f'All {job_type} slots are in use ({position - 1} queued ahead); retry later.')
+        self.job_type = job_type
+        self.position = position
+        self.eta_s = eta_s
+
+
+class Ticket:
+    def __init__(self, scheduler: 'RunScheduler', job_type: str, priority: int,
+                 on_update: Optional[Callable[[Dict], None]]):
+        self.scheduler = scheduler
+        self.job_type = job_type
+        self.priority = priority
+        self.on_update = on_update
+        self.future: asyncio.Future = asyncio.get_running_loop().create_future()
+        self.submitted_at = time.monotonic()
+        self.started_at: Optional[float] = None
+        self.released = False
+
+    async def acquire(self) -> None:
+        await self.scheduler._wait(self)
+
+    def release(self) -> None:
+        self.scheduler._release(self)
+
+    async def __aenter__(self) -> 'Ticket':
+        await self.acquire()
+        return self
+
+    async def __aexit__(self, *exc) -> None:
+        self.release()
+
+    def withdraw(self) -> None:
+        """
+        Give up a ticket that was submitted but will never be entered. Safe to
+        call on any path: it is a no-op once the ticket has been released.
+        """
+        self.scheduler._withdraw(self)
+
+
+class _Lane:
+    def __init__(self, job_type: str, limit: int):
+        self.job_type = job_type
+        self.limit = max(1, limit)
+        self.running = 0
+        self.waiting: List[Tuple[int, int, Ticket]] = []
+        self.avg_s: Optional[float] = None
+        self.completed = 0
+
+    def eta(self, position: int) -> float:
+        avg = self.avg_s or DEFAULT_DURATION_S.get(self.job_type, 60.0)
+        return math.ceil(position / self.limit) * avg
+
+
+class RunScheduler:
+    def __init__(self, limits: Dict[str, int], max_backlog: int):
+        self.lanes = {job_type: _Lane(job_type, limit) for job_type, limit in limits.items()}
+        self.max_backlog = max_backlog
+        self.rejected = 0
+        self._seq = itertools.count()
+
+    def backlog(self) -> int:
+        return sum(len(lane.waiting) for lane in self.lanes.values())
+
+    def submit(self, job_type: str, priority: int = 0,
+               on_update: Optional[Callable[[Dict], None]] = None, wait: bool = True) -> Ticket:
+        lane = self.lanes[job_type]
+        ticket = Ticket(self, job_type, priority, on_update)
+        if lane.running < lane.limit and not lane.waiting:
+            self._grant(lane, ticket)
+            return ticket
+        if not wait:
+            position = len(lane.waiting) + 1
+            raise LaneBusy(job_type, position, round(lane.eta(position), 1))
+        backlog = self.backlog()
+        if backlog >= self.max_backlog:
+            self.rejected += 1
+            raise SchedulerFull(job_type, backlog)
+        heapq.heappush(lane.waiting, (priority, next(self._seq), ticket))
+        self._notify(lane)
+        return ticket
+
+    def _grant(self, lane: _Lane, ticket: Ticket) -> None:
+        lane.running += 1
+        ticket.started_at = time.monotonic()
+        if not ticket.future.done():
+            ticket.future.set_result(True)
+        if ticket.on_update:
+            ticket.on_update({'job_type': lane.job_type, 'position': 0, 'eta_s': 0, 'started': True,
+                              'waited_s': round(ticket.started_at - ticket.submitted_at, 3)})
+
+    def _notify(self, lane: _Lane) -> None:
+        for position, (_, _, ticket) in enumerate(sorted(lane.waiting), start=1):
+            if ticket.on_update:
+                ticket.on_update({'job_type': lane.job_type, 'position': position,
+                                  'eta_s': round(lane.eta(position), 1), 'started': False})
+
+    def _dispatch(self, lane: _Lane) -> None:
+        moved = False
+        while lane.running < lane.limit and lane.waiting:
+            _, _, ticket = heapq.heappop(lane.waiting)
+            self._grant(lane, ticket)
+            moved = True
+        if moved:
+            self._notify(lane)
+
+    async def _wait(self, ticket: Ticket) -> None:
+        try:
+            await asyncio.shield(ticket.future)
+        except asyncio.CancelledError:
+            if ticket.future.done():
+                self._release(ticket)
+            else:
+                self._withdraw(ticket)
+            raise
+
+    def _withdraw(self, ticket: Ticket) -> None:
+        lane = self.lanes[ticket.job_type]
+        if ticket.started_at is not None:
+            # granted but never run: free the slot without counting a completed job
+            if not ticket.released:
+                ticket.released = True
+                lane.running -= 1
+                self._dispatch(lane)
+            return
+        lane.waiting = [item for item in lane.waiting if item[2] is not ticket]
+        heapq.heapify(lane.waiting)
+        ticket.future.cancel()
+        self._notify(lane)
+
+    def _release(self, ticket: Ticket) -> None:
+        if ticket.released or ticket.started_at is None:
+            return
+        ticket.released = True
+        lane = self.lanes[ticket.job_type]
+        lane.running -= 1
+        lane.completed += 1
+        took = time.monotonic() - ticket.started_at
+        lane.avg_s = took if lane.avg_s is None else 0.8 * lane.avg_s + 0.2 * took
+        self._dispatch(lane)
+
+    def stats(self) -> Dict:
+        return {
+            'max_backlog': self.max_backlog,
+            'backlog': self.backlog(),
+            'rejected': self.rejected,
+            'lanes': {
+                job_type: {
+                    'limit': lane.limit,
+                    'running': lane.running,
+                    'queued': len(lane.waiting),
+                    'completed': lane.completed,
+                    'avg_s': round(lane.avg_s, 3) if lane.avg_s is not None else None,
+                }
+                for job_type, lane in self.lanes.items()
+            },
+        }
@@ -9,10 +9,12 @@ import sys, pathlib
 import re
 import platform
 import sys, importlib.util 
+import shutil
+from collections import deque
 
 from shutil import which
-from fastapi import FastAPI, HTTPException, Path,Body
-from fastapi.responses import PlainTextResponse, FileResponse, JSONResponse
+from fastapi import FastAPI, HTTPException, Path,Body, Request
+from fastapi.responses import PlainTextResponse, FileResponse, JSONResponse, Response
 from fastapi.middleware.cors import CORSMiddleware
 from sse_starlette.sse import EventSourceResponse
 
@@ -21,12 +23,30 @@ from pydantic import BaseModel, Field
 from fastapi.middleware.cors import CORSMiddleware
 from fastapi import APIRouter, HTTPException
 
-
-
-try:
-    from test_agent.crew import TestAutomationCrew  
-except Exception:
-    TestAutomationCrew = None  
+# The API shares test_agent's stdlib-only helpers (never the crew itself). When
+# the backend runs from a checkout without `src/` installed, e.g. a bare
+# `uvicorn backend.server:app`, put the sibling `src/` on the path for them.
+_SRC_DIR = pathlib.Path(__file__).resolve().parents[1] / 'src'
+if importlib.util.find_spec('test_agent') is None and _SRC_DIR.is_dir():
+    sys.path.append(str(_SRC_DIR))
+from test_agent.extraction import block_end, extract_json
+from test_agent.playwright_runs import kill_process_group_async, process_group_kwargs
+
+from .crew_pool import CrewWorkerPool, CrewPoolUnavailable
+from .mcp_server import PlaywrightMCPServer, DEFAULT_PORT as MCP_DEFAULT_PORT
+from .browser_server import PlaywrightBrowserServer, RUN_RE as BROWSER_RUN_RE
+from .index_store import SORTABLE as INDEX_SORTABLE, TestIndexStore
+from .catalog import TestCatalog
+from .file_index import FileIndex, is_test_file
+from .scheduler import LaneBusy, RunScheduler, SchedulerFull
+from .exploration_cache import ExplorationCache
+from .spec_merge import merge_specs
+from .suite import SuiteResults, parse_list_line, shard_cmd
+from .run_stream import RunStream
+from .run_log import RunLog, read_range
+from .procs import CappedOutput, pump_lines
+from .pw_results import JSON_REPORT_NAME, json_reporter_env, load_report, overall_status, spec_test_name, test_rows
+from .toolchain import Toolchain
 
 
 REPO_ROOT = pathlib.Path(__file__).resolve().parents[1]  
@@ -34,15 +54,41 @@ OUTPUT_DIR = REPO_ROOT / 'output'
 TESTS_DIR = REPO_ROOT / 'tests'
 DATA_DIR = REPO_ROOT / 'data'
 REPORTS_DIR = OUTPUT_DIR / 'reports'
+RUNS_DIR = OUTPUT_DIR / 'runs'
+SUITES_DIR = OUTPUT_DIR / 'suites'
+LOGS_DIR = OUTPUT_DIR / 'logs'
 
 OUTPUT_DIR.mkdir(parents=True, exist_ok=True)
 DATA_DIR.mkdir(parents=True, exist_ok=True)
 REPORTS_DIR.mkdir(parents=True, exist_ok=True)
+RUNS_DIR.mkdir(parents=True, exist_ok=True)
+# number of finished run workspaces kept under output/runs
+RUN_WORKSPACE_KEEP = int(os.environ.get('RUN_WORKSPACE_KEEP', '50'))
 SCENARIO_DIR = os.path.join(OUTPUT_DIR, 'Testcases')
 INDEX_PATH = os.path.join(DATA_DIR, 'tests_index.json')
+INDEX_DB_PATH = os.environ.get('TEST_INDEX_DB') or os.path.join(DATA_DIR, 'tests_index.sqlite3')
 router = APIRouter()
 os.makedirs(SCENARIO_DIR, exist_ok=True)
 
+INDEX = TestIndexStore(INDEX_DB_PATH, results_keep=int(os.environ.get('TEST_RESULTS_KEEP', '20')))
+INDEX.migrate_json(INDEX_PATH)
+CATALOG = TestCatalog(TESTS_DIR, INDEX)
+# test name -> spec / scenarios file, kept current by the code that writes them
+FILES = FileIndex(REPO_ROOT, TESTS_DIR, pathlib.Path(SCENARIO_DIR))
+FILES.build()
+TOOLCHAIN = Toolchain(REPO_ROOT)
+TESTS_PAGE_MAX = 500
+
+# Cleaned exploration_data.json keyed by normalized URL + description hash
+# (EXPLORATION_CACHE=0 disables it).
+EXPLORATION_CACHE: Optional[ExplorationCache] = None
+if os.environ.get('EXPLORATION_CACHE', '1') != '0':
+    EXPLORATION_CACHE = ExplorationCache(
+        str(OUTPUT_DIR / 'cache' / 'exploration'),
+        ttl_s=float(os.environ.get('EXPLORATION_CACHE_TTL_S', '86400')),
+        max_entries=int(os.environ.get('EXPLORATION_CACHE_MAX_ENTRIES', '200')),
+    )
+
 app = FastAPI()
 app.include_router(router)
 app.add_middleware(
@@ -56,15 +102,162 @@ app.add_middleware(
 
 RUNS: Dict[str, Dict] = {}  
 
+# Run logs: events kept per run, lines per SSE batch interval, and how long a
+# finished run stays resumable before it is evicted.
+STREAM_BUFFER_EVENTS = int(os.environ.get('STREAM_BUFFER_EVENTS', '2000'))
+STREAM_FLUSH_S = float(os.environ.get('STREAM_FLUSH_S', '0.25'))
+RUN_STREAM_TTL_S = float(os.environ.get('RUN_STREAM_TTL_S', '600'))
+# /api/run-test: hard timeout (the whole process group is killed) and the
+# bytes of stdout/stderr each kept in memory for the response
+RUN_TEST_TIMEOUT_S = float(os.environ.get('RUN_TEST_TIMEOUT_S', '900'))
+RUN_TEST_OUTPUT_CAP = int(os.environ.get('RUN_TEST_OUTPUT_CAP', str(64 * 1024)))
+# number of on-disk run logs (output/logs/<run_id>.log) kept
+RUN_LOG_KEEP = int(os.environ.get('RUN_LOG_KEEP', '500'))
+# per-task crew telemetry written by test_agent.telemetry into each job's workspace
+TELEMETRY_FILE = 'telemetry.json'
+TELEMETRY_KEEP_SPANS = int(os.environ.get('TELEMETRY_KEEP_SPANS', '5000'))
+
+# Pre-warmed crew workers; CREW_POOL_SIZE=0 disables the pool and every run
+# falls back to spawning `crewai run`.
+CREW_POOL_SIZE = int(os.environ.get('CREW_POOL_SIZE', '2'))
+CREW_POOL_MAX_JOBS = int(os.environ.get('CREW_POOL_MAX_JOBS', '20'))
+CREW_POOL: Optional[CrewWorkerPool] = None
+
+# Shared Playwright MCP server; crews connect over SSE instead of launching
+# their own `npx @playwright/mcp` (PLAYWRIGHT_MCP_SERVER=0 to disable).
+MCP_SERVER: Optional[PlaywrightMCPServer] = None
+if os.environ.get('PLAYWRIGHT_MCP_SERVER', '1') != '0':
+    MCP_SERVER = PlaywrightMCPServer(
+        port=int(os.environ.get('PLAYWRIGHT_MCP_PORT', MCP_DEFAULT_PORT)),
+        package=os.environ.get('PLAYWRIGHT_MCP_PACKAGE', '@playwright/mcp@latest'),
+    )
+
+# Warm Chromium for the crews' CustomPlaywrightTool runs (PLAYWRIGHT_BROWSER_SERVER=0 to disable).
+BROWSER_SERVER: Optional[PlaywrightBrowserServer] = None
+if os.environ.get('PLAYWRIGHT_BROWSER_SERVER', '1') != '0':
+    BROWSER_SERVER = PlaywrightBrowserServer(cwd=str(REPO_ROOT))
+
+# Admission control: per-job-type concurrency limits and a bounded backlog.
+SCHEDULER = RunScheduler(
+    limits={
+        'crew': int(os.environ.get('SCHED_CREW_CONCURRENCY', str(max(1, CREW_POOL_SIZE)))),
+        'playwright': int(os.environ.get('SCHED_PLAYWRIGHT_CONCURRENCY', '2')),
+        'codegen': int(os.environ.get('SCHED_CODEGEN_CONCURRENCY', '1')),
+    },
+    max_backlog=int(os.environ.get('SCHED_MAX_BACKLOG', '50')),
+)
+
+@app.exception_handler(SchedulerFull)
+async def _scheduler_full(request, exc: SchedulerFull):
+    return JSONResponse(status_code=429, content={'detail': str(exc), 'backlog': exc.backlog},
+                        headers={'Retry-After': '30'})
+
+@app.exception_handler(LaneBusy)
+async def _lane_busy(request, exc: LaneBusy):
+    return JSONResponse(status_code=429, content={'detail': str(exc), 'position': exc.position, 'eta_s': exc.eta_s},
+                        headers={'Retry-After': str(max(1, int(exc.eta_s)))})
+
+# run-many generates scripts for this many scenarios per crew job, in parallel,
+# and retries a failed part this many times before leaving a test.fixme for it.
+RUN_MANY_BATCH_SIZE = int(os.environ.get('RUN_MANY_BATCH_SIZE', '1'))
+RUN_MANY_RETRIES = int(os.environ.get('RUN_MANY_RETRIES', '1'))
+
+def _new_stream() -> RunStream:
+    return RunStream(STREAM_BUFFER_EVENTS)
+
+def _job_priority(payload: Dict) -> int:
+    """Optional `priority` of a dict request body (lower runs first); 400 unless it is an integer."""
+    value = payload.get('priority')
+    if value is None or value == '':
+        return 0
+    if isinstance(value, bool) or (isinstance(value, float) and not value.is_integer()):
+        raise HTTPException(status_code=400, detail='priority must be an integer.')
+    try:
+        return int(value)
+    except (TypeError, ValueError):
+        raise HTTPException(status_code=400, detail='priority must be an integer.')
+
+def _run_log_path(run_id: str) -> pathlib.Path:
+    return LOGS_DIR / f'{run_id}.log'
+
+def _register_run(run_id: str, q: RunStream, **fields: Any) -> None:
+    """Publish a run's stream under its id and start persisting it to disk."""
+    RUNS[run_id] = {'q': q, **fields}
+    try:
+        q.attach_log(RunLog(str(_run_log_path(run_id))))
+    except OSError as e:
+        print(f"[run-log] cannot open log for {run_id}: {e}")
+    _prune_run_logs()
+
+def _prune_run_logs() -> None:
+    try:
+        logs = sorted(LOGS_DIR.glob('*.log'), key=lambda p: p.stat().st_mtime, reverse=True)
+    except OSError:
+        return
+    for log in logs[RUN_LOG_KEEP:]:
+        if log.stem in RUNS:
+            continue
+        for p in (log, log.with_suffix('.idx')):
+            try:
+                p.unlink()
+            except OSError:
+                pass
+
+async def _evict_finished_runs() -> None:
+    while True:
+        await asyncio.sleep(min(60.0, RUN_STREAM_TTL_S))
+        now = time.monotonic()
+        for run_id, run in list(RUNS.items()):
+            finished_at = run['q'].finished_at
+            if finished_at is not None and now - finished_at > RUN_STREAM_TTL_S:
+                RUNS.pop(run_id, None)
+
+def _queue_updates(q: RunStream):
+    """Forward scheduler position/ETA updates onto a run's stream."""
+    return lambda info: q.put_nowait({'queue': info})
+
+_MCP_READY_RE = re.compile(r'\[mcp\] transport=(\w+) ready in ([\d.]+)s')
+
+@app.on_event('startup')
+async def _start_runtime() -> None:
+    global CREW_POOL
+    if CREW_POOL_SIZE > 0:
+        CREW_POOL = CrewWorkerPool(CREW_POOL_SIZE, CREW_POOL_MAX_JOBS, cwd=str(REPO_ROOT))
+    asyncio.create_task(_warm_runtime())
+    asyncio.create_task(_evict_finished_runs())
+    asyncio.create_task(TOOLCHAIN.probe())
+
+async def _start_mcp_server() -> None:
+    if MCP_SERVER is not None and await MCP_SERVER.start():
+        os.environ['PLAYWRIGHT_MCP_URL'] = MCP_SERVER.url
+
+async def _start_browser_server() -> None:
+    if BROWSER_SERVER is not None and await BROWSER_SERVER.start():
+        os.environ['PLAYWRIGHT_BROWSER_WS'] = BROWSER_SERVER.ws
+        os.environ['PLAYWRIGHT_BROWSER_LAUNCH_S'] = f'{BROWSER_SERVER.launch_s:.3f}'
+
+async def _warm_runtime() -> None:
+    # workers inherit PLAYWRIGHT_MCP_URL / PLAYWRIGHT_BROWSER_WS, so bring the servers up first
+    await asyncio.gather(_start_mcp_server(), _start_browser_server())
+    if CREW_POOL is not None:
+        await CREW_POOL.start()
+
+@app.on_event('shutdown')
+async def _stop_runtime() -> None:
+    if CREW_POOL is not None:
+        await CREW_POOL.close()
+    if MCP_SERVER is not None:
+        await MCP_SERVER.stop()
+    if BROWSER_SERVER is not None:
+        await BROWSER_SERVER.stop()
+
 def sanitize_name(name: str) -> str:
     # keep test name filesystem-safe
     return re.sub(r'[^a-zA-Z0-9._-]+', '_', name).strip()
 
 def _local_playwright_bin(repo_root: pathlib.Path) -> str | None:
     # prefer the repo-local playwright CLI over global npx
-    bin_name = "playwright.cmd" if os.name == "nt" else "playwright"
-    cand = repo_root / "node_modules" / ".bin" / bin_name
-    return str(cand) if cand.exists() else None
+    return TOOLCHAIN.local_playwright_bin()
 
 def _has_display() -> bool:
     # Windows/macOS OK; on Linux we require DISPLAY for a GUI session
@@ -78,47 +271,21 @@ def _xvfb_available() -> bool:
 def _now_iso() -> str:
     return time.strftime('%Y-%m-%dT%H:%M:%SZ', time.gmtime())
 
-def _read_index() -> Dict[str, Dict]:
-    if not os.path.exists(INDEX_PATH):
-        return {}
-    try:
-        with open(str(INDEX_PATH), 'r', encoding='utf-8') as f:
-            return json.load(f)
-    except Exception:
-        return {}
-
-def _write_index(idx: Dict) -> None:
-    with open(str(INDEX_PATH), 'w', encoding='utf-8') as f:
-        json.dump(idx, f, indent=2)
-
 def _ensure_test_in_index(test_name: str) -> None:
-    idx = _read_index()
-    if test_name not in idx:
-        created = _now_iso()
-        ts_path = os.path.join(TESTS_DIR, f'{test_name}.spec.ts')
-        if os.path.exists(ts_path):
-            created = time.strftime('%Y-%m-%dT%H:%M:%SZ', time.gmtime(os.path.getmtime(ts_path)))
-        idx[test_name] = {
-            'name': test_name,
-            'created_at': created,
-            'last_run_at': None,
-            'last_status': None,
-            'last_report_file': None,
-            'last_app_url': None     
-        }
-        _write_index(idx)
-
-def _update_test_after_run(test_name: str, status: Optional[str], report_rel: Optional[str]) -> None:
-    idx = _read_index()
-    _ensure_test_in_index(test_name)
-    idx = _read_index()
-    entry = idx[test_name]
-    entry['last_run_at'] = _now_iso()
-    if status:
-        entry['last_status'] = status
-    if report_rel:
-        entry['last_report_file'] = report_rel
-    _write_index(idx)
+    if INDEX.get(test_name) is not None:
+        return
+    created = _now_iso()
+    ts_path = os.path.join(TESTS_DIR, f'{test_name}.spec.ts')
+    if os.path.exists(ts_path):
+        created = time.strftime('%Y-%m-%dT%H:%M:%SZ', time.gmtime(os.path.getmtime(ts_path)))
+    INDEX.ensure(test_name, created)
+
+def _update_test_after_run(test_name: str, status: Optional[str], report_rel: Optional[str],
+                           results: Optional[List[Dict]] = None) -> None:
+    run_at = _now_iso()
+    INDEX.record_run(test_name, run_at, status, report_rel)
+    if results:
+        INDEX.record_results(run_at, [dict(r, test_name=test_name) for r in results])
 
 def _derive_status_from_report_text(text: str) -> Optional[str]:
     t = text.lower()
@@ -133,18 +300,13 @@ def _derive_status_from_report_text(text: str) -> Optional[str]:
     return None
 
 def _find_playwright_cmd():
-    local = REPO_ROOT / "node_modules" / ".bin" / ("playwright.cmd" if os.name == "nt" else "playwright")
-    if local.exists():
-        return [str(local)]
-    npx = which("npx")
-    if npx:
-        return [npx, "playwright"]
-    raise RuntimeError("Playwright CLI not found. Run 'npm install' and 'npx playwright install'.")
-
-def _status_from_last_run_json() -> Optional[str]:
+    return TOOLCHAIN.playwright_cmd()
+
+def _status_from_last_run_json(results_dir: Optional[pathlib.Path] = None) -> Optional[str]:
+    results_dir = results_dir or (REPO_ROOT / 'test-results')
     candidates = [
-        os.path.join(REPO_ROOT, 'test-results', 'last-run.json'),
-        os.path.join(REPO_ROOT, 'test-results', '.last-run.json'),
+        os.path.join(results_dir, 'last-run.json'),
+        os.path.join(results_dir, '.last-run.json'),
     ]
     for p in candidates:
         if os.path.exists(p):
@@ -159,37 +321,318 @@ def _status_from_last_run_json() -> Optional[str]:
                 continue
     return None
 
-async def _enqueue_stream(proc: asyncio.subprocess.Process, q: asyncio.Queue, run_id: str) -> None:
+def _new_run_id() -> str:
+    run_id = str(int(time.time() * 1000))
+    while run_id in RUNS or (RUNS_DIR / run_id).exists():
+        run_id = str(int(run_id) + 1)
+    return run_id
+
+def _create_workspace(run_id: str) -> pathlib.Path:
+    """Private directory for one crew run; tasks.yaml paths are templated on it."""
+    ws = RUNS_DIR / run_id
+    (ws / 'tests').mkdir(parents=True, exist_ok=True)
+    (ws / 'Testcases').mkdir(parents=True, exist_ok=True)
+    _prune_workspaces()
+    return ws
+
+def _workspace_rel(ws: pathlib.Path) -> str:
+    return ws.relative_to(REPO_ROOT).as_posix()
+
+def _prune_workspaces() -> None:
+    active = {str(r.get('workspace')) for r in RUNS.values()}
+    try:
+        dirs = sorted((d for d in RUNS_DIR.iterdir() if d.is_dir()), key=lambda d: d.stat().st_mtime, reverse=True)
+    except OSError:
+        return
+    for d in dirs[RUN_WORKSPACE_KEEP:]:
+        if str(d) not in active:
+            shutil.rmtree(d, ignore_errors=True)
+
+def _promote_file(src: pathlib.Path, dest: pathlib.Path) -> bool:
+    """Copy a workspace artifact into place atomically (copy beside dest, then rename)."""
+    if not src.is_file():
+        return False
+    dest.parent.mkdir(parents=True, exist_ok=True)
+    tmp = dest.with_name(f'.{dest.name}.{os.getpid()}.{time.monotonic_ns()}.tmp')
+    try:
+        shutil.copyfile(src, tmp)
+        os.replace(tmp, dest)
+        FILES.note(dest)
+        return True
+    except OSError:
+        try:
+            tmp.unlink()
+        except OSError:
+            pass
+        return False
+
+def _seed_exploration(ws: pathlib.Path, app_url: str, test_desc: str, force_refresh: bool = False) -> Dict[str, str]:
+    """Copy a cached exploration into the workspace; returns extra job env on a hit."""
+    if EXPLORATION_CACHE is None:
+        return {}
+    if force_refresh:
+        EXPLORATION_CACHE.refreshes += 1
+        return {}
+    cached = EXPLORATION_CACHE.get(app_url, test_desc)
+    if cached is None:
+        return {}
+    (ws / 'exploration_data.json').write_text(cached, encoding='utf-8')
+    return {'EXPLORATION_CACHE_HIT': '1'}
+
+def _store_exploration(ws: pathlib.Path, app_url: str, test_desc: str) -> None:
+    path = ws / 'exploration_data.json'
+    if EXPLORATION_CACHE is None or not path.is_file():
+        return
+    try:
+        EXPLORATION_CACHE.put(app_url, test_desc, path.read_text(encoding='utf-8', errors='ignore'))
+    except OSError:
+        pass
+
+def _crew_env(app_url: str, test_name: str, test_desc: str, **extra: str) -> Dict[str, str]:
+    """Per-run variables handed to the crew (worker job env or `crewai run` env)."""
+    env = {
+        'APP_URL': app_url.strip(),
+        'TEST_NAME': test_name.strip(),
+        'TEST_DESC': test_desc.strip(),
+    }
+    env.update(extra)
+    return env
+
+async def _spawn_crew(job_env: Dict[str, str], on_line) -> int:
+    """Fallback path: one `crewai run` process per job."""
+    env = os.environ.copy()
+    env.update(job_env)
+    env.update({
+        'PYTHONUNBUFFERED': '1',
+        'PYTHONIOENCODING': 'utf-8',
+    })
+    cmd = _crewai_cmd()
+    proc = await asyncio.create_subprocess_exec(
+        *cmd,
+        cwd=str(REPO_ROOT),
+        stdout=asyncio.subprocess.PIPE,
+        stderr=asyncio.subprocess.PIPE,
+        env=env,
+        limit=1024 * 1024,
+    )
+
     async def reader(stream):
         while True:
             line = await stream.readline()
             if not line:
                 break
-            await q.put({'line': line.decode(errors='ignore').rstrip()})
+            await on_line(line.decode(errors='ignore').rstrip())
 
     try:
         await asyncio.gather(reader(proc.stdout), reader(proc.stderr))
     finally:
         await proc.wait()
-        test_name = RUNS.get(run_id, {}).get('test_name', 'unknown')
-        report_src = os.path.join(OUTPUT_DIR, 'final_report.md')
-        report_rel = None
-        status = _status_from_last_run_json()
-        if os.path.exists(report_src):
-            ts = int(time.time())
-            safe_name = re.sub(r'[^a-zA-Z0-9._-]+', '_', test_name) if test_name else 'unknown'
-            report_rel = f'reports/{safe_name}-{ts}.md'
-            report_dst = os.path.join(OUTPUT_DIR, report_rel)
+    return proc.returncode
+
+async def _run_crew(job_env: Dict[str, str], on_line) -> int:
+    """Run one crew job on a warm pool worker, or via `crewai run` if the pool is unavailable."""
+    async def observed(line: str) -> None:
+        m = _MCP_READY_RE.search(line)
+        if m and MCP_SERVER is not None:
+            MCP_SERVER.record_connect(m.group(1), float(m.group(2)))
+        m = BROWSER_RUN_RE.search(line)
+        if m and BROWSER_SERVER is not None:
+            BROWSER_SERVER.record_run(m.group(1), float(m.group(2)))
+        await on_line(line)
+
+    telemetry = _telemetry_path(job_env)
+    if telemetry is not None:
+        telemetry.unlink(missing_ok=True)
+    try:
+        if CREW_POOL is not None:
             try:
-                import shutil
-                shutil.copyfile(report_src, report_dst)
-                if status is None:
-                    with open(report_src, 'r', encoding='utf-8', errors='ignore') as f:
-                        status = _derive_status_from_report_text(f.read())
-            except Exception:
-                pass
-        _update_test_after_run(test_name, status, report_rel)
-        await q.put({'status': 'finished'})
+                return await CREW_POOL.run(job_env, observed)
+            except CrewPoolUnavailable as e:
+                print(f"[crew-pool] {e}; falling back to `crewai run`")
+        return await _spawn_crew(job_env, observed)
+    finally:
+        if telemetry is not None:
+            _ingest_telemetry(job_env, telemetry)
+
+def _telemetry_path(job_env: Dict[str, str]) -> Optional[pathlib.Path]:
+    ws = job_env.get('RUN_WORKSPACE')
+    return REPO_ROOT / ws / TELEMETRY_FILE if ws else None
+
+def _ingest_telemetry(job_env: Dict[str, str], path: pathlib.Path) -> None:
+    """Store a finished crew job's task spans, keyed by run id and sub-workspace."""
+    try:
+        with open(path, 'r', encoding='utf-8') as f:
+            data = json.load(f)
+        rel = path.parent.resolve().relative_to(RUNS_DIR.resolve()).parts
+    except (OSError, ValueError):
+        return
+    if not rel:
+        return
+    run = data.get('run') or {}
+    INDEX.record_spans(rel[0], '/'.join(rel[1:]) or '.', job_env.get('TEST_NAME'), run.get('mode'),
+                       data.get('tasks') or [], keep=TELEMETRY_KEEP_SPANS)
+
+async def _finish_run(run_id: str, job_env: Dict[str, str], q: RunStream, explored: bool = False) -> None:
+    """
+    Promote workspace artifacts, archive the report and close the stream. The
+    exploration is cached only when `explored` (the crew that wrote it exited 0).
+    """
+    run = RUNS.get(run_id, {})
+    test_name = run.get('test_name', 'unknown')
+    ws = pathlib.Path(run.get('workspace') or OUTPUT_DIR)
+    if explored and job_env.get('EXPLORATION_CACHE_HIT') != '1':
+        _store_exploration(ws, job_env['APP_URL'], job_env['TEST_DESC'])
+    _promote_file(ws / 'tests' / f'{test_name}.spec.ts', TESTS_DIR / f'{test_name}.spec.ts')
+    _promote_file(ws / 'Testcases' / f'{test_name}_test_cases.json',
+                  pathlib.Path(SCENARIO_DIR) / f'{test_name}_test_cases.json')
+
+    report_src = ws / 'final_report.md'
+    report_rel = None
+    # CustomPlaywrightTool leaves the JSON report of the executor's last run in the workspace
+    pw_report = load_report(ws / JSON_REPORT_NAME)
+    results = test_rows(pw_report) if pw_report else None
+    status = (overall_status(pw_report) if pw_report else None) or _status_from_last_run_json(ws / 'test-results')
+    if report_src.exists():
+        ts = int(time.time())
+        safe_name = re.sub(r'[^a-zA-Z0-9._-]+', '_', test_name) if test_name else 'unknown'
+        report_rel = f'reports/{safe_name}-{ts}.md'
+        report_dst = os.path.join(OUTPUT_DIR, report_rel)
+        try:
+            shutil.copyfile(report_src, report_dst)
+            # keep /api/report pointing at the most recent report
+            _promote_file(report_src, OUTPUT_DIR / 'final_report.md')
+            if status is None:
+                with open(report_src, 'r', encoding='utf-8', errors='ignore') as f:
+                    status = _derive_status_from_report_text(f.read())
+        except Exception:
+            pass
+    _update_test_after_run(test_name, status, report_rel, results)
+    await q.put({'status': 'finished'})
+
+async def _enqueue_stream(job_env: Dict[str, str], q: RunStream, run_id: str, ticket) -> None:
+    async def on_line(line: str) -> None:
+        await q.put({'line': line})
+
+    returncode = None
+    try:
+        async with ticket:
+            returncode = await _run_crew(job_env, on_line)
+    except Exception as e:
+        await q.put({'line': f'Crew run failed to start: {e}'})
+    finally:
+        ticket.withdraw()  # no-op once the ticket has been entered and released
+        await _finish_run(run_id, job_env, q, explored=returncode == 0)
+
+async def _crew_ticket(priority: int, on_update):
+    """Like SCHEDULER.submit('crew'), but waits for backlog room instead of raising."""
+    while True:
+        try:
+            return SCHEDULER.submit('crew', priority, on_update)
+        except SchedulerFull:
+            await asyncio.sleep(1.0)
+
+def _scenario_batches(scenarios: List['ScenarioItem'], size: int) -> List[List['ScenarioItem']]:
+    size = max(1, size)
+    return [scenarios[i:i + size] for i in range(0, len(scenarios), size)]
+
+def _batch_desc(desc: str, batch: List['ScenarioItem']) -> str:
+    return json.dumps(
+        {
+            "note": "MULTI_SCENARIO",
+            "feature": desc,
+            "instruction": "Generate ONE Playwright spec file with one test per scenario below, in the given order. "
+                           "Use test.beforeEach to goto APP_URL (or BASE_URL). Do not wrap the tests in test.describe.",
+            "scenarios": [s.model_dump() for s in batch],
+        },
+        ensure_ascii=False,
+    )
+
+async def _generate_script_part(q: RunStream, ws: pathlib.Path, index: int, batch: List['ScenarioItem'],
+                                job_env: Dict[str, str], priority: int) -> Optional[str]:
+    """Generate the spec for one batch of scenarios in its own sub-workspace; None if every attempt failed."""
+    test_name = job_env['TEST_NAME']
+    part_ws = ws / 'parts' / f'{index:03d}'
+    (part_ws / 'tests').mkdir(parents=True, exist_ok=True)
+    (part_ws / 'Testcases').mkdir(parents=True, exist_ok=True)
+    shutil.copyfile(ws / 'exploration_data.json', part_ws / 'exploration_data.json')
+    (part_ws / 'Testcases' / f'{test_name}_test_cases.json').write_text(
+        json.dumps([s.model_dump() for s in batch], indent=2, ensure_ascii=False), encoding='utf-8')
+    spec_path = part_ws / 'tests' / f'{test_name}.spec.ts'
+    part_env = dict(job_env, CREW_MODE='script', RUN_WORKSPACE=_workspace_rel(part_ws),
+                    TEST_DESC=_batch_desc(job_env['TEST_DESC'], batch))
+    info = {'index': index, 'ids': [s.id for s in batch], 'titles': [s.title or s.id for s in batch]}
+
+    def on_update(update: Dict) -> None:
+        q.put_nowait({'scenario': {**info, 'status': 'running' if update['started'] else 'queued',
+                                   'position': update['position'], 'eta_s': update['eta_s']}})
+
+    async def on_line(line: str) -> None:
+        await q.put({'line': f'[scenario {index}] {line}'})
+
+    for attempt in range(1, RUN_MANY_RETRIES + 2):
+        q.put_nowait({'scenario': {**info, 'status': 'queued', 'attempt': attempt}})
+        try:
+            async with await _crew_ticket(priority, on_update):
+                rc = await _run_crew(part_env, on_line)
+        except Exception as e:
+            rc = None
+            await on_line(f'script generation failed to start: {e}')
+        spec = spec_path.read_text(encoding='utf-8', errors='ignore') if spec_path.is_file() else ''
+        if rc == 0 and 'test(' in spec:
+            await q.put({'scenario': {**info, 'status': 'done', 'attempt': attempt}})
+            return spec
+        spec_path.unlink(missing_ok=True)
+    await q.put({'scenario': {**info, 'status': 'failed', 'attempt': RUN_MANY_RETRIES + 1}})
+    return None
+
+async def _run_many_stream(job_env: Dict[str, str], q: RunStream, run_id: str, ticket,
+                           scenarios: List['ScenarioItem'], priority: int) -> None:
+    """
+    run-many: explore once (or reuse the cached exploration), generate scripts per
+    scenario batch in parallel, merge them into one spec, then execute it.
+    """
+    test_name = job_env['TEST_NAME']
+    ws = pathlib.Path(RUNS[run_id]['workspace'])
+    explore_rc = None
+
+    async def on_line(line: str) -> None:
+        await q.put({'line': line})
+
+    try:
+        (ws / 'Testcases' / f'{test_name}_test_cases.json').write_text(
+            json.dumps([s.model_dump() for s in scenarios], indent=2, ensure_ascii=False), encoding='utf-8')
+        if job_env.get('EXPLORATION_CACHE_HIT') == '1':
+            ticket.withdraw()
+        else:
+            async with ticket:
+                explore_rc = await _run_crew(dict(job_env, CREW_MODE='explore'), on_line)
+        if not (ws / 'exploration_data.json').is_file():
+            raise RuntimeError('exploration produced no exploration_data.json')
+
+        batches = _scenario_batches(scenarios, RUN_MANY_BATCH_SIZE)
+        await on_line(f'Generating scripts for {len(scenarios)} scenario(s) in {len(batches)} part(s)')
+        specs = await asyncio.gather(*(
+            _generate_script_part(q, ws, i, batch, job_env, priority)
+            for i, batch in enumerate(batches, start=1)
+        ))
+        parts = []
+        for batch, spec in zip(batches, specs):
+            if len(batch) == 1 or spec is None:
+                parts.extend((s.title or s.id, spec if len(batch) == 1 else None) for s in batch)
+            else:
+                parts.append((' / '.join(s.title or s.id for s in batch), spec))
+        (ws / 'tests' / f'{test_name}.spec.ts').write_text(merge_specs(test_name, parts), encoding='utf-8')
+
+        if not any(specs):
+            await on_line('No scenario produced a script; skipping execution.')
+            return
+        async with await _crew_ticket(priority, _queue_updates(q)):
+            await _run_crew(dict(job_env, CREW_MODE='execute'), on_line)
+    except Exception as e:
+        await on_line(f'Run failed: {e}')
+    finally:
+        ticket.withdraw()  # no-op once the ticket has been entered and released
+        await _finish_run(run_id, job_env, q, explored=explore_rc == 0)
 
 
 def _normalize_spec(spec: str) -> str:
@@ -202,26 +645,10 @@ def _normalize_spec(spec: str) -> str:
     if p.exists():
         return str(p.relative_to(REPO_ROOT)).replace("\\", "/")
 
-    # Try with tests/ prefix
-    if not s.startswith("tests/"):
-        p2 = REPO_ROOT / "tests" / s
-        if p2.exists():
-            return str(p2.relative_to(REPO_ROOT)).replace("\\", "/")
-
-    # Try common extensions
-    base = s.removesuffix(".spec.ts").removesuffix(".test.ts").removesuffix(".ts")
-    for ext in (".spec.ts", ".test.ts", ".ts"):
-        cand = REPO_ROOT / "tests" / (base + ext)
-        if cand.exists():
-            return str(cand.relative_to(REPO_ROOT)).replace("\\", "/")
-
-    # As a last resort, search by filename under tests/
-    needle = pathlib.Path(base).name
-    tests_dir = REPO_ROOT / "tests"
-    if tests_dir.exists():
-        for cand in tests_dir.rglob("*"):
-            if cand.is_file() and cand.name.startswith(needle):
-                return str(cand.relative_to(REPO_ROOT)).replace("\\", "/")
+    # exact name lookup under tests/ (with or without prefix/extension)
+    hit = FILES.spec(s)
+    if hit:
+        return hit
 
     # Return original (Playwright will error clearly)
     return s
@@ -229,6 +656,18 @@ def _normalize_spec(spec: str) -> str:
 class RunTestRequest(BaseModel):
     spec: str = Field(..., description="e.g. tests\\login.spec.ts or login")
     headed: bool = False
+    stream: bool = False
+    timeout_s: Optional[float] = Field(None, gt=0)
+
+
+class RunSuiteRequest(BaseModel):
+    specs: Optional[List[str]] = Field(None, description="spec paths or names, as for /api/run-test")
+    glob: Optional[str] = Field(None, description="glob under tests/, e.g. 'login*' or '**/*.spec.ts'")
+    tag: Optional[str] = Field(None, description="Playwright tag such as @smoke; alone it selects the whole suite")
+    workers: Optional[int] = Field(None, ge=1)
+    shards: int = Field(1, ge=1, le=16)
+    headed: bool = False
+    priority: int = 0
 
 
 class CodegenRequest(BaseModel):
@@ -236,6 +675,14 @@ class CodegenRequest(BaseModel):
     url: Optional[str] = None       
 
 
+def _test_name_from_spec(spec: str) -> str:
+    s = spec.replace("\\", "/")
+    m = re.search(r"tests/(.+?)\.spec\.ts$", s)
+    if m:
+        return m.group(1)
+    base = os.path.basename(s)
+    return base[:-8] if base.endswith(".spec.ts") else base
+
 def _extract_url_from_spec(spec_path: pathlib.Path) -> Optional[str]:
     """Best-effort: find a http(s) URL, preferring page.goto('...')."""
     try:
@@ -260,8 +707,12 @@ def _to_playwright_test_if_raw(code: str) -> str:
     # Raw codegen usually uses require('playwright') + IIFE
     if "require('playwright')" in code or 'require("playwright")' in code:
         # 1) unwrap IIFE body if present
-        m = re.search(r'\(async\s*\(\)\s*=>\s*\{\s*([\s\S]*?)\s*\}\)\(\);\s*$', code)
-        body = m.group(1) if m else code
+        body = code
+        m = re.search(r'\(async\s*\(\)\s*=>\s*\{', code)
+        if m:
+            end = block_end(code, m.end() - 1)
+            if end > 0:
+                body = code[m.end():end - 1].strip()
 
         # 2) drop manual browser/context creation & closing
         body = re.sub(r'const\s+browser\s*=.*?;\s*', '', body, flags=re.S)
@@ -285,100 +736,109 @@ def _scenarios_path(test_name: str) -> str:
 
 def _resolve_scenarios_path(test_name: str) -> Optional[str]:
     """Return an existing scenarios file path for a test name, if any."""
-    expected = _scenarios_path(test_name)
-    if os.path.isfile(expected):
-        return expected
-
-    safe = sanitize_name(test_name).strip()
-    candidates = []
-
-    if safe.endswith('_test'):
-        base = safe[:-5]
-        candidates.append(os.path.join(SCENARIO_DIR, f'{base}_test_cases.json'))
-
-    candidates.extend(glob.glob(os.path.join(SCENARIO_DIR, f'*{safe}*test_cases.json')))
-
-    for cand in candidates:
-        if cand and os.path.isfile(cand):
-            return cand
-    return None
+    return FILES.scenarios(sanitize_name(test_name).strip())
 
 def _read_scenarios_file(path: str):
     with open(path, 'r', encoding='utf-8', errors='ignore') as f:
-        raw = f.read().strip()
-    txt = raw
-    # Clean stray 'json' prefix and/or code fences
-    if txt.lower().startswith('json'):
-        txt = txt.split('\n', 1)[1] if '\n' in txt else '[]'
-    txt = txt.strip().strip('`')
+        raw = f.read()
+    # tolerate a stray 'json' prefix, code fences and prose around the document
     try:
-        return json.loads(txt)
-    except Exception:
-        m = re.search(r'(\[.*\])', txt, flags=re.S)
-        if not m:
-            raise HTTPException(status_code=500, detail='Invalid scenarios JSON.')
-        return json.loads(m.group(1))
-
-async def _ensure_scenarios(test_name: str, app_url: str, test_desc: str):
-    """Run crew in plan-only mode to generate scenarios if missing."""
-    resolved = _resolve_scenarios_path(test_name)
-    if resolved:
-        return
-    env = os.environ.copy()
-    env.update({
-        'APP_URL': app_url.strip(),
-        'TEST_NAME': test_name.strip(),
-        'TEST_DESC': test_desc.strip(),
-        'FAST_PLAN_ONLY': '1',            # ← key
-        'PYTHONUNBUFFERED': '1',
-        'PYTHONIOENCODING': 'utf-8',
-    })
-    cmd = _crewai_cmd()  
-    proc = await asyncio.create_subprocess_exec(
-        *cmd, cwd=str(REPO_ROOT),
-        stdout=asyncio.subprocess.PIPE,
-        stderr=asyncio.subprocess.PIPE,
-        env=env,
-    )
-    stdout, stderr = await proc.communicate()
-    resolved_after = _resolve_scenarios_path(test_name)
-    if resolved_after:
-        expected = _scenarios_path(test_name)
-        if resolved_after != expected:
-            try:
-                import shutil
-                shutil.copyfile(resolved_after, expected)
-            except Exception:
-                pass
-        return
+        return extract_json(raw)
+    except ValueError:
+        raise HTTPException(status_code=500, detail='Invalid scenarios JSON.')
+
+# In-flight scenario generations, one per test name: {'run_id': str, 'task': asyncio.Task}
+SCENARIO_FLIGHTS: Dict[str, Dict] = {}
+
+async def _generate_scenarios(test_name: str, app_url: str, test_desc: str, force_refresh: bool,
+                              run_id: str, ticket) -> None:
+    """Run crew in plan-only mode and promote the generated scenarios."""
+    run = RUNS[run_id]
+    q: RunStream = run['q']
+    ws = pathlib.Path(run['workspace'])
+    tail: deque = deque(maxlen=200)
+
+    async def on_line(line: str) -> None:
+        tail.append(line)
+        await q.put({'line': line})
+
+    returncode = None
+    try:
+        job_env = _crew_env(app_url, test_name, test_desc, FAST_PLAN_ONLY='1', RUN_WORKSPACE=_workspace_rel(ws),
+                            **_seed_exploration(ws, app_url, test_desc, force_refresh))
+        async with ticket:
+            returncode = await _run_crew(job_env, on_line)
+        if returncode == 0 and job_env.get('EXPLORATION_CACHE_HIT') != '1':
+            _store_exploration(ws, app_url, test_desc)
+        _promote_file(ws / 'Testcases' / f'{test_name}_test_cases.json', pathlib.Path(_scenarios_path(test_name)))
+        resolved_after = _resolve_scenarios_path(test_name)
+        if resolved_after:
+            expected = _scenarios_path(test_name)
+            if resolved_after != expected:
+                try:
+                    shutil.copyfile(resolved_after, expected)
+                    FILES.note(expected)
+                except Exception:
+                    pass
+            await q.put({'status': 'finished', 'scenarios': 'ready'})
+            return
+
+        out_tail = "\n".join(tail)[-1200:]
+        detail = f"Scenario generation failed (exit {returncode})."
+        if out_tail.strip():
+            detail += f" output: {out_tail.strip()}"
+        await q.put({'status': 'finished', 'scenarios': 'failed', 'error': detail})
+        raise HTTPException(status_code=500, detail=detail)
+    except asyncio.CancelledError:
+        await q.put({'status': 'finished', 'scenarios': 'failed', 'error': 'cancelled'})
+        raise
+    finally:
+        ticket.withdraw()  # no-op once the ticket has been entered and released
 
-    out_tail = (stdout or b'').decode('utf-8', 'ignore')[-1200:]
-    err_tail = (stderr or b'').decode('utf-8', 'ignore')[-1200:]
-    detail = f"Scenario generation failed (exit {proc.returncode})."
-    if err_tail.strip():
-        detail += f" stderr: {err_tail.strip()}"
-    elif out_tail.strip():
-        detail += f" output: {out_tail.strip()}"
-    raise HTTPException(status_code=500, detail=detail)
+def _scenarios_flight(test_name: str, app_url: str, test_desc: str, force_refresh: bool = False) -> Dict:
+    """
+    Single-flight: concurrent callers for the same test share one plan-only run
+    (and its run id) instead of racing to write the same _test_cases.json.
+    """
+    flight = SCENARIO_FLIGHTS.get(test_name)
+    if flight is not None and not flight['task'].done():
+        return flight
+
+    q = _new_stream()
+    ticket = SCHEDULER.submit('crew', on_update=_queue_updates(q))
+    try:
+        run_id = _new_run_id()
+        _register_run(run_id, q, test_name=test_name, workspace=str(_create_workspace(run_id)))
+    except BaseException:
+        ticket.withdraw()
+        raise
+    task = asyncio.create_task(_generate_scenarios(test_name, app_url, test_desc, force_refresh, run_id, ticket))
+    flight = {'run_id': run_id, 'task': task}
+    SCENARIO_FLIGHTS[test_name] = flight
+
+    def _done(t: asyncio.Task) -> None:
+        if SCENARIO_FLIGHTS.get(test_name) is flight:
+            SCENARIO_FLIGHTS.pop(test_name, None)
+        if not t.cancelled():
+            t.exception()  # retrieved here; awaiting callers still get it re-raised
+
+    task.add_done_callback(_done)
+    return flight
+
+async def _ensure_scenarios(test_name: str, app_url: str, test_desc: str, force_refresh: bool = False):
+    """Generate scenarios if missing, joining an in-flight generation for the same test."""
+    if _resolve_scenarios_path(test_name):
+        return
+    flight = _scenarios_flight(test_name, app_url, test_desc, force_refresh)
+    # shield: one caller going away must not cancel the generation the others wait on
+    await asyncio.shield(flight['task'])
 
 def _crewai_cmd():
     """
     Return the CLI to start a CrewAI run.
     Prefer the installed console script; fall back to module execution.
     """
-    exe = which("crewai")
-    if exe:
-        return [exe, "run"]
-
-    spec = importlib.util.find_spec("crewai.cli")
-    if spec is not None:
-        return [sys.executable, "-m", "crewai.cli", "run"]
-
-    spec2 = importlib.util.find_spec("crewai")
-    if spec2 is not None:
-        return [sys.executable, "-m", "crewai", "run"]
-
-    raise RuntimeError("CrewAI CLI not found. Install it in this venv (e.g. `pip install crewai`).")
+    return TOOLCHAIN.crewai_cmd()
 
 # API Endpoints
 
@@ -396,63 +856,71 @@ async def start_run(payload: Dict):
     if not all(k in payload and str(payload[k]).strip() for k in required):
         raise HTTPException(status_code=400, detail='Missing required fields.')
 
-    run_id = str(int(time.time() * 1000))
-    q: asyncio.Queue = asyncio.Queue()
-    test_name = payload['test_name'].strip()
-    RUNS[run_id] = {'q': q, 'test_name': test_name}
-
-    _ensure_test_in_index(test_name)
-
+    priority = _job_priority(payload)
+    q = _new_stream()
+    ticket = SCHEDULER.submit('crew', priority, _queue_updates(q))
     try:
-        idx = _read_index()
-        entry = idx.get(test_name, {}) or {}
-        entry['last_app_url'] = payload['application_url'].strip()
-        idx[test_name] = entry
-        _write_index(idx)
-    except Exception:
-        pass
-
-    # Environment for the crew
-    env = os.environ.copy()
-    env.update({
-        'APP_URL': payload['application_url'].strip(),
-        'TEST_NAME': test_name,
-        'TEST_DESC': payload['test_description'].strip(),
-        'PYTHONUNBUFFERED': '1',
-        'PYTHONIOENCODING': 'utf-8'
-    })
-
-    # Launch crewai workflow
-    cmd = _crewai_cmd()
-    proc = await asyncio.create_subprocess_exec(
-        *cmd,
-        cwd=str(REPO_ROOT),
-        stdout=asyncio.subprocess.PIPE,
-        stderr=asyncio.subprocess.PIPE,
-        env=env,
-    )
-
-    asyncio.create_task(_enqueue_stream(proc, q, run_id))
+        run_id = _new_run_id()
+        test_name = payload['test_name'].strip()
+        ws = _create_workspace(run_id)
+        _register_run(run_id, q, test_name=test_name, workspace=str(ws))
+
+        _ensure_test_in_index(test_name)
+        INDEX.update(test_name, last_app_url=payload['application_url'].strip())
+
+        # Launch crewai workflow on a warm worker
+        job_env = _crew_env(payload['application_url'], test_name, payload['test_description'],
+                            RUN_WORKSPACE=_workspace_rel(ws),
+                            **_seed_exploration(ws, payload['application_url'], payload['test_description'],
+                                                bool(payload.get('force_refresh'))))
+    except BaseException:
+        ticket.withdraw()
+        raise
+    asyncio.create_task(_enqueue_stream(job_env, q, run_id, ticket))
     return JSONResponse({'run_id': run_id})
 
 @app.get('/api/stream/{run_id}')
-async def stream(run_id: str):
+async def stream(run_id: str, request: Request, last_event_id: Optional[int] = None):
+    """
+    SSE log of a run. Each event carries a JSON array of messages and the id of
+    the last one; reconnecting with Last-Event-ID (or ?last_event_id=) resumes
+    after it. Any number of clients can follow the same run.
+    """
     if run_id not in RUNS:
         raise HTTPException(status_code=404, detail='Invalid run id')
-    q: asyncio.Queue = RUNS[run_id]['q']
+    rs: RunStream = RUNS[run_id]['q']
+    if last_event_id is None:
+        try:
+            last_event_id = int(request.headers.get('last-event-id', '0'))
+        except ValueError:
+            last_event_id = 0
 
     async def event_gen() -> AsyncGenerator[dict, None]:
-        try:
-            while True:
-                msg = await q.get()
-                yield {'event': 'message', 'data': json.dumps(msg)}
-                if msg.get('status') == 'finished':
-                    break
-        finally:
-            RUNS.pop(run_id, None)
+        async for seq, batch in rs.subscribe(last_event_id, STREAM_FLUSH_S):
+            yield {'event': 'message', 'id': str(seq), 'data': json.dumps(batch)}
 
     return EventSourceResponse(event_gen())
 
+@app.get('/api/runs/{run_id}/log')
+async def run_log(run_id: str, offset: Optional[int] = None, limit: int = 65536,
+                  tail: Optional[int] = None, line: Optional[int] = None):
+    """
+    Ranged read of a run's on-disk log: `limit` bytes from byte `offset` or from
+    line number `line`, or the last `tail` bytes. Pass `next_offset` back as
+    `offset` to continue; `live` tells whether the run is still writing.
+    """
+    if not re.fullmatch(r'[\w.-]+', run_id):
+        raise HTTPException(status_code=400, detail='Invalid run id')
+    path = _run_log_path(run_id)
+    if not path.is_file():
+        raise HTTPException(status_code=404, detail='No log for this run')
+    limit = min(max(0, limit), 1024 * 1024)
+    if tail is not None:
+        tail = min(max(0, tail), 1024 * 1024)
+    run = RUNS.get(run_id)
+    result = await asyncio.to_thread(read_range, str(path), offset, limit, tail, line)
+    return {'run_id': run_id, 'live': bool(run and not run['q'].finished), **result}
+
 @app.get('/api/report')
 async def get_report():
     path = os.path.join(OUTPUT_DIR, 'final_report.md')
@@ -477,22 +945,32 @@ async def serve_outputs(file_path: str):
 
 
 @app.get('/api/tests')
-async def list_tests():
-    if os.path.isdir(TESTS_DIR):
-        for f in os.listdir(TESTS_DIR):
-            if f.endswith('.spec.ts'):
-                _ensure_test_in_index(f[:-8])  
-    idx = _read_index()
-    return JSONResponse(list(idx.values()))
+async def list_tests(request: Request, status: Optional[str] = None, sort: str = 'name',
+                     order: str = 'asc', limit: Optional[int] = None, offset: int = 0):
+    if sort not in INDEX_SORTABLE:
+        raise HTTPException(status_code=400, detail=f"sort must be one of {', '.join(INDEX_SORTABLE)}")
+    if order not in ('asc', 'desc'):
+        raise HTTPException(status_code=400, detail="order must be 'asc' or 'desc'")
+    if limit is not None:
+        limit = min(max(1, limit), TESTS_PAGE_MAX)
+    offset = max(0, offset)
+
+    CATALOG.refresh()
+    etag = CATALOG.etag(status, sort, order, limit, offset)
+    headers = {'ETag': etag, 'Cache-Control': 'no-cache'}
+    if etag in [t.strip() for t in request.headers.get('if-none-match', '').split(',')]:
+        return Response(status_code=304, headers=headers)
+    rows, total = CATALOG.page(status=status, order_by=sort, descending=order == 'desc',
+                               limit=limit, offset=offset)
+    headers['X-Total-Count'] = str(total)
+    return JSONResponse(rows, headers=headers)
 
 @app.get('/api/tests/{name}')
 async def get_test(name: str = Path(...)):
-    idx = _read_index()
-    meta = idx.get(name)
+    meta = INDEX.get(name)
     if not meta:
         _ensure_test_in_index(name)
-        idx = _read_index()
-        meta = idx.get(name)
+        meta = INDEX.get(name)
 
     code = ''
     code_path = os.path.join(TESTS_DIR, f'{name}.spec.ts')
@@ -546,68 +1024,269 @@ async def update_test(name: str, payload: Dict):
     except Exception as e:
         raise HTTPException(status_code=500, detail=f'Failed to save code: {e}')
 
+    FILES.note(dest)
     _ensure_test_in_index(safe)  
     return JSONResponse({"ok": True, "name": safe, "path": str(os.path.relpath(dest, REPO_ROOT))})
 
-@app.post("/api/run-test")
-async def api_run_test(req: RunTestRequest):
+async def _execute_run_test(req: RunTestRequest, run_id: str, q: RunStream, ticket,
+                            include_output: bool = False) -> Dict[str, Any]:
+    """
+    Run one spec, streaming its output into the run's stream/log while keeping
+    only a capped excerpt in memory. The process group is killed on timeout.
+    The summary carries the excerpts only with `include_output`.
+    """
     spec = _normalize_spec(req.spec)
-    cmd = _find_playwright_cmd() + ["test", spec]
-    if req.headed:
-        cmd.append("--headed")
+    test_name = _test_name_from_spec(spec)
+    ts = time.strftime('%Y%m%d-%H%M%S', time.gmtime())
+    safe_name = re.sub(r'[^a-zA-Z0-9._-]+', '_', test_name) if test_name else 'unknown'
+    json_rel = f'reports/{safe_name}-playwright-{ts}.json'
+    timeout_s = req.timeout_s or RUN_TEST_TIMEOUT_S
+    out = CappedOutput(RUN_TEST_OUTPUT_CAP)
+    err = CappedOutput(RUN_TEST_OUTPUT_CAP)
 
-    proc = await asyncio.create_subprocess_exec(
-        *cmd,
-        cwd=str(REPO_ROOT),
-        stdout=asyncio.subprocess.PIPE,
-        stderr=asyncio.subprocess.PIPE,
-    )
-    out, err = await proc.communicate()
+    async def on_stdout(line: str) -> None:
+        await q.put({'line': line})
 
-    status = "passed" if proc.returncode == 0 else "failed"
+    async def on_stderr(line: str) -> None:
+        await q.put({'line': f'[stderr] {line}'})
 
-    test_name = None
-    s = spec.replace("\\", "/")
-    m = re.search(r"tests/(.+?)\.spec\.ts$", s)
-    if m:
-        test_name = m.group(1)
-    else:
-        base = os.path.basename(s)
-        test_name = base[:-8] if base.endswith(".spec.ts") else base
+    timed_out = False
+    returncode: Optional[int] = None
+    try:
+        cmd = _find_playwright_cmd() + ["test", spec, "--reporter=list,json"]
+        if req.headed:
+            cmd.append("--headed")
+        env = os.environ.copy()
+        env.update(json_reporter_env(OUTPUT_DIR / json_rel))
+
+        async with ticket:
+            proc = await asyncio.create_subprocess_exec(
+                *cmd,
+                cwd=str(REPO_ROOT),
+                stdout=asyncio.subprocess.PIPE,
+                stderr=asyncio.subprocess.PIPE,
+                env=env,
+                limit=1024 * 1024,
+                **process_group_kwargs(),
+            )
+            pumps = asyncio.gather(pump_lines(proc.stdout, out, on_stdout), pump_lines(proc.stderr, err, on_stderr))
+            try:
+                await asyncio.wait_for(asyncio.shield(pumps), timeout_s)
+            except asyncio.TimeoutError:
+                timed_out = True
+                await q.put({'line': f'Timed out after {timeout_s:g}s; killing the Playwright process group.'})
+                await kill_process_group_async(proc)
+                await pumps
+            except asyncio.CancelledError:
+                await kill_process_group_async(proc)
+                raise
+            returncode = await proc.wait()
+
+        pw_report = load_report(OUTPUT_DIR / json_rel)
+        tests = test_rows(pw_report) if pw_report else []
+        status = (overall_status(pw_report) if pw_report and not timed_out else None) or (
+            "passed" if returncode == 0 and not timed_out else "failed")
+
+        # Write a simple text report so the UI can show the latest run
+        report_rel = f'reports/{safe_name}-playwright-{ts}.txt'
+        report_dst = os.path.join(OUTPUT_DIR, report_rel)
+        os.makedirs(os.path.dirname(report_dst), exist_ok=True)
+        try:
+            with open(report_dst, 'w', encoding='utf-8') as f:
+                f.write("Command: " + " ".join(cmd) + "\n")
+                f.write(f"Return code: {returncode}\n")
+                f.write(f"Status: {status}{' (timed out)' if timed_out else ''}\n")
+                f.write(f"Full log: {_run_log_path(run_id).relative_to(REPO_ROOT).as_posix()}\n\n")
+                f.write("===== STDOUT =====\n")
+                f.write(out.text())
+                f.write("\n\n===== STDERR =====\n")
+                f.write(err.text())
+        except Exception:
+            report_rel = None  # don't block on reporting
 
-    # Write a simple text report so the UI can show the latest run
-    ts = time.strftime('%Y%m%d-%H%M%S', time.gmtime())
-    safe_name = re.sub(r'[^a-zA-Z0-9._-]+', '_', test_name) if test_name else 'unknown'
-    report_rel = f'reports/{safe_name}-playwright-{ts}.txt'
-    report_dst = os.path.join(OUTPUT_DIR, report_rel)
-    os.makedirs(os.path.dirname(report_dst), exist_ok=True)
+        # Persist meta
+        try:
+            _update_test_after_run(test_name, status, report_rel, tests)
+        except Exception:
+            pass
+
+        result = {
+            "run_id": run_id,
+            "spec": spec,
+            "headed": req.headed,
+            "returncode": returncode,
+            "status": status,
+            "timed_out": timed_out,
+            "tests": tests,
+            "results_file": json_rel if pw_report else None,
+            "report_file": report_rel,
+            "log_url": f"/api/runs/{run_id}/log",
+            "truncated": out.truncated or err.truncated,
+            "output_bytes": out.total_bytes + err.total_bytes,
+            "ran": " ".join(cmd),
+        }
+        if include_output:
+            result.update(stdout=out.text(), stderr=err.text())
+    except asyncio.CancelledError:
+        # close the stream so subscribers stop waiting and the run can be evicted
+        ticket.withdraw()
+        q.put_nowait({'line': 'Run cancelled.'})
+        q.put_nowait({'status': 'finished', 'result': {"run_id": run_id, "spec": spec, "status": "cancelled",
+                                                       "log_url": f"/api/runs/{run_id}/log"}})
+        raise
+    except Exception as e:
+        ticket.withdraw()  # no-op once the ticket has been entered and released
+        result = {"run_id": run_id, "spec": spec, "status": "failed", "error": str(e),
+                  "log_url": f"/api/runs/{run_id}/log"}
+        await q.put({'line': f'Playwright run failed to start: {e}'})
+    await q.put({'status': 'finished', 'result': {k: v for k, v in result.items() if k not in ('stdout', 'stderr')}})
+    return result
+
+@app.post("/api/run-test")
+async def api_run_test(req: RunTestRequest, include_output: bool = False):
+    """
+    Run one spec. Output goes to the run's log (/api/runs/{run_id}/log) and
+    stream as it arrives; the response is a summary with the log's URL, plus
+    capped stdout/stderr excerpts with `?include_output=true`. With
+    `stream: true` the call returns 202 with a run_id right away and the
+    summary arrives as the `result` of the final stream message.
+    """
+    q = _new_stream()
+    ticket = SCHEDULER.submit("playwright", on_update=_queue_updates(q))
     try:
-        with open(report_dst, 'w', encoding='utf-8') as f:
-            f.write("Command: " + " ".join(cmd) + "\n")
-            f.write(f"Return code: {proc.returncode}\n")
-            f.write(f"Status: {status}\n\n")
-            f.write("===== STDOUT =====\n")
-            f.write(out.decode(errors="replace"))
-            f.write("\n\n===== STDERR =====\n")
-            f.write(err.decode(errors="replace"))
-    except Exception:
-        report_rel = None  # don't block on reporting
+        run_id = _new_run_id()
+        _register_run(run_id, q, test_name=_test_name_from_spec(_normalize_spec(req.spec)))
+    except BaseException:
+        ticket.withdraw()
+        raise
+    if req.stream:
+        asyncio.create_task(_execute_run_test(req, run_id, q, ticket))
+        return JSONResponse(status_code=202, content={"run_id": run_id, "log_url": f"/api/runs/{run_id}/log"})
+    return await _execute_run_test(req, run_id, q, ticket, include_output)
+
+def _select_suite_specs(req: RunSuiteRequest) -> List[str]:
+    specs = [_normalize_spec(s) for s in req.specs or []]
+    if req.glob:
+        pattern = req.glob.replace("\\", "/").removeprefix("tests/")
+        if pattern.startswith("/") or ".." in pattern.split("/"):
+            raise HTTPException(status_code=400, detail="glob must stay inside tests/")
+        # only real specs: a broad pattern also matches .bak.N backups and .codegen scratch files
+        specs += sorted(p.relative_to(REPO_ROOT).as_posix() for p in TESTS_DIR.glob(pattern)
+                        if p.is_file() and is_test_file(p.relative_to(TESTS_DIR).as_posix()))
+    return list(dict.fromkeys(specs))
+
+async def _run_suite_stream(suite_id: str, q: RunStream, cmds: List[List[str]], tickets) -> None:
+    """Run every shard, stream per-test/per-spec results, then record all specs in one index write."""
+    results = SuiteResults()
+    log: List[str] = []
+    prefix = len(cmds) > 1
+
+    async def run_shard(i: int, cmd: List[str], ticket) -> int:
+        env = os.environ.copy()
+        env['PW_OUTPUT_DIR'] = str(SUITES_DIR / suite_id / f'shard-{i}')
+        env.update(json_reporter_env(SUITES_DIR / suite_id / f'shard-{i}.json'))
+        (SUITES_DIR / suite_id).mkdir(parents=True, exist_ok=True)
+        async with ticket:
+            proc = await asyncio.create_subprocess_exec(
+                *cmd,
+                cwd=str(REPO_ROOT),
+                stdout=asyncio.subprocess.PIPE,
+                stderr=asyncio.subprocess.STDOUT,
+                env=env,
+                limit=1024 * 1024,
+            )
+            assert proc.stdout is not None
+            async for raw in proc.stdout:
+                line = raw.decode(errors='replace').rstrip()
+                line = f'[shard {i}] {line}' if prefix else line
+                log.append(line)
+                await q.put({'line': line})
+                test = parse_list_line(raw.decode(errors='replace'))
+                if test:
+                    spec = results.add(test)
+                    await q.put({'test': {**test, 'shard': i}, 'spec': dict(spec)})
+            return await proc.wait()
+
+    returncodes: List[Any] = []
+    try:
+        returncodes = await asyncio.gather(
+            *(run_shard(i, cmd, t) for i, (cmd, t) in enumerate(zip(cmds, tickets), start=1)),
+            return_exceptions=True,
+        )
+    finally:
+        for t in tickets:
+            t.withdraw()  # no-op for shards that ran
+        returncodes = [rc if isinstance(rc, int) else repr(rc) for rc in returncodes]
+        summary = results.summary()
+        ts = time.strftime('%Y%m%d-%H%M%S', time.gmtime())
+        report_rel = f'reports/suite-{suite_id}-{ts}.txt'
+        try:
+            with open(os.path.join(OUTPUT_DIR, report_rel), 'w', encoding='utf-8') as f:
+                for i, cmd in enumerate(cmds, start=1):
+                    f.write(f"Command {i}: {' '.join(cmd)}\n")
+                f.write(f"Return codes: {returncodes}\n")
+                f.write(f"Summary: {json.dumps(summary)}\n\n")
+                f.write("\n".join(log))
+        except Exception:
+            report_rel = None
+        # the JSON reports are authoritative; the streamed list-reporter rollup is the fallback
+        rows = []
+        for i in range(1, len(cmds) + 1):
+            pw_report = load_report(SUITES_DIR / suite_id / f'shard-{i}.json')
+            if pw_report:
+                rows += [dict(r, test_name=spec_test_name(r['file'])) for r in test_rows(pw_report)]
+        statuses = {spec_test_name(s['file']): s['status'] for s in results.specs.values()}
+        if rows:
+            statuses = {}
+            for r in rows:
+                if r['status'] == 'failed':
+                    statuses[r['test_name']] = 'failed'
+                elif r['status'] in ('passed', 'flaky'):
+                    statuses.setdefault(r['test_name'], 'passed')
+        now = _now_iso()
+        INDEX.record_runs([(name, now, status, report_rel)
+                           for name, status in statuses.items() if status != 'skipped'])
+        INDEX.record_results(now, rows)
+        await q.put({'suite': {**summary, 'returncodes': returncodes, 'report': report_rel}})
+        await q.put({'status': 'finished'})
 
-    # Persist meta
+@app.post("/api/run-suite")
+async def api_run_suite(req: RunSuiteRequest):
+    """
+    Run many specs in one Playwright invocation per shard; follow progress on
+    /api/stream/{run_id} ({test, spec} events per finished test, then {suite}).
+    """
+    specs = _select_suite_specs(req)
+    if not specs and not req.tag:
+        raise HTTPException(status_code=400, detail="No specs matched; pass specs, glob or tag.")
+    grep = None
+    if req.tag:
+        tag = req.tag if req.tag.startswith("@") else f"@{req.tag}"
+        grep = re.escape(tag) + r"\b"
+    workers = req.workers or (int(os.environ['PW_WORKERS']) if os.environ.get('PW_WORKERS') else None)
+    base = _find_playwright_cmd()
+    cmds = [shard_cmd(base, specs, i, req.shards, workers, grep, req.headed) for i in range(1, req.shards + 1)]
+
+    q = _new_stream()
+    tickets = []
     try:
-        _update_test_after_run(test_name, status, report_rel)
-    except Exception:
-        pass
+        for _ in cmds:
+            tickets.append(SCHEDULER.submit("playwright", req.priority, _queue_updates(q)))
+    except SchedulerFull:
+        for t in tickets:
+            t.withdraw()
+        raise
 
-    return {
-        "spec": spec,
-        "headed": req.headed,
-        "returncode": proc.returncode,
-        "status": status,
-        "stdout": out.decode(errors="replace"),
-        "stderr": err.decode(errors="replace"),
-        "ran": " ".join(cmd),
-    }
+    try:
+        suite_id = _new_run_id()
+        _register_run(suite_id, q, test_name=None)
+    except BaseException:
+        for t in tickets:
+            t.withdraw()
+        raise
+    asyncio.create_task(_run_suite_stream(suite_id, q, cmds, tickets))
+    return {"run_id": suite_id, "specs": specs, "shards": req.shards, "workers": workers,
+            "commands": [" ".join(c) for c in cmds]}
 
 @app.post("/api/tests/{name}/codegen")
 async def launch_codegen(name: str, req: CodegenRequest):
@@ -618,11 +1297,10 @@ async def launch_codegen(name: str, req: CodegenRequest):
     # 1) explicit url from request (if provided)
     url = (getattr(req, "url", None) or "").strip() or None
 
-    # 2) fallback: previously stored app URL in tests_index.json
+    # 2) fallback: previously stored app URL in the test index
     if not url:
         try:
-            idx = _read_index()
-            entry = idx.get(safe) or {}
+            entry = INDEX.get(safe) or {}
             last = (entry.get("last_app_url") or "").strip()
             if last:
                 url = last
@@ -638,23 +1316,8 @@ async def launch_codegen(name: str, req: CodegenRequest):
     local_bin = _local_playwright_bin(REPO_ROOT)
     cli = [local_bin] if local_bin else ["npx", "playwright"]
 
-    # Probe supported targets from --help (do not use 'ts'/'typescript')
-    help_proc = await asyncio.create_subprocess_exec(
-        *cli, "codegen", "--help",
-        stdout=asyncio.subprocess.PIPE,
-        stderr=asyncio.subprocess.STDOUT,
-        cwd=str(REPO_ROOT),
-        env=env,
-    )
-    help_out = (await help_proc.communicate())[0].decode("utf-8", "ignore")
-    preferred = ["playwright-test", "test", "javascript", "python", "python-async", "java", "csharp"]
-
-    def _supports(tkn: str) -> bool:
-        # match as a whole word in help output
-        import re
-        return re.search(rf'(?m)\b{re.escape(tkn)}\b', help_out) is not None
-
-    target = next((t for t in preferred if _supports(t)), None)
+    # supported targets come from a cached `codegen --help` probe (see backend/toolchain.py)
+    target = await TOOLCHAIN.codegen_target()
     if target:
         print(f"[codegen] using target: {target}")
     else:
@@ -681,17 +1344,25 @@ async def launch_codegen(name: str, req: CodegenRequest):
                 content={"error": "No DISPLAY found and xvfb-run not available. Run in a desktop session or install xvfb."},
             )
 
+    # the slot is held until the codegen window is closed (see _finalize); while
+    # another window is open the caller gets 429 with a position and ETA
+    ticket = SCHEDULER.submit("codegen", wait=False)
+
     print("[codegen] launching:", cmd)
     print("[codegen] writing to TMP:", tmp_path)
 
     # Launch and stream output (so errors are visible)
-    proc = await asyncio.create_subprocess_exec(
-        *cmd,
-        cwd=str(REPO_ROOT),
-        env=env,
-        stdout=asyncio.subprocess.PIPE,
-        stderr=asyncio.subprocess.STDOUT,
-    )
+    try:
+        proc = await asyncio.create_subprocess_exec(
+            *cmd,
+            cwd=str(REPO_ROOT),
+            env=env,
+            stdout=asyncio.subprocess.PIPE,
+            stderr=asyncio.subprocess.STDOUT,
+        )
+    except Exception:
+        ticket.release()
+        raise
 
     async def _stream():
         assert proc.stdout is not None
@@ -722,7 +1393,9 @@ async def launch_codegen(name: str, req: CodegenRequest):
                 if dest_path.exists():
                     backup = dest_path.with_suffix(dest_path.suffix + f".bak.{int(time.time())}")
                     dest_path.replace(backup)
+                    FILES.forget(dest_path)
                 dest_path.write_text(code, encoding="utf-8")
+                FILES.note(dest_path)
 
                 # cleanup tmp candidates
                 for p in set(candidates):
@@ -736,6 +1409,8 @@ async def launch_codegen(name: str, req: CodegenRequest):
                 print("[codegen] no output produced — keeping previous spec.")
         except Exception as e:
             print("[codegen] finalize error:", e)
+        finally:
+            ticket.release()
 
     asyncio.create_task(_stream())
     asyncio.create_task(_finalize())
@@ -757,7 +1432,9 @@ async def save_test_code(name: str, body: SaveCodeBody):
         if dest_path.exists():
             backup = dest_path.with_suffix(dest_path.suffix + f".bak.{int(time.time())}")
             dest_path.replace(backup)
+            FILES.forget(dest_path)
         dest_path.write_text(code, encoding="utf-8")
+        FILES.note(dest_path)
         return {"ok": True, "path": str(dest_path)}
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Failed to save: {e}")
@@ -765,7 +1442,7 @@ async def save_test_code(name: str, body: SaveCodeBody):
 
 
 @app.get("/api/diagnostics/codegen")
-async def diag_codegen():
+async def diag_codegen(refresh: bool = False):
     info = {
         "platform": platform.platform(),
         "python": sys.version.split()[0],
@@ -774,18 +1451,69 @@ async def diag_codegen():
         "local_playwright_bin": _local_playwright_bin(REPO_ROOT),
         "env_DISPLAY": os.environ.get("DISPLAY"),
     }
-    async def _run(*args):
-        p = await asyncio.create_subprocess_exec(
-            *args, cwd=str(REPO_ROOT),
-            stdout=asyncio.subprocess.PIPE, stderr=asyncio.subprocess.STDOUT
-        )
-        out = (await p.communicate())[0].decode("utf-8", "ignore")
-        return {"rc": p.returncode, "out": out}
-    cli = [_local_playwright_bin(REPO_ROOT)] if _local_playwright_bin(REPO_ROOT) else ["npx", "playwright"]
-    info["playwright_version"] = await _run(*cli, "--version")
-    info["codegen_help"] = await _run(*cli, "codegen", "--help")
+    probe = await TOOLCHAIN.probe(refresh=refresh)
+    info["playwright_version"] = probe["playwright_version"]
+    info["codegen_help"] = probe["codegen_help"]
+    info["codegen_targets"] = probe["codegen_targets"]
+    info["probed_at"] = probe["probed_at"]
     return info
 
+@app.get("/api/diagnostics/crew-pool")
+async def diag_crew_pool():
+    if CREW_POOL is None:
+        return {"enabled": False, "size": CREW_POOL_SIZE}
+    return {"enabled": True, **CREW_POOL.stats()}
+
+@app.get("/api/cache/exploration")
+async def exploration_cache_stats():
+    if EXPLORATION_CACHE is None:
+        return {"enabled": False}
+    return {"enabled": True, **EXPLORATION_CACHE.stats()}
+
+@app.get("/api/tests/{name}/results")
+async def test_results(name: str, runs: int = 1):
+    """Per-test status, duration, retries and error location of the latest run(s)."""
+    return {"name": name, "results": INDEX.results(sanitize_name(name), runs=min(max(1, runs), INDEX.results_keep))}
+
+@app.get("/api/results/slowest")
+async def slowest_results(limit: int = 20):
+    return {"results": INDEX.slowest(limit=min(max(1, limit), 500))}
+
+@app.get("/api/telemetry")
+async def telemetry_summary(by: str = "task", runs: int = 50, mode: Optional[str] = None):
+    """Where crew time and tokens go: per-task or per-agent aggregates over recent runs."""
+    try:
+        rows = INDEX.span_summary(by=by, runs=min(max(1, runs), 1000), mode=mode)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    total = sum(r["total_s"] or 0 for r in rows) or None
+    for r in rows:
+        r["share"] = round((r["total_s"] or 0) / total, 3) if total else None
+    return {"by": by, "runs": runs, "mode": mode, "stages": rows}
+
+@app.get("/api/runs/{run_id}/telemetry")
+async def run_telemetry(run_id: str):
+    spans = INDEX.run_spans(run_id)
+    if not spans:
+        raise HTTPException(status_code=404, detail="No telemetry for this run.")
+    return {"run_id": run_id, "spans": spans}
+
+@app.get("/api/scheduler")
+async def scheduler_stats():
+    return SCHEDULER.stats()
+
+@app.get("/api/diagnostics/browser-server")
+async def diag_browser_server():
+    if BROWSER_SERVER is None:
+        return {"enabled": False}
+    return {"enabled": True, **BROWSER_SERVER.stats()}
+
+@app.get("/api/diagnostics/mcp")
+async def diag_mcp():
+    if MCP_SERVER is None:
+        return {"enabled": False}
+    return {"enabled": True, **MCP_SERVER.stats()}
+
 class ScenarioReq(BaseModel):
     application_url: str
     test_description: str
@@ -795,6 +1523,7 @@ async def get_or_create_scenarios(
     name: str = Path(...),
     application_url: str = "",
     test_description: str = "",
+    force_refresh: bool = False,
 ):
     safe = sanitize_name(name).strip()
     path = _resolve_scenarios_path(safe) or _scenarios_path(safe)
@@ -802,12 +1531,31 @@ async def get_or_create_scenarios(
     if not os.path.isfile(path):
         if not (application_url and test_description):
             raise HTTPException(status_code=404, detail='Scenarios not found for this test.')
-        await _ensure_scenarios(safe, application_url, test_description)
+        await _ensure_scenarios(safe, application_url, test_description, force_refresh)
         path = _resolve_scenarios_path(safe) or _scenarios_path(safe)
 
     scenarios = _read_scenarios_file(path)
     return JSONResponse(scenarios)
 
+@app.post('/api/tests/{name}/scenarios')
+async def request_scenarios(name: str = Path(...), payload: Dict[str, Any] = Body(...)):
+    """
+    Async variant: returns the scenarios when they already exist, otherwise 202 with
+    a run id whose progress streams on /api/stream/{run_id}; GET the scenarios once
+    the stream reports { status: "finished", scenarios: "ready" }.
+    """
+    safe = sanitize_name(name).strip()
+    path = _resolve_scenarios_path(safe)
+    if path:
+        return JSONResponse({'status': 'ready', 'scenarios': _read_scenarios_file(path)})
+
+    application_url = str(payload.get('application_url') or '').strip()
+    test_description = str(payload.get('test_description') or '').strip()
+    if not (application_url and test_description):
+        raise HTTPException(status_code=404, detail='Scenarios not found for this test.')
+    flight = _scenarios_flight(safe, application_url, test_description, bool(payload.get('force_refresh')))
+    return JSONResponse({'status': 'generating', 'run_id': flight['run_id']}, status_code=202)
+
 class ScenarioItem(BaseModel):
     id: str
     title: Optional[str] = ""
@@ -841,59 +1589,23 @@ async def run_many(
         except Exception as e:
             raise HTTPException(status_code=400, detail=f"Invalid scenario: {e}")
 
-    # Persist the exact selected scenarios so the script generator can use them
-    cases_path = TESTS_DIR.parent / "output" / "Testcases" / f"{base_name}_test_cases.json"
-    cases_path.parent.mkdir(parents=True, exist_ok=True)
-    with open(cases_path, "w", encoding="utf-8") as f:
-        import json as _json
-        _json.dump([s.model_dump() for s in scenarios], f, indent=2, ensure_ascii=False)
-
-    # Build a *combined* description telling the generator to produce one spec with multiple tests
-    import json as _json
-    combined_desc = _json.dumps(
-        {
-            "note": "MULTI_SCENARIO",
-            "instruction": "Generate ONE Playwright spec file with multiple tests: one test per scenario, in the given order. Use test.describe('Feature'), test.beforeEach to goto APP_URL (or BASE_URL), and test.describe.configure({ mode: 'serial' }) so they run one-by-one.",
-            "scenarios": [s.model_dump() for s in scenarios],
-        },
-        ensure_ascii=False,
-    )
-
     # Prepare run like /api/run
-    run_id = str(int(time.time() * 1000))
-    q: asyncio.Queue = asyncio.Queue()
-    RUNS[run_id] = {"q": q, "test_name": base_name}
-    _ensure_test_in_index(base_name)
-
-    # remember app url for this test
+    priority = _job_priority(payload)
+    q = _new_stream()
+    ticket = SCHEDULER.submit("crew", priority, _queue_updates(q))
     try:
-        idx = _read_index()
-        entry = idx.get(base_name, {}) or {}
-        entry["last_app_url"] = application_url
-        idx[base_name] = entry
-        _write_index(idx)
-    except Exception:
-        pass
-
-    env = os.environ.copy()
-    env.update(
-        {
-            "APP_URL": application_url,
-            "TEST_NAME": base_name,           # single file name
-            "TEST_DESC": combined_desc,       # multi-scenario JSON
-            "PYTHONUNBUFFERED": "1",
-            "PYTHONIOENCODING": "utf-8",
-        }
-    )
-
-    cmd = _crewai_cmd()
-    proc = await asyncio.create_subprocess_exec(
-        *cmd,
-        cwd=str(REPO_ROOT),
-        stdout=asyncio.subprocess.PIPE,
-        stderr=asyncio.subprocess.PIPE,
-        env=env,
-    )
-
-    asyncio.create_task(_enqueue_stream(proc, q, run_id))
+        run_id = _new_run_id()
+        ws = _create_workspace(run_id)
+        _register_run(run_id, q, test_name=base_name, workspace=str(ws))
+        _ensure_test_in_index(base_name)
+
+        # remember app url for this test
+        INDEX.update(base_name, last_app_url=application_url)
+
+        job_env = _crew_env(application_url, base_name, desc, RUN_WORKSPACE=_workspace_rel(ws),
+                            **_seed_exploration(ws, application_url, desc, bool(payload.get("force_refresh"))))
+    except BaseException:
+        ticket.withdraw()
+        raise
+    asyncio.create_task(_run_many_stream(job_env, q, run_id, ticket, scenarios, priority))
     return JSONResponse({"run_id": run_id})
\ No newline at end of file
@@ -0,0 +1,100 @@
+"""
+Merge per-scenario Playwright specs into one spec file.
+
+run-many generates a spec per scenario (or per small batch) in parallel. The
+parts are combined in scenario order: imports are hoisted and de-duplicated,
+and every part's body goes into its own nested `test.describe` inside one
+outer describe, so hooks and top-level constants of different parts stay in
+separate scopes. A part that produced no script becomes a `test.fixme`
+placeholder instead of failing the whole file.
+"""
+import json
+import re
+from typing import Dict, List, Optional, Tuple
+
+_IMPORT_RE = re.compile(r"""^[ \t]*import\s+([\s\S]+?)\s+from\s+['"]([^'"]+)['"][ \t]*;?[ \t]*$""", re.M)
+_SIDE_EFFECT_IMPORT_RE = re.compile(r"""^[ \t]*import\s+['"]([^'"]+)['"][ \t]*;?[ \t]*$""", re.M)
+_NAMED_RE = re.compile(r'^\{([\s\S]*)\}$')
+_INDENT = '  '
+
+
+def _js(s: str) -> str:
+    return json.dumps(s, ensure_ascii=False)
+
+
+class _Imports:
+    def __init__(self):
+        self.modules: List[str] = []
+        self.named: Dict[str, List[str]] = {}
+        self.verbatim: Dict[str, List[str]] = {}
+
+    def _module(self, module: str) -> None:
+        if module not in self.named:
+            self.modules.append(module)
+            self.named[module] = []
+            self.verbatim[module] = []
+
+    def add(self, clause: str, module: str) -> None:
+        self._module(module)
+        clause = ' '.join(clause.split())
+        m = _NAMED_RE.match(clause)
+        if not m:
+            stmt = f"import {clause} from '{module}';"
+            if stmt not in self.verbatim[module]:
+                self.verbatim[module].append(stmt)
+            return
+        for name in (n.strip() for n in m.group(1).split(',')):
+            if name and name not in self.named[module]:
+                self.named[module].append(name)
+
+    def add_side_effect(self, module: str) -> None:
+        self._module(module)
+        stmt = f"import '{module}';"
+        if stmt not in self.verbatim[module]:
+            self.verbatim[module].append(stmt)
+
+    def render(self) -> List[str]:
+        lines = []
+        for module in self.modules:
+            lines.extend(self.verbatim[module])
+            if self.named[module]:
+                lines.append(f"import {{ {', '.join(self.named[module])} }} from '{module}';")
+        return lines
+
+
+def _split_imports(spec: str, imports: _Imports) -> str:
+    for clause, module in _IMPORT_RE.findall(spec):
+        imports.add(clause, module)
+    spec = _IMPORT_RE.sub('', spec)
+    for module in _SIDE_EFFECT_IMPORT_RE.findall(spec):
+        imports.add_side_effect(module)
+    return _SIDE_EFFECT_IMPORT_RE.sub('', spec).strip('\n')
+
+
+def _indent(body: str, depth: int) -> str:
+    # re-indenting would change multi-line template literals, so leave those bodies alone
+    if '`' in body:
+        return body
+    pad = _INDENT * depth
+    return '\n'.join(pad + line if line.strip() else '' for line in body.splitlines())
+
+
+def merge_specs(title: str, parts: List[Tuple[str, Optional[str]]]) -> str:
+    """
+    Combine `(scenario title, spec source or None)` pairs, in the given order,
+    into a single spec with one outer describe block.
+    """
+    imports = _Imports()
+    imports.add('{ test, expect }', '@playwright/test')
+    blocks = []
+    for i, (part_title, spec) in enumerate(parts, start=1):
+        label = _js(f'{i}. {part_title}')
+        if spec and spec.strip():
+            body = _indent(_split_imports(spec, imports), 2)
+        else:
+            body = f'{_INDENT * 2}test.fixme({_js(part_title)}, async () => {{}});'
+        blocks.append(f'{_INDENT}test.describe({label}, () => {{\n{body}\n{_INDENT}}});')
+
+    return '\n'.join(imports.render()) + '\n\n' + (
+        f'test.describe({_js(title)}, () => {{\n' + '\n\n'.join(blocks) + '\n});\n'
+    )
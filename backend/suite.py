@@ -0,0 +1,79 @@
+"""
+Helpers for running many specs in one Playwright invocation.
+
+A suite is split with `--shard=i/N` across N local Playwright processes, each
+with its own worker count and output directory. Per-test results are parsed
+from the `list` reporter as they are printed and folded into per-spec
+results (a spec fails if any of its tests failed); the json reporter's file
+is read once the shard exits.
+"""
+import re
+from typing import Dict, List, Optional
+
+# "  ✓  3 [chromium] › login.spec.ts:12:5 › Login › rejects bad password (1.2s)"
+# (non-UTF-8 consoles print "ok" / "x" instead of the check marks)
+_LIST_LINE_RE = re.compile(
+    r'^\s*(?P<mark>✓|✘|ok|x|-|°)\s+\d+\s+'
+    r'(?:\[[^\]]*\]\s+›\s+)?'
+    r'(?P<file>[^\s:]+\.(?:spec|test)\.[jt]sx?):\d+:\d+\s+›\s+'
+    r'(?P<title>.*?)'
+    r'(?:\s+\((?P<dur>\d+(?:\.\d+)?)(?P<unit>ms|s|m)\))?\s*$'
+)
+_STATUS = {'✓': 'passed', 'ok': 'passed', '✘': 'failed', 'x': 'failed', '-': 'skipped', '°': 'skipped'}
+_UNIT_MS = {'ms': 1, 's': 1000, 'm': 60000}
+
+
+def parse_list_line(line: str) -> Optional[Dict]:
+    """Parse one finished-test line of the `list` reporter, or return None."""
+    m = _LIST_LINE_RE.match(line)
+    if not m:
+        return None
+    dur = m.group('dur')
+    return {
+        'file': m.group('file').replace('\\', '/'),
+        'title': m.group('title'),
+        'status': _STATUS[m.group('mark')],
+        'duration_ms': round(float(dur) * _UNIT_MS[m.group('unit')]) if dur else None,
+    }
+
+
+def shard_cmd(base: List[str], specs: List[str], shard: int, shards: int, workers: Optional[int],
+              grep: Optional[str] = None, headed: bool = False) -> List[str]:
+    cmd = base + ['test', *specs, '--reporter=list,json']
+    if shards > 1:
+        cmd.append(f'--shard={shard}/{shards}')
+    if workers:
+        cmd.append(f'--workers={workers}')
+    if grep:
+        cmd += ['--grep', grep]
+    if headed:
+        cmd.append('--headed')
+    return cmd
+
+
+class SuiteResults:
+    """Per-spec rollup of per-test results."""
+
+    def __init__(self):
+        self.specs: Dict[str, Dict] = {}
+
+    def add(self, test: Dict) -> Dict:
+        spec = self.specs.setdefault(test['file'], {'file': test['file'], 'status': 'skipped',
+                                                    'passed': 0, 'failed': 0, 'skipped': 0})
+        spec[test['status']] += 1
+        if spec['failed']:
+            spec['status'] = 'failed'
+        elif spec['passed']:
+            spec['status'] = 'passed'
+        return spec
+
+    def summary(self) -> Dict:
+        totals = {'passed': 0, 'failed': 0, 'skipped': 0}
+        for spec in self.specs.values():
+            for k in totals:
+                totals[k] += spec[k]
+        return {
+            'specs': len(self.specs),
+            'specs_failed': sum(1 for s in self.specs.values() if s['status'] == 'failed'),
+            'tests': totals,
+        }
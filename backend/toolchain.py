@@ -0,0 +1,121 @@
+"""
+Cached discovery of the external toolchain (Playwright CLI, CrewAI CLI).
+
+Command lookups and `playwright --version` / `codegen --help` probes are
+done once and reused. Playwright results are keyed on a cheap signature of
+`node_modules` (mtimes of `.bin` and npm's `.package-lock.json`) plus PATH,
+so `npm install` or an upgrade invalidates them without a restart.
+"""
+import asyncio
+import importlib.util
+import os
+import pathlib
+import re
+import sys
+import time
+from shutil import which
+from typing import Dict, List, Optional, Tuple
+
+# codegen --target values, best first (never 'ts'/'typescript')
+CODEGEN_TARGETS = ('playwright-test', 'test', 'javascript', 'python', 'python-async', 'java', 'csharp')
+
+
+def _mtime_ns(p: pathlib.Path) -> int:
+    try:
+        return os.stat(p).st_mtime_ns
+    except OSError:
+        return -1
+
+
+class Toolchain:
+    def __init__(self, repo_root: pathlib.Path):
+        self.repo_root = pathlib.Path(repo_root)
+        self._cache: Dict[str, Tuple[tuple, object]] = {}
+        self._probe_lock = asyncio.Lock()
+        self.probes = 0
+
+    def local_playwright_bin(self) -> Optional[str]:
+        bin_name = 'playwright.cmd' if os.name == 'nt' else 'playwright'
+        cand = self.repo_root / 'node_modules' / '.bin' / bin_name
+        return str(cand) if cand.exists() else None
+
+    def _node_signature(self) -> tuple:
+        nm = self.repo_root / 'node_modules'
+        return (_mtime_ns(nm / '.bin'), _mtime_ns(nm / '.package-lock.json'), os.environ.get('PATH', ''))
+
+    def _cached(self, key: str, sig: tuple):
+        hit = self._cache.get(key)
+        return hit[1] if hit is not None and hit[0] == sig else None
+
+    def playwright_cmd(self) -> List[str]:
+        sig = self._node_signature()
+        cmd = self._cached('playwright_cmd', sig)
+        if cmd is None:
+            local = self.local_playwright_bin()
+            npx = which('npx')
+            if local:
+                cmd = [local]
+            elif npx:
+                cmd = [npx, 'playwright']
+            else:
+                raise RuntimeError("Playwright CLI not found. Run 'npm install' and 'npx playwright install'.")
+            self._cache['playwright_cmd'] = (sig, cmd)
+        return list(cmd)
+
+    def crewai_cmd(self) -> List[str]:
+        """Prefer the installed console script; fall back to module execution."""
+        sig = (os.environ.get('PATH', ''), sys.executable)
+        cmd = self._cached('crewai_cmd', sig)
+        if cmd is None:
+            exe = which('crewai')
+            if exe:
+                cmd = [exe, 'run']
+            elif importlib.util.find_spec('crewai.cli') is not None:
+                cmd = [sys.executable, '-m', 'crewai.cli', 'run']
+            elif importlib.util.find_spec('crewai') is not None:
+                cmd = [sys.executable, '-m', 'crewai', 'run']
+            else:
+                raise RuntimeError('CrewAI CLI not found. Install it in this venv (e.g. `pip install crewai`).')
+            self._cache['crewai_cmd'] = (sig, cmd)
+        return list(cmd)
+
+    def _cli(self) -> List[str]:
+        local = self.local_playwright_bin()
+        return [local] if local else ['npx', 'playwright']
+
+    async def _run(self, *args: str) -> Dict:
+        self.probes += 1
+        try:
+            p = await asyncio.create_subprocess_exec(
+                *args, cwd=str(self.repo_root),
+                stdout=asyncio.subprocess.PIPE, stderr=asyncio.subprocess.STDOUT,
+            )
+        except OSError as e:
+            return {'rc': None, 'out': str(e)}
+        out = (await p.communicate())[0].decode('utf-8', 'ignore')
+        return {'rc': p.returncode, 'out': out}
+
+    async def probe(self, refresh: bool = False) -> Dict:
+        """Playwright version and codegen capabilities, probed once per node_modules state."""
+        sig = self._node_signature()
+        async with self._probe_lock:
+            info = None if refresh else self._cached('playwright_probe', sig)
+            if info is None:
+                cli = self._cli()
+                version = await self._run(*cli, '--version')
+                codegen_help = await self._run(*cli, 'codegen', '--help')
+                targets = [t for t in CODEGEN_TARGETS
+                           if re.search(rf'(?m)\b{re.escape(t)}\b', codegen_help['out'])]
+                info = {
+                    'cli': cli,
+                    'playwright_version': version,
+                    'codegen_help': codegen_help,
+                    'codegen_targets': targets,
+                    'probed_at': time.strftime('%Y-%m-%dT%H:%M:%SZ', time.gmtime()),
+                }
+                self._cache['playwright_probe'] = (sig, info)
+        return info
+
+    async def codegen_target(self) -> Optional[str]:
+        targets = (await self.probe())['codegen_targets']
+        return targets[0] if targets else None
@@ -0,0 +1,159 @@
+"""
+Crew startup benchmark, per CREW_MODE.
+
+For each mode, a fresh interpreter imports test_agent.crew, instantiates
+TestAutomationCrew and builds the crew (no kickoff, no LLM calls) against a
+workspace seeded with the artifacts the later modes read. Reports import
+and build time, the MCP connect time and which agents were built.
+
+MCP stages need a Playwright MCP server: pass --mcp-url, or --stub-mcp to
+start a local SSE server with placeholder browser tools (connection cost
+only, no browser).
+
+    python benchmarks/crew_startup.py [--runs 3] [--stub-mcp | --mcp-url URL]
+"""
+import argparse
+import json
+import os
+import socket
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+REPO_ROOT = Path(__file__).resolve().parents[1]
+
+# (label, CREW_MODE, extra env)
+MODES = (
+    ('full', 'full', {}),
+    ('plan', 'plan', {}),
+    ('plan, cached exploration', 'plan', {'EXPLORATION_CACHE_HIT': '1'}),
+    ('explore', 'explore', {}),
+    ('script', 'script', {}),
+    ('execute', 'execute', {}),
+)
+
+_PROBE = r"""
+import json, sys, time
+t0 = time.perf_counter()
+from test_agent.crew import TestAutomationCrew
+t1 = time.perf_counter()
+automation = TestAutomationCrew()
+try:
+    crew = automation.crew()
+    t2 = time.perf_counter()
+    print(json.dumps({'import_s': t1 - t0, 'build_s': t2 - t1, 'mcp_s': automation.startup['mcp_s'],
+                      'agents': [a.role.strip() for a in crew.agents],
+                      'mcp_imported': 'crewai_tools' in sys.modules}))
+finally:
+    automation.close()
+"""
+
+_STUB_MCP = r"""
+import sys
+from mcp.server.fastmcp import FastMCP
+
+mcp = FastMCP('playwright-stub', host='127.0.0.1', port=int(sys.argv[1]))
+
+@mcp.tool()
+def browser_navigate(url: str) -> str:
+    '''Navigate to a URL'''
+    return f'navigated to {url}'
+
+@mcp.tool()
+def browser_snapshot() -> str:
+    '''Capture an accessibility snapshot of the current page'''
+    return '- document'
+
+@mcp.tool()
+def browser_click(element: str, ref: str) -> str:
+    '''Click an element'''
+    return 'clicked'
+
+mcp.run(transport='sse')
+"""
+
+
+def _free_port() -> int:
+    with socket.socket() as s:
+        s.bind(('127.0.0.1', 0))
+        return s.getsockname()[1]
+
+
+def start_stub_mcp():
+    port = _free_port()
+    proc = subprocess.Popen([sys.executable, '-c', _STUB_MCP, str(port)],
+                            stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+    deadline = time.monotonic() + 30
+    while time.monotonic() < deadline:
+        try:
+            socket.create_connection(('127.0.0.1', port), timeout=0.5).close()
+            return proc, f'http://127.0.0.1:{port}/sse'
+        except OSError:
+            time.sleep(0.1)
+    proc.kill()
+    raise RuntimeError('stub MCP server did not start')
+
+
+def seed_workspace(ws: Path, test_name: str) -> None:
+    (ws / 'Testcases').mkdir(parents=True)
+    (ws / 'tests').mkdir()
+    (ws / 'exploration_data.json').write_text('[{"role": "button", "label": "Sign in"}]', encoding='utf-8')
+    (ws / 'Testcases' / f'{test_name}_test_cases.json').write_text('[{"id": "sign-in"}]', encoding='utf-8')
+    (ws / 'tests' / f'{test_name}.spec.ts').write_text(
+        "import { test, expect } from '@playwright/test';\ntest('sign in', async ({ page }) => {\n});\n",
+        encoding='utf-8')
+
+
+def run_once(env) -> dict:
+    out = subprocess.run([sys.executable, '-c', _PROBE], cwd=str(REPO_ROOT), env=env,
+                         capture_output=True, text=True)
+    lines = [l for l in out.stdout.strip().splitlines() if l.startswith('{')]
+    if out.returncode != 0 or not lines:
+        tail = (out.stderr or out.stdout).strip().splitlines()[-1:] or ['no output']
+        return {'error': tail[0][:120]}
+    return json.loads(lines[-1])
+
+
+def main() -> int:
+    ap = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    ap.add_argument('--runs', type=int, default=3)
+    group = ap.add_mutually_exclusive_group()
+    group.add_argument('--stub-mcp', action='store_true', help='start a local placeholder MCP server')
+    group.add_argument('--mcp-url', help='Playwright MCP SSE endpoint to connect to')
+    args = ap.parse_args()
+
+    stub = None
+    mcp_url = args.mcp_url or os.environ.get('PLAYWRIGHT_MCP_URL', '')
+    if args.stub_mcp:
+        stub, mcp_url = start_stub_mcp()
+    try:
+        with tempfile.TemporaryDirectory() as tmp:
+            ws = Path(tmp) / 'ws'
+            seed_workspace(ws, 'bench')
+            base = dict(os.environ, RUN_WORKSPACE=str(ws), TEST_NAME='bench', PLAYWRIGHT_BROWSER_SERVER='0',
+                        OPENAI_API_KEY=os.environ.get('OPENAI_API_KEY', 'sk-bench'), CREWAI_DISABLE_TELEMETRY='true')
+            if mcp_url:
+                base['PLAYWRIGHT_MCP_URL'] = mcp_url
+            print(f"{'mode':<26} {'import ms':>10} {'build ms':>9} {'mcp ms':>7} {'mcp imported':>13}  agents")
+            for label, mode, extra in MODES:
+                env = dict(base, CREW_MODE=mode, **extra)
+                samples = [run_once(env) for _ in range(max(1, args.runs))]
+                ok = [s for s in samples if 'error' not in s]
+                if not ok:
+                    print(f'{label:<26} error: {samples[0]["error"]}')
+                    continue
+                med = lambda key: statistics.median(s[key] for s in ok) * 1000  # noqa: E731
+                print(f"{label:<26} {med('import_s'):>10.0f} {med('build_s'):>9.0f} {med('mcp_s'):>7.0f} "
+                      f"{str(ok[0]['mcp_imported']):>13}  {', '.join(ok[0]['agents'])}")
+    finally:
+        if stub is not None:
+            stub.terminate()
+            stub.wait()
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
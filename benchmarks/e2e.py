@@ -0,0 +1,532 @@
+"""
+Offline end-to-end benchmark of the crew and the API, per mode.
+
+Runs the pipeline against a static fixture app (benchmarks/fixtures/app)
+with a deterministic stub LLM (fixtures/stub_llm.py) and a stub Playwright
+MCP server (fixtures/stub_mcp.py), so no network or API key is needed:
+
+  crew/plan, crew/full   `test_agent.main` in a fresh interpreter, CREW_MODE=plan/full
+  api/plan               POST /api/tests/{name}/scenarios, then its SSE stream
+  api/full               POST /api/run, then its SSE stream
+  api/run-many           POST /api/tests/{name}/run-many with the stub's scenarios
+
+Each run reports wall-clock (request to the stream's finished event), the
+per-stage durations from the crew telemetry, LLM calls, peak RSS of the
+process tree (backend or crew plus every worker and tool it spawned) and how
+many subprocesses were started. The code under test is exported from a git
+ref into a scratch directory, so the tree's output/, tests/ and data/ stay
+untouched and any two commits can be measured with the same harness:
+
+    python benchmarks/e2e.py [--ref HEAD] [--runs 3] [--modes crew/plan api/full ...]
+                             [--llm-latency-ms 0] [--out FILE] [--compare BASELINE.json]
+
+`--ref .` measures the working tree instead. Results are written as JSON
+(output/benchmarks/e2e-<commit>.json by default); `--compare` prints the
+median deltas against an earlier result file. Without Docker a no-op
+`docker` is put on PATH for crewai's startup check (the stub never asks for
+code execution); without node_modules, npm runs offline and the executor's
+Playwright run fails fast, which the results record.
+"""
+import argparse
+import http.client
+import io
+import json
+import os
+import platform
+import shutil
+import socket
+import statistics
+import subprocess
+import sys
+import tarfile
+import tempfile
+import threading
+import time
+import urllib.error
+import urllib.request
+from functools import partial
+from http.server import SimpleHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from typing import Dict, List, Optional
+
+REPO_ROOT = Path(__file__).resolve().parents[1]
+FIXTURES = Path(__file__).resolve().parent / 'fixtures'
+sys.path.insert(0, str(FIXTURES))
+
+import stub_llm  # noqa: E402
+
+MODES = ('crew/plan', 'crew/full', 'api/plan', 'api/full', 'api/run-many')
+TEST_DESC = 'Sign in to Acme Notes with the demo account and check the validation messages'
+_PAGE = os.sysconf('SC_PAGE_SIZE') if hasattr(os, 'sysconf') else 4096
+
+
+def _free_port() -> int:
+    with socket.socket() as s:
+        s.bind(('127.0.0.1', 0))
+        return s.getsockname()[1]
+
+
+def _wait_port(port: int, timeout: float = 30.0) -> bool:
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        try:
+            socket.create_connection(('127.0.0.1', port), timeout=0.5).close()
+            return True
+        except OSError:
+            time.sleep(0.1)
+    return False
+
+
+# code under test ---------------------------------------------------------------
+
+def export_tree(ref: str, dest: Path) -> Dict:
+    """Copy the tree at `ref` (or the working tree for '.') into `dest`."""
+    git = partial(subprocess.run, cwd=str(REPO_ROOT), capture_output=True, check=True)
+    commit = git(['git', 'rev-parse', 'HEAD' if ref == '.' else ref]).stdout.decode().strip()
+    if ref == '.':
+        files = git(['git', 'ls-files', '-z', '--cached', '--others', '--exclude-standard']).stdout
+        for rel in filter(None, files.decode().split('\0')):
+            src = REPO_ROOT / rel
+            if src.is_file():
+                (dest / rel).parent.mkdir(parents=True, exist_ok=True)
+                shutil.copy2(src, dest / rel)
+        dirty = bool(git(['git', 'status', '--porcelain']).stdout.strip())
+    else:
+        with tarfile.open(fileobj=io.BytesIO(git(['git', 'archive', commit]).stdout)) as tar:
+            tar.extractall(dest)
+        dirty = False
+    node_modules = REPO_ROOT / 'node_modules'
+    if node_modules.is_dir():
+        (dest / 'node_modules').symlink_to(node_modules, target_is_directory=True)
+    return {'ref': ref, 'commit': commit, 'dirty': dirty}
+
+
+def _local_playwright(root: Path) -> bool:
+    return (root / 'node_modules' / '.bin' / ('playwright.cmd' if os.name == 'nt' else 'playwright')).exists()
+
+
+# offline services -----------------------------------------------------------------
+
+class _QuietHandler(SimpleHTTPRequestHandler):
+    def log_message(self, format, *args):  # noqa: A002
+        pass
+
+
+def serve_fixture_app() -> ThreadingHTTPServer:
+    server = ThreadingHTTPServer(('127.0.0.1', 0), partial(_QuietHandler, directory=str(FIXTURES / 'app')))
+    server.daemon_threads = True
+    threading.Thread(target=server.serve_forever, name='fixture-app', daemon=True).start()
+    return server
+
+
+def start_stub_mcp(log) -> tuple:
+    port = _free_port()
+    proc = subprocess.Popen([sys.executable, str(FIXTURES / 'stub_mcp.py'), str(port)], stdout=log, stderr=log)
+    if not _wait_port(port):
+        proc.kill()
+        raise RuntimeError('stub MCP server did not start')
+    return proc, f'http://127.0.0.1:{port}/sse'
+
+
+def bench_env(root: Path, llm_url: str, mcp_url: str, shim_dir: Path) -> Dict[str, str]:
+    env = dict(os.environ)
+    env.pop('TEST_INDEX_DB', None)  # keep the index inside the scratch tree
+    env.update({
+        'PYTHONPATH': os.pathsep.join(filter(None, [str(root / 'src'), os.environ.get('PYTHONPATH')])),
+        'PYTHONUNBUFFERED': '1',
+        'OPENAI_API_KEY': 'sk-offline-bench',
+        'OPENAI_BASE_URL': llm_url,
+        'OPENAI_API_BASE': llm_url,
+        'LLM_CACHE': 'off',
+        'CREWAI_DISABLE_TELEMETRY': 'true',
+        'CREWAI_TRACING_ENABLED': 'false',
+        'OTEL_SDK_DISABLED': 'true',
+        # skips crewai's first-run "view your traces?" prompt, which waits 20 s on stdin
+        'CREWAI_TESTING': 'true',
+        'PLAYWRIGHT_MCP_URL': mcp_url,
+        'PLAYWRIGHT_MCP_SERVER': '0',
+        # workers run in this interpreter; `uv run` would try to sync the project env
+        'CREW_WORKER_CMD': f'"{sys.executable}" -m test_agent.worker',
+        'npm_config_offline': 'true',
+    })
+    if not _local_playwright(root):
+        env['PLAYWRIGHT_BROWSER_SERVER'] = '0'
+    if shutil.which('docker') is None:
+        shim_dir.mkdir(parents=True, exist_ok=True)
+        docker = shim_dir / 'docker'
+        docker.write_text('#!/bin/sh\nexit 0\n', encoding='utf-8')
+        docker.chmod(0o755)
+        env['PATH'] = os.pathsep.join([str(shim_dir), env.get('PATH', '')])
+    return env
+
+
+# process tree sampling ---------------------------------------------------------------
+
+def _proc_table() -> Dict[int, tuple]:
+    """pid -> (ppid, rss bytes) for every process, read from /proc."""
+    table = {}
+    for name in os.listdir('/proc'):
+        if not name.isdigit():
+            continue
+        try:
+            with open(f'/proc/{name}/stat', 'rb') as f:
+                stat = f.read()
+            with open(f'/proc/{name}/statm', 'rb') as f:
+                rss = int(f.read().split()[1]) * _PAGE
+            ppid = int(stat[stat.rfind(b')') + 2:].split()[1])
+        except (OSError, ValueError, IndexError):
+            continue
+        table[int(name)] = (ppid, rss)
+    return table
+
+
+def _tree(table: Dict[int, tuple], root: int) -> List[int]:
+    children: Dict[int, List[int]] = {}
+    for pid, (ppid, _) in table.items():
+        children.setdefault(ppid, []).append(pid)
+    out, todo = [], [root]
+    while todo:
+        pid = todo.pop()
+        if pid in table:
+            out.append(pid)
+            todo.extend(children.get(pid, ()))
+    return out
+
+
+class TreeSampler:
+    """Peak RSS and subprocess counts of one process tree, sampled from /proc in a thread."""
+
+    available = os.path.isdir('/proc/self')
+
+    def __init__(self, root: int, interval: float = 0.05):
+        self.root = root
+        self.interval = interval
+        self.peak_rss = 0
+        self.peak_procs = 0
+        self.baseline: set = set()
+        self.seen: set = set()
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._loop, name='tree-sampler', daemon=True)
+
+    def _sample(self) -> List[int]:
+        table = _proc_table()
+        pids = _tree(table, self.root)
+        self.peak_rss = max(self.peak_rss, sum(table[p][1] for p in pids))
+        self.peak_procs = max(self.peak_procs, len(pids) - 1)
+        self.seen.update(pids)
+        return pids
+
+    def _loop(self) -> None:
+        while not self._stop.wait(self.interval):
+            self._sample()
+
+    def __enter__(self) -> 'TreeSampler':
+        if self.available:
+            self.baseline = set(self._sample())
+            self._thread.start()
+        return self
+
+    def __exit__(self, *exc) -> None:
+        if self.available:
+            self._stop.set()
+            self._thread.join()
+            self._sample()
+
+    def result(self) -> Dict:
+        if not self.available:
+            return {'peak_rss_mb': None, 'procs_spawned': None, 'procs_peak': None}
+        return {'peak_rss_mb': round(self.peak_rss / 2 ** 20, 1),
+                'procs_spawned': len(self.seen - self.baseline), 'procs_peak': self.peak_procs}
+
+
+# runs ---------------------------------------------------------------------------------
+
+def _stages(tasks: List[Dict]) -> Dict[str, float]:
+    """Seconds per task, summed over the crew jobs of one run (run-many has several)."""
+    out: Dict[str, float] = {}
+    for span in tasks:
+        out[span['task']] = round(out.get(span['task'], 0.0) + (span.get('duration_s') or 0.0), 3)
+    return out
+
+
+class Bench:
+    def __init__(self, root: Path, env: Dict[str, str], app_url: str, log):
+        self.root = root
+        self.env = env
+        self.app_url = app_url
+        self.log = log
+        self.backend: Optional[subprocess.Popen] = None
+        self.api = ''
+        self.backend_startup: Dict = {}
+
+    # crew ----------------------------------------------------------------------
+
+    def run_crew(self, mode: str, name: str) -> Dict:
+        ws = f'output/runs/bench-{name}'
+        env = dict(self.env, CREW_MODE=mode, APP_URL=self.app_url, TEST_NAME=name, TEST_DESC=TEST_DESC,
+                   RUN_WORKSPACE=ws)
+        calls = stub_llm.StubLLMHandler.calls
+        t0 = time.perf_counter()
+        proc = subprocess.Popen([sys.executable, '-c', 'from test_agent.main import run; run()'],
+                                cwd=str(self.root), env=env, stdout=self.log, stderr=subprocess.STDOUT,
+                                stdin=subprocess.DEVNULL)
+        with TreeSampler(proc.pid) as sampler:
+            rc = proc.wait()
+        wall = time.perf_counter() - t0
+        try:
+            telemetry = json.loads((self.root / ws / 'telemetry.json').read_text(encoding='utf-8'))
+        except (OSError, ValueError):
+            telemetry = {}
+        return {'ok': rc == 0, 'wall_s': round(wall, 3), 'stages': _stages(telemetry.get('tasks') or []),
+                'startup_s': ((telemetry.get('run') or {}).get('startup') or {}).get('startup_s'),
+                'llm_calls': stub_llm.StubLLMHandler.calls - calls, **sampler.result()}
+
+    # api -----------------------------------------------------------------------
+
+    def _request(self, method: str, path: str, payload: Optional[Dict] = None):
+        data = json.dumps(payload).encode('utf-8') if payload is not None else None
+        req = urllib.request.Request(self.api + path, data=data, method=method,
+                                     headers={'Content-Type': 'application/json'})
+        try:
+            with urllib.request.urlopen(req, timeout=60) as resp:
+                return resp.status, json.loads(resp.read() or b'null')
+        except urllib.error.HTTPError as e:
+            return e.code, json.loads(e.read() or b'null')
+
+    def _follow(self, run_id: str, timeout: float) -> List[Dict]:
+        """Every message of a run's SSE stream, until the server closes it after `finished`."""
+        conn = http.client.HTTPConnection('127.0.0.1', int(self.api.rsplit(':', 1)[1]), timeout=timeout)
+        messages: List[Dict] = []
+        try:
+            conn.request('GET', f'/api/stream/{run_id}', headers={'Accept': 'text/event-stream'})
+            resp = conn.getresponse()
+            for raw in resp:
+                line = raw.decode('utf-8', errors='replace').rstrip('\r\n')
+                if line.startswith('data:'):
+                    messages.extend(json.loads(line[5:].strip()))
+                    if any(m.get('status') == 'finished' for m in messages[-50:]):
+                        break
+        finally:
+            conn.close()
+        return messages
+
+    def start_backend(self, port: int) -> None:
+        self.api = f'http://127.0.0.1:{port}'
+        t0 = time.perf_counter()
+        self.backend = subprocess.Popen(
+            [sys.executable, '-m', 'uvicorn', 'backend.server:app', '--host', '127.0.0.1', '--port', str(port),
+             '--log-level', 'warning'],
+            cwd=str(self.root), env=self.env, stdout=self.log, stderr=subprocess.STDOUT, stdin=subprocess.DEVNULL)
+        deadline = time.monotonic() + 240
+        while time.monotonic() < deadline:
+            if self.backend.poll() is not None:
+                raise RuntimeError(f'backend exited with {self.backend.returncode}')
+            try:
+                status, pool = self._request('GET', '/api/diagnostics/crew-pool')
+                if status == 200 and (not pool.get('enabled') or pool.get('idle', 0) >= pool.get('size', 0)):
+                    break
+            except (OSError, ValueError):
+                pass
+            time.sleep(0.2)
+        else:
+            raise RuntimeError('backend did not become ready')
+        ready_s = time.perf_counter() - t0
+        with TreeSampler(self.backend.pid) as sampler:
+            pass
+        self.backend_startup = {'ready_s': round(ready_s, 3), 'pool': pool,
+                                'idle_rss_mb': sampler.result()['peak_rss_mb']}
+
+    def stop_backend(self) -> None:
+        if self.backend is None:
+            return
+        self.backend.terminate()
+        try:
+            self.backend.wait(timeout=30)
+        except subprocess.TimeoutExpired:
+            self.backend.kill()
+            self.backend.wait()
+
+    def run_api(self, mode: str, name: str, timeout: float) -> Dict:
+        payload = {'application_url': self.app_url, 'test_name': name, 'test_description': TEST_DESC,
+                   'force_refresh': True}
+        calls = stub_llm.StubLLMHandler.calls
+        t0 = time.perf_counter()
+        with TreeSampler(self.backend.pid) as sampler:
+            if mode == 'plan':
+                status, body = self._request('POST', f'/api/tests/{name}/scenarios', payload)
+            elif mode == 'full':
+                status, body = self._request('POST', '/api/run', payload)
+            else:
+                status, body = self._request('POST', f'/api/tests/{name}/run-many',
+                                             dict(payload, scenarios=stub_llm.SCENARIOS))
+            run_id = (body or {}).get('run_id')
+            if status >= 400 or not run_id:
+                return {'ok': False, 'error': f'HTTP {status}: {body}'}
+            messages = self._follow(run_id, timeout)
+        wall = time.perf_counter() - t0
+        final = next((m for m in reversed(messages) if m.get('status') == 'finished'), None)
+        result = {'ok': final is not None, 'wall_s': round(wall, 3), 'run_id': run_id}
+        if mode == 'plan':
+            result['ok'] = bool(final) and final.get('scenarios') == 'ready'
+        else:
+            status, test = self._request('GET', f'/api/tests/{name}')
+            result['test_status'] = ((test or {}).get('meta') or {}).get('last_status') if status == 200 else None
+        if mode == 'run-many':
+            done = {m['scenario']['index'] for m in messages
+                    if m.get('scenario', {}).get('status') == 'done'}
+            result['parts_done'] = len(done)
+        status, telemetry = self._request('GET', f'/api/runs/{run_id}/telemetry')
+        spans = (telemetry or {}).get('spans') or [] if status == 200 else []
+        result.update(stages=_stages(spans), llm_calls=stub_llm.StubLLMHandler.calls - calls, **sampler.result())
+        return result
+
+
+# reporting ------------------------------------------------------------------------------
+
+def _median(values: List) -> Optional[float]:
+    values = [v for v in values if v is not None]
+    return round(statistics.median(values), 3) if values else None
+
+
+def summarize(runs: List[Dict]) -> Dict:
+    ok = [r for r in runs if r.get('ok')]
+    stages = sorted({s for r in ok for s in r.get('stages', {})})
+    return {
+        'runs': len(runs),
+        'ok': len(ok),
+        'wall_s': _median([r['wall_s'] for r in ok]),
+        'wall_s_min': min((r['wall_s'] for r in ok), default=None),
+        'stages_s': {s: _median([r['stages'].get(s) for r in ok]) for s in stages},
+        'llm_calls': _median([r.get('llm_calls') for r in ok]),
+        'peak_rss_mb': max((r['peak_rss_mb'] for r in ok if r.get('peak_rss_mb') is not None), default=None),
+        'procs_spawned': _median([r.get('procs_spawned') for r in ok]),
+        'procs_peak': max((r['procs_peak'] for r in ok if r.get('procs_peak') is not None), default=None),
+        'errors': [r['error'] for r in runs if r.get('error')][:3],
+    }
+
+
+def _fmt(v, spec: str = '.2f') -> str:
+    return '-' if v is None else format(v, spec)
+
+
+def print_results(results: Dict) -> None:
+    print(f"{'mode':<14} {'ok':>5} {'wall s':>8} {'peak RSS MB':>12} {'procs':>6} {'peak':>5} {'llm':>5}  stages (median s)")
+    for mode, s in results.items():
+        stages = ', '.join(f'{k.replace("_task", "")}={_fmt(v)}' for k, v in s['stages_s'].items())
+        ok = f"{s['ok']}/{s['runs']}"
+        print(f"{mode:<14} {ok:>5} {_fmt(s['wall_s']):>8} {_fmt(s['peak_rss_mb'], '.0f'):>12} "
+              f"{_fmt(s['procs_spawned'], '.0f'):>6} {_fmt(s['procs_peak'], '.0f'):>5} "
+              f"{_fmt(s['llm_calls'], '.0f'):>5}  {stages}")
+        for err in s['errors']:
+            print(f'{"":<14} error: {err[:160]}')
+
+
+def print_comparison(current: Dict, baseline: Dict) -> None:
+    print(f"\nvs {baseline['tree']['commit'][:10]} ({baseline['tree']['ref']}):")
+    if baseline.get('config', {}).get('llm_latency_ms') != current['config']['llm_latency_ms']:
+        print('note: the two runs used different --llm-latency-ms')
+    print(f"{'mode':<14} {'metric':<36} {'baseline':>10} {'current':>10} {'delta':>8}")
+    for mode, cur in current['results'].items():
+        base = baseline.get('results', {}).get(mode)
+        if base is None:
+            continue
+        rows = [('wall_s', cur['wall_s'], base['wall_s']),
+                ('peak_rss_mb', cur['peak_rss_mb'], base['peak_rss_mb']),
+                ('procs_spawned', cur['procs_spawned'], base['procs_spawned'])]
+        rows += [(f'stage {k}', v, base['stages_s'].get(k)) for k, v in cur['stages_s'].items()]
+        for metric, now, then in rows:
+            delta = f'{(now - then) / then * 100:+.0f}%' if now is not None and then else '-'
+            print(f'{mode:<14} {metric:<36} {_fmt(then):>10} {_fmt(now):>10} {delta:>8}')
+
+
+def main() -> int:
+    ap = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    ap.add_argument('--ref', default='HEAD', help="git ref to benchmark, or '.' for the working tree")
+    ap.add_argument('--runs', type=int, default=3)
+    ap.add_argument('--modes', nargs='+', choices=MODES, default=list(MODES))
+    ap.add_argument('--llm-latency-ms', type=float, default=0.0, help='simulated provider latency per LLM call')
+    ap.add_argument('--timeout', type=float, default=600.0, help='seconds to wait for one run')
+    ap.add_argument('--out', help='result file (default output/benchmarks/e2e-<commit>.json)')
+    ap.add_argument('--compare', help='earlier result file to compare against')
+    ap.add_argument('--keep', action='store_true', help='keep the scratch tree and logs')
+    args = ap.parse_args()
+
+    scratch = Path(tempfile.mkdtemp(prefix='e2e-bench-'))
+    root = scratch / 'tree'
+    root.mkdir()
+    log_path = scratch / 'bench.log'
+    llm = app = mcp = bench = None
+    with open(log_path, 'wb') as log:
+        try:
+            tree = export_tree(args.ref, root)
+            llm = stub_llm.serve(0, args.llm_latency_ms)
+            app = serve_fixture_app()
+            mcp, mcp_url = start_stub_mcp(log)
+            env = bench_env(root, f'http://127.0.0.1:{llm.server_port}/v1', mcp_url, scratch / 'bin')
+            bench = Bench(root, env, f'http://127.0.0.1:{app.server_port}/login.html', log)
+            print(f"benchmarking {tree['commit'][:10]} ({args.ref}{', dirty' if tree['dirty'] else ''}) "
+                  f"in {root}", flush=True)
+
+            runs: Dict[str, List[Dict]] = {}
+            for mode in args.modes:
+                target, crew_mode = mode.split('/')
+                if target == 'api' and bench.backend is None:
+                    bench.start_backend(_free_port())
+                    print(f"backend ready in {bench.backend_startup['ready_s']:.1f}s, "
+                          f"idle RSS {_fmt(bench.backend_startup['idle_rss_mb'], '.0f')} MB", flush=True)
+                for i in range(max(1, args.runs)):
+                    name = f"bench_{crew_mode.replace('-', '_')}_{target}_{i}"
+                    try:
+                        if target == 'crew':
+                            r = bench.run_crew(crew_mode, name)
+                        else:
+                            r = bench.run_api(crew_mode, name, args.timeout)
+                    except (OSError, RuntimeError, ValueError) as e:
+                        r = {'ok': False, 'error': str(e)}
+                    runs.setdefault(mode, []).append(r)
+                    print(f"  {mode} #{i + 1}: {'ok' if r.get('ok') else 'FAILED'} {_fmt(r.get('wall_s'))}s",
+                          flush=True)
+        finally:
+            if bench is not None:
+                bench.stop_backend()
+            if mcp is not None:
+                mcp.terminate()
+                mcp.wait()
+            for server in (llm, app):
+                if server is not None:
+                    server.shutdown()
+
+    results = {mode: summarize(r) for mode, r in runs.items()}
+    report = {
+        'benchmark': 'e2e',
+        'created_at': time.time(),
+        'tree': tree,
+        'host': {'python': platform.python_version(), 'platform': platform.platform(), 'cpus': os.cpu_count()},
+        'config': {'runs': args.runs, 'llm_latency_ms': args.llm_latency_ms,
+                   'playwright': 'local' if _local_playwright(root) else 'unavailable',
+                   'docker_shim': shutil.which('docker') is None,
+                   'sampling': TreeSampler.available,
+                   **{k: os.environ[k] for k in ('CREW_POOL_SIZE', 'CREW_POOL_MAX_JOBS', 'RUN_MANY_BATCH_SIZE',
+                                                 'RUN_MANY_RETRIES') if k in os.environ}},
+        'backend': bench.backend_startup if bench else {},
+        'results': results,
+        'runs': runs,
+    }
+    print()
+    print_results(results)
+
+    out = Path(args.out) if args.out else REPO_ROOT / 'output' / 'benchmarks' / f"e2e-{tree['commit'][:10]}.json"
+    out.parent.mkdir(parents=True, exist_ok=True)
+    out.write_text(json.dumps(report, indent=2), encoding='utf-8')
+    print(f'\nresults: {out}')
+    if args.compare:
+        print_comparison(report, json.loads(Path(args.compare).read_text(encoding='utf-8')))
+    if args.keep:
+        print(f'scratch tree and logs: {scratch}')
+    else:
+        shutil.rmtree(scratch, ignore_errors=True)
+    return 0 if all(s['ok'] == s['runs'] for s in results.values()) else 1
+
+
+if __name__ == '__main__':
+    sys.exit(main())
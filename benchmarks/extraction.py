@@ -0,0 +1,187 @@
+"""
+Extraction micro-benchmark on multi-megabyte LLM outputs.
+
+Builds JSON and spec outputs of each size, wrapped the way agents wrap
+them (fences, a lead-in, a closing remark, a long narrated preamble), and
+times the single-pass extractors in test_agent.extraction against the
+line-based cleaner and greedy-regex fallback they replaced, kept here as
+baselines. Each result is checked against the embedded document, and small
+specs with regex literals, template strings, division, comments and
+unclosed fences are checked first; the run fails if the single-pass
+extractors get one wrong.
+
+    python benchmarks/extraction.py [--sizes 1 4 8] [--repeat 3]
+"""
+import argparse
+import json
+import re
+import sys
+import time
+from pathlib import Path
+
+REPO_ROOT = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(REPO_ROOT / 'src'))
+
+from test_agent.extraction import extract_json, strip_code_fences  # noqa: E402
+
+_IMPORT = "import { test, expect } from '@playwright/test';"
+
+
+def legacy_strip(text: str) -> str:
+    cleaned = text.strip()
+    if cleaned.startswith("```"):
+        cleaned = cleaned[3:].lstrip('\n')
+    if cleaned.endswith("```"):
+        cleaned = cleaned[:-3].rstrip('\n')
+    cleaned = cleaned.replace("```", "")
+    lines = cleaned.splitlines()
+    if any(_IMPORT in line for line in lines):
+        for idx, line in enumerate(lines):
+            if _IMPORT in line:
+                lines = lines[idx:]
+                break
+    elif any(line.lstrip().startswith(('[', '{')) for line in lines):
+        while lines and not lines[0].lstrip().startswith(("[", "{")):
+            lines.pop(0)
+    last = None
+    for idx in range(len(lines) - 1, -1, -1):
+        if lines[idx].strip().endswith(('}', ']', ')')):
+            last = idx
+            break
+    if last is not None:
+        lines = lines[:last + 1]
+    return "\n".join(lines)
+
+
+def legacy_read_scenarios(raw: str):
+    txt = raw.strip()
+    if txt.lower().startswith('json'):
+        txt = txt.split('\n', 1)[1] if '\n' in txt else '[]'
+    txt = txt.strip().strip('`')
+    try:
+        return json.loads(txt)
+    except Exception:
+        return json.loads(re.search(r'(\[.*\])', txt, flags=re.S).group(1))
+
+
+def json_doc(mb: float) -> str:
+    item = {"id": "case-0", "title": "Login with a valid account", "preconditions": "User exists",
+            "steps": ["Open /login", "Fill the email", "Fill the password", "Click 'Sign in'"],
+            "expected_results": "Dashboard {shown}", "priority": "High", "kind": "positive"}
+    unit = len(json.dumps(item, indent=2)) + 2
+    return json.dumps([dict(item, id=f"case-{i}") for i in range(int(mb * 2 ** 20 / unit))], indent=2)
+
+
+def spec_doc(mb: float) -> str:
+    case = ("test('case %d', async ({ page }) => {\n"
+            "  await page.goto(`${BASE_URL}/login?next=${encodeURIComponent('/home')}`);\n"
+            "  await page.getByLabel('Email').fill('user@example.com'); // don't guess selectors\n"
+            "  await expect(page.getByText(/welcome back/i)).toBeVisible();\n"
+            "  await expect(page).toHaveURL(/.*dashboard/);\n"
+            "});")
+    n = int(mb * 2 ** 20 / len(case))
+    return f"{_IMPORT}\n\n" + "\n\n".join(case % i for i in range(n))
+
+
+def cases(mb: float):
+    """(name, legacy, single-pass, output, check) per scenario."""
+    doc, spec = json_doc(mb), spec_doc(mb)
+    value = json.loads(doc)
+    fenced = f"Here is the plan [draft]:\n```json\n{doc}\n```\nEach case maps to one step (see above)."
+    # an agent that narrates its reasoning before answering
+    preamble = "\n".join(f"Thought {i}: checking the form" for i in range(int(mb * 2 ** 20 / 32)))
+    narrated = f"{preamble}\n{doc}"
+    spec_out = f"Sure! Here is the spec:\n```typescript\n{spec}\n```\nThis covers every scenario (all {len(value)})."
+    is_doc = lambda out: isinstance(out, str) and out.strip() == doc  # noqa: E731
+    return (
+        ('strip, fenced json', legacy_strip, strip_code_fences, fenced, is_doc),
+        ('strip, narrated json', legacy_strip, strip_code_fences, narrated, is_doc),
+        ('strip, fenced spec', legacy_strip, strip_code_fences, spec_out,
+         lambda out: isinstance(out, str) and out.strip() == spec),
+        ('read scenarios, fenced', legacy_read_scenarios, extract_json, fenced, lambda out: out == value),
+    )
+
+
+def _spec(*tests: str) -> str:
+    return "\n\n".join((_IMPORT,) + tests)
+
+
+_T = "test('t', async ({ page }) => {\n%s\n});"
+# (name, agent output, spec strip_code_fences must return)
+BEHAVIOUR = (
+    ('regex literals',
+     "```ts\n%s\n```\nDone (1 test)." % _spec(_T % "  await expect(page).toHaveURL(/\\/items\\/\\d+}?$/);\n"
+                                                 "  await expect(page.getByText(/it's (done|[)])/i)).toBeVisible();"),
+     _spec(_T % "  await expect(page).toHaveURL(/\\/items\\/\\d+}?$/);\n"
+                "  await expect(page.getByText(/it's (done|[)])/i)).toBeVisible();")),
+    ('template strings',
+     "```ts\n%s\n```" % _spec(_T % "  await page.goto(`${BASE_URL}/q?s=${encodeURIComponent('a}b')}`);\n"
+                                   "  await expect(page.getByText(`{ ${`x${n}`} )`)).toBeVisible();"),
+     _spec(_T % "  await page.goto(`${BASE_URL}/q?s=${encodeURIComponent('a}b')}`);\n"
+                "  await expect(page.getByText(`{ ${`x${n}`} )`)).toBeVisible();")),
+    ('division',
+     "```ts\n%s\n```\nSee above (the ratio check)." % _spec(_T % "  const half = (total / 2) / (count);\n"
+                                                               "  expect(done / total).toBeGreaterThan(half);"),
+     _spec(_T % "  const half = (total / 2) / (count);\n  expect(done / total).toBeGreaterThan(half);")),
+    ('comments',
+     "```ts\n%s\n```" % _spec(_T % "  // TODO: handle } in names\n  /* ) */ await page.goto('/');"),
+     _spec(_T % "  // TODO: handle } in names\n  /* ) */ await page.goto('/');")),
+    ('unclosed fence',
+     "```typescript\n%s\n\nThat's all. Let me know if anything fails." % _spec(_T % "  await page.goto('/');"),
+     _spec(_T % "  await page.goto('/');")),
+    ('truncated output',
+     "```ts\n%s\n\n%s" % (_spec(_T % "  await page.goto('/');"), "test('cut', async ({ page }) => {\n  await page.go"),
+     _spec(_T % "  await page.goto('/');")),
+)
+
+
+def check_behaviour() -> bool:
+    ok = True
+    for name, text, want in BEHAVIOUR:
+        got = strip_code_fences(text)
+        if got != want:
+            ok = False
+            print(f"behaviour check failed: {name}\n--- got\n{got}\n--- want\n{want}")
+    return ok
+
+
+def timed(fn, arg, repeat: int):
+    best, out = None, None
+    for _ in range(repeat):
+        t0 = time.perf_counter()
+        try:
+            out = fn(arg)
+        except (ValueError, AttributeError) as e:
+            out = e
+        dt = time.perf_counter() - t0
+        best = dt if best is None else min(best, dt)
+    return best, out
+
+
+def _verdict(out, check) -> str:
+    if isinstance(out, Exception):
+        return 'error'
+    return 'ok' if check(out) else 'wrong'
+
+
+def main() -> int:
+    ap = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    ap.add_argument('--sizes', type=float, nargs='+', default=[1, 4, 8], help='output sizes in MiB')
+    ap.add_argument('--repeat', type=int, default=3)
+    args = ap.parse_args()
+
+    failed = not check_behaviour()
+    print(f"{'case':<24} {'MiB':>5} {'legacy ms':>10} {'':<6} {'single-pass ms':>15} {'':<6}")
+    for mb in args.sizes:
+        for name, old, new, text, check in cases(mb):
+            t_old, out_old = timed(old, text, args.repeat)
+            t_new, out_new = timed(new, text, args.repeat)
+            v_new = _verdict(out_new, check)
+            failed |= v_new != 'ok'
+            print(f"{name:<24} {len(text) / 2 ** 20:>5.1f} {t_old * 1000:>10.1f} {_verdict(out_old, check):<6} "
+                  f"{t_new * 1000:>15.1f} {v_new:<6}")
+    return 1 if failed else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,136 @@
+"""
+Stand-ins for `crewai run` and the Playwright CLI in backend load tests.
+
+    fake_proc.py crew [options]                       like `crewai run`: reads APP_URL, TEST_NAME
+                                                      and RUN_WORKSPACE, writes the spec, test
+                                                      cases, final report and telemetry.json
+    fake_proc.py playwright [options] test SPEC ...   like `playwright test`: list-reporter lines
+                                                      and the JSON report named through
+                                                      PLAYWRIGHT_JSON_OUTPUT_NAME
+
+Both print `--lines` lines of about `--line-bytes` each, spread over
+`--duration` seconds in bursts (crewai panels, tool calls, reporter rows),
+and exit with `--exit-code` for a `--fail-rate` share of runs.
+"""
+import argparse
+import json
+import os
+import random
+import sys
+import time
+
+_CREW_LINES = (
+    "╭──────────────────────────── 🤖 Agent Started ────────────────────────────╮",
+    "│  Agent: Application Explorer and Locators Extractor                       │",
+    "│  Task: Use Playwright MCP to deeply explore the application {n}           │",
+    "╰───────────────────────────────────────────────────────────────────────────╯",
+    "🔧 Used browser_snapshot ({n})",
+    "[mcp] transport=sse ready in 0.01s",
+    "Thought: I should inspect the form on step {n} before writing selectors",
+    "- textbox \"Email\" [ref=e{n}] getByLabel('Email') validations: required",
+)
+_PW_PASS = "  ✓  {n} [chromium] › {spec}:{line}:5 › case {n} ({ms}ms)"
+_PW_FAIL = "  ✘  {n} [chromium] › {spec}:{line}:5 › case {n} ({ms}ms)"
+
+
+def _pad(line: str, size: int, n: int) -> str:
+    if len(line) >= size:
+        return line
+    filler = f" lorem-{n}-ipsum dolor sit amet" * (size // 30 + 1)
+    return (line + filler)[:size]
+
+
+def _emit(lines, duration: float, bursts: int = 20) -> None:
+    bursts = max(1, min(bursts, len(lines) or 1))
+    per = max(1, len(lines) // bursts)
+    pause = duration / bursts
+    for i in range(0, len(lines), per):
+        sys.stdout.write("\n".join(lines[i:i + per]) + "\n")
+        sys.stdout.flush()
+        time.sleep(pause)
+
+
+def _spans(mode: str) -> list:
+    now = time.time()
+    tasks = ("exploration_task", "test_case_writing_task", "script_generation_task",
+             "test_execution_and_fix_task")
+    return [{"task": t, "agent": "fake", "model": "openai/gpt-4o", "status": "completed",
+             "started_at": now, "duration_s": 0.1, "attempts": 1, "llm_calls": 2, "llm_failures": 0,
+             "llm_s": 0.05, "prompt_tokens": 1200, "completion_tokens": 300, "cached_prompt_tokens": 0,
+             "total_tokens": 1500, "cost_usd": 0.006, "tool_calls": {"mcp": 1, "playwright": 0, "other": 0},
+             "tool_s": 0.01, "tool_errors": 0, "tool_retries": 0}
+            for t in (tasks[:2] if mode == "plan" else tasks)]
+
+
+def crew(args, failed: bool) -> None:
+    test_name = os.environ.get("TEST_NAME", "fake")
+    ws = os.environ.get("RUN_WORKSPACE", "output")
+    mode = os.environ.get("CREW_MODE") or ("plan" if os.environ.get("FAST_PLAN_ONLY") == "1" else "full")
+    lines = [_pad(_CREW_LINES[i % len(_CREW_LINES)].format(n=i), args.line_bytes, i) for i in range(args.lines)]
+    _emit(lines, args.duration)
+    for sub in ("tests", "Testcases"):
+        os.makedirs(os.path.join(ws, sub), exist_ok=True)
+    with open(os.path.join(ws, "exploration_data.json"), "w", encoding="utf-8") as f:
+        json.dump([{"role": "button", "label": "Sign in", "selector": "getByRole('button')"}], f)
+    with open(os.path.join(ws, "Testcases", f"{test_name}_test_cases.json"), "w", encoding="utf-8") as f:
+        json.dump([{"id": "sign-in", "title": "Sign in"}], f)
+    if mode != "plan":
+        with open(os.path.join(ws, "tests", f"{test_name}.spec.ts"), "w", encoding="utf-8") as f:
+            f.write("import { test, expect } from '@playwright/test';\n\n"
+                    f"test('sign in', async ({{ page }}) => {{\n  await page.goto('{os.environ.get('APP_URL', '')}');\n}});\n")
+        with open(os.path.join(ws, "final_report.md"), "w", encoding="utf-8") as f:
+            f.write(f"# Test Automation Report\n\nScript pass/fail result: {'FAIL' if failed else 'PASS'}\n")
+    with open(os.path.join(ws, "telemetry.json"), "w", encoding="utf-8") as f:
+        json.dump({"run": {"test_name": test_name, "mode": mode, "status": "failed" if failed else "completed"},
+                   "tasks": _spans(mode)}, f)
+
+
+def playwright(args, failed: bool, spec: str) -> None:
+    lines = [f"Running {args.tests} tests using 1 worker", ""]
+    tests = []
+    for n in range(1, args.tests + 1):
+        bad = failed and n == args.tests
+        ms = 200 + 37 * n
+        lines.append(_pad((_PW_FAIL if bad else _PW_PASS).format(n=n, spec=spec, line=3 + 5 * n, ms=ms),
+                          args.line_bytes, n))
+        result = {"status": "failed" if bad else "passed", "duration": ms, "retry": 0}
+        if bad:
+            result["error"] = {"message": "Error: expect(locator).toBeVisible() failed",
+                               "location": {"file": spec, "line": 3 + 5 * n, "column": 5}}
+        tests.append({"title": f"case {n}", "file": spec, "line": 3 + 5 * n, "column": 5,
+                      "tests": [{"projectName": "chromium", "status": "unexpected" if bad else "expected",
+                                 "results": [result]}]})
+    lines += [_pad(f"    at {spec}:{i}:5 trace line {i}", args.line_bytes, i)
+              for i in range(max(0, args.lines - len(lines)))]
+    _emit(lines, args.duration)
+    report = os.environ.get("PLAYWRIGHT_JSON_OUTPUT_NAME") or os.environ.get("PLAYWRIGHT_JSON_OUTPUT_FILE")
+    if report:
+        os.makedirs(os.path.dirname(report) or ".", exist_ok=True)
+        stats = {"expected": args.tests - (1 if failed else 0), "unexpected": 1 if failed else 0,
+                 "flaky": 0, "skipped": 0}
+        with open(report, "w", encoding="utf-8") as f:
+            json.dump({"suites": [{"title": spec, "file": spec, "specs": tests}], "stats": stats, "errors": []}, f)
+
+
+def main() -> int:
+    ap = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    ap.add_argument("kind", choices=("crew", "playwright"))
+    ap.add_argument("--lines", type=int, default=400)
+    ap.add_argument("--line-bytes", type=int, default=120)
+    ap.add_argument("--duration", type=float, default=2.0, help="seconds the output is spread over")
+    ap.add_argument("--fail-rate", type=float, default=0.0)
+    ap.add_argument("--exit-code", type=int, default=1, help="exit code of a failed run")
+    ap.add_argument("--tests", type=int, default=5, help="tests in a fake Playwright report")
+    args, rest = ap.parse_known_args()
+    failed = random.Random(f"{os.getpid()}-{time.time_ns()}").random() < args.fail_rate
+    if args.kind == "crew":
+        crew(args, failed)
+    else:
+        spec = next((a for a in rest[1:] if not a.startswith("-")), "tests/fake.spec.ts") if rest[:1] == ["test"] \
+            else "tests/fake.spec.ts"
+        playwright(args, failed, spec)
+    return args.exit_code if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
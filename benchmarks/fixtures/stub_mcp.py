@@ -0,0 +1,132 @@
+"""
+Offline stand-in for the Playwright MCP server.
+
+Serves the browser tools the explorer uses (navigate, snapshot, click, type)
+over SSE. Pages are fetched with urllib and turned into an accessibility-style
+snapshot by html.parser, so exploring the fixture app costs real HTTP and
+MCP round-trips but no browser.
+
+    python benchmarks/fixtures/stub_mcp.py PORT
+"""
+import sys
+import urllib.request
+from html.parser import HTMLParser
+from typing import Dict, List, Optional
+from urllib.parse import urljoin
+
+from mcp.server.fastmcp import FastMCP
+
+_ROLES = {'a': 'link', 'button': 'button', 'h1': 'heading', 'h2': 'heading', 'ul': 'list', 'li': 'listitem'}
+_INPUT_ROLES = {'checkbox': 'checkbox', 'radio': 'radio', 'submit': 'button', 'button': 'button'}
+
+
+class _Snapshot(HTMLParser):
+    def __init__(self):
+        super().__init__()
+        self.nodes: List[Dict] = []
+        self.labels: Dict[str, str] = {}
+        self._open: List[Dict] = []
+        self._label_for: Optional[str] = None
+
+    def handle_starttag(self, tag, attrs):
+        attrs = dict(attrs)
+        if tag == 'label':
+            self._label_for = attrs.get('for') or ''
+            self.labels[self._label_for] = ''
+            return
+        if tag == 'input':
+            role = _INPUT_ROLES.get(attrs.get('type') or 'text', 'textbox')
+            self.nodes.append({'role': role, 'name': attrs.get('aria-label') or '', 'id': attrs.get('id'),
+                               'required': 'required' in attrs})
+            return
+        role = attrs.get('role') or _ROLES.get(tag)
+        if role:
+            node = {'role': role, 'name': attrs.get('aria-label') or '', 'href': attrs.get('href'), 'tag': tag}
+            self.nodes.append(node)
+            self._open.append(node)
+
+    def handle_endtag(self, tag):
+        if tag == 'label':
+            self._label_for = None
+        elif self._open and self._open[-1]['tag'] == tag:
+            self._open.pop()
+
+    def handle_data(self, data):
+        text = ' '.join(data.split())
+        if not text:
+            return
+        if self._label_for is not None:
+            self.labels[self._label_for] += text
+        elif self._open and not self._open[-1]['name']:
+            self._open[-1]['name'] = text
+
+    def render(self) -> List[Dict]:
+        for i, node in enumerate(self.nodes, start=1):
+            node['ref'] = f'e{i}'
+            if node['role'] in ('textbox', 'checkbox', 'radio') and not node['name']:
+                node['name'] = self.labels.get(node.get('id') or '', '')
+        return self.nodes
+
+
+class _Page:
+    url = ''
+    title = ''
+    nodes: List[Dict] = []
+
+    @classmethod
+    def load(cls, url: str) -> None:
+        with urllib.request.urlopen(url, timeout=10) as resp:
+            html = resp.read().decode('utf-8', errors='replace')
+        parser = _Snapshot()
+        parser.feed(html)
+        start = html.find('<title>')
+        cls.url = url
+        cls.title = html[start + 7:html.find('</title>', start)] if start >= 0 else ''
+        cls.nodes = parser.render()
+
+    @classmethod
+    def snapshot(cls) -> str:
+        lines = [f'- Page URL: {cls.url}', f'- Page Title: {cls.title}', '- Page Snapshot:']
+        for n in cls.nodes:
+            extra = ' [required]' if n.get('required') else ''
+            lines.append(f'  - {n["role"]} "{n["name"]}"{extra} [ref={n["ref"]}]')
+        return '\n'.join(lines)
+
+
+mcp = FastMCP('playwright-stub', host='127.0.0.1', port=int(sys.argv[1]) if len(sys.argv) > 1 else 8931)
+
+
+@mcp.tool()
+def browser_navigate(url: str) -> str:
+    '''Navigate to a URL'''
+    _Page.load(url)
+    return _Page.snapshot()
+
+
+@mcp.tool()
+def browser_snapshot() -> str:
+    '''Capture an accessibility snapshot of the current page'''
+    return _Page.snapshot()
+
+
+@mcp.tool()
+def browser_click(element: str, ref: str) -> str:
+    '''Click an element on the page'''
+    node = next((n for n in _Page.nodes if n['ref'] == ref), None)
+    if node is None:
+        return f'Error: no element with ref {ref}'
+    if node.get('href'):
+        _Page.load(urljoin(_Page.url, node['href']))
+    return _Page.snapshot()
+
+
+@mcp.tool()
+def browser_type(element: str, ref: str, text: str) -> str:
+    '''Type text into an editable element'''
+    if not any(n['ref'] == ref for n in _Page.nodes):
+        return f'Error: no element with ref {ref}'
+    return f'Typed into {element}'
+
+
+if __name__ == '__main__':
+    mcp.run(transport='sse')
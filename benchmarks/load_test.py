@@ -0,0 +1,469 @@
+"""
+Backend load test with fake crew and Playwright processes.
+
+Hosts the real FastAPI app (exported from a git ref, as in e2e.py) under
+uvicorn in this process, with `_crewai_cmd()` and `_find_playwright_cmd()`
+replaced by fixtures/fake_proc.py, which prints a configurable volume of
+crewai- or reporter-like output, writes the artifacts the backend ingests
+(spec, report, telemetry.json, the Playwright JSON report) and exits with a
+configurable code. The crew worker pool is off so every run spawns one.
+
+A separate client process (so its work does not show up as server lag)
+starts `--runs` POST /api/run and `--run-tests` POST /api/run-test
+(stream: true) over `--ramp-s` seconds, follows every run with
+`--subscribers` SSE clients, and keeps `--pollers` clients polling
+GET /api/tests with ETags. Reported:
+
+  client   request latency percentiles per endpoint, SSE time to first event
+           and to the finished event, status codes (429 = scheduler backlog full)
+  server   event-loop lag, RUNS size and buffered events over time, RSS growth,
+           index lock waits and write transaction times (they run on the loop)
+
+    python benchmarks/load_test.py [--ref HEAD] [--runs 200] [--run-tests 100] [--subscribers 2]
+                                   [--pollers 20] [--crew-lines 400] [--crew-duration 3] [--fail-rate 0.05]
+"""
+import argparse
+import asyncio
+import json
+import os
+import shutil
+import socket
+import sqlite3
+import sys
+import tempfile
+import threading
+import time
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+
+REPO_ROOT = Path(__file__).resolve().parents[1]
+FAKE_PROC = Path(__file__).resolve().parent / 'fixtures' / 'fake_proc.py'
+sys.path.insert(0, str(Path(__file__).resolve().parent))
+
+from e2e import export_tree  # noqa: E402
+
+_PAGE = os.sysconf('SC_PAGE_SIZE') if hasattr(os, 'sysconf') else 4096
+
+
+def _free_port() -> int:
+    with socket.socket() as s:
+        s.bind(('127.0.0.1', 0))
+        return s.getsockname()[1]
+
+
+def percentiles(values: List[float]) -> Dict:
+    if not values:
+        return {'n': 0}
+    v = sorted(values)
+    at = lambda q: v[min(len(v) - 1, int(q * len(v)))]  # noqa: E731
+    return {'n': len(v), 'p50_ms': round(at(0.5) * 1000, 1), 'p90_ms': round(at(0.9) * 1000, 1),
+            'p99_ms': round(at(0.99) * 1000, 1), 'max_ms': round(v[-1] * 1000, 1)}
+
+
+# client -------------------------------------------------------------------------------
+
+async def _read_head(reader: asyncio.StreamReader) -> Tuple[int, Dict[str, str]]:
+    status = int((await reader.readline()).split()[1])
+    headers = {}
+    while True:
+        line = (await reader.readline()).decode('latin-1').strip()
+        if not line:
+            return status, headers
+        k, _, v = line.partition(':')
+        headers[k.strip().lower()] = v.strip()
+
+
+async def _chunks(reader: asyncio.StreamReader, headers: Dict[str, str]):
+    if headers.get('transfer-encoding') == 'chunked':
+        while True:
+            size = int((await reader.readline()).split(b';')[0], 16)
+            if size == 0:
+                return
+            data = await reader.readexactly(size)
+            await reader.readline()
+            yield data
+    elif 'content-length' in headers:
+        yield await reader.readexactly(int(headers['content-length']))
+    else:
+        yield await reader.read()
+
+
+async def _open(port: int, method: str, path: str, body: Optional[Dict] = None,
+                headers: Optional[Dict[str, str]] = None):
+    reader, writer = await asyncio.open_connection('127.0.0.1', port)
+    data = json.dumps(body).encode() if body is not None else b''
+    head = [f'{method} {path} HTTP/1.1', f'Host: 127.0.0.1:{port}', 'Connection: close',
+            f'Content-Length: {len(data)}', 'Content-Type: application/json']
+    head += [f'{k}: {v}' for k, v in (headers or {}).items()]
+    writer.write(('\r\n'.join(head) + '\r\n\r\n').encode() + data)
+    await writer.drain()
+    status, resp_headers = await _read_head(reader)
+    return reader, writer, status, resp_headers
+
+
+class Client:
+    def __init__(self, cfg: Dict):
+        self.cfg = cfg
+        self.port = cfg['port']
+        self.latency: Dict[str, List[float]] = {}
+        self.statuses: Dict[str, Dict[str, int]] = {}
+        self.sse = {'ttfe': [], 'finish': [], 'events': 0, 'bytes': 0, 'incomplete': 0, 'errors': 0}
+        self.done = asyncio.Event()
+
+    def _record(self, op: str, status: int, seconds: float) -> None:
+        self.latency.setdefault(op, []).append(seconds)
+        counts = self.statuses.setdefault(op, {})
+        counts[str(status)] = counts.get(str(status), 0) + 1
+
+    async def request(self, op: str, method: str, path: str, body: Optional[Dict] = None,
+                      headers: Optional[Dict[str, str]] = None) -> Tuple[int, Dict[str, str], bytes]:
+        t0 = time.perf_counter()
+        try:
+            reader, writer, status, resp_headers = await _open(self.port, method, path, body, headers)
+            payload = b''.join([c async for c in _chunks(reader, resp_headers)])
+            writer.close()
+        except (OSError, ValueError, IndexError, asyncio.IncompleteReadError):
+            status, resp_headers, payload = 0, {}, b''
+        self._record(op, status, time.perf_counter() - t0)
+        return status, resp_headers, payload
+
+    async def follow(self, run_id: str, started: float) -> None:
+        """One SSE subscriber: time to the first event and to `finished` (from the run's POST)."""
+        t0 = time.perf_counter()
+        first = finished = False
+        buf = b''
+        try:
+            reader, writer, status, headers = await _open(self.port, 'GET', f'/api/stream/{run_id}',
+                                                          headers={'Accept': 'text/event-stream'})
+            if status != 200:
+                self.sse['errors'] += 1
+                writer.close()
+                return
+            async for chunk in _chunks(reader, headers):
+                self.sse['bytes'] += len(chunk)
+                buf += chunk
+                *lines, buf = buf.split(b'\n')
+                for line in lines:
+                    if not line.startswith(b'data:'):
+                        continue
+                    self.sse['events'] += 1
+                    if not first:
+                        first = True
+                        self.sse['ttfe'].append(time.perf_counter() - t0)
+                    if b'"status": "finished"' in line:
+                        finished = True
+                        self.sse['finish'].append(time.perf_counter() - started)
+                if finished:
+                    break
+            writer.close()
+        except (OSError, ValueError, asyncio.IncompleteReadError):
+            self.sse['errors'] += 1
+        if not finished:
+            self.sse['incomplete'] += 1
+
+    async def _start(self, op: str, path: str, body: Dict, delay: float, subscribers: int) -> None:
+        await asyncio.sleep(delay)
+        started = time.perf_counter()
+        status, _, payload = await self.request(op, 'POST', path, body)
+        if status not in (200, 202):
+            return
+        run_id = json.loads(payload).get('run_id')
+        await asyncio.gather(*(self.follow(run_id, started) for _ in range(subscribers)))
+
+    async def poll(self) -> None:
+        etag = None
+        while not self.done.is_set():
+            status, headers, _ = await self.request(
+                'GET /api/tests', 'GET', '/api/tests?limit=50&sort=last_run_at&order=desc',
+                headers={'If-None-Match': etag} if etag else None)
+            etag = headers.get('etag', etag)
+            try:
+                await asyncio.wait_for(self.done.wait(), self.cfg['poll_interval'])
+            except asyncio.TimeoutError:
+                pass
+
+    async def run(self) -> Dict:
+        c = self.cfg
+        n, m = c['runs'], c['run_tests']
+        ramp = max(0.0, c['ramp_s'])
+        jobs = [self._start('POST /api/run', '/api/run',
+                            {'application_url': 'http://127.0.0.1:9/app', 'test_name': f'load_{i}',
+                             'test_description': 'load test'}, ramp * i / max(1, n), c['subscribers'])
+                for i in range(n)]
+        jobs += [self._start('POST /api/run-test', '/api/run-test',
+                             {'spec': f'load_{j % max(1, n)}', 'stream': True}, ramp * j / max(1, m), 1)
+                 for j in range(m)]
+        pollers = [asyncio.create_task(self.poll()) for _ in range(c['pollers'])]
+        t0 = time.perf_counter()
+        await asyncio.wait_for(asyncio.gather(*jobs), c['timeout'])
+        wall = time.perf_counter() - t0
+        self.done.set()
+        await asyncio.gather(*pollers)
+        return {
+            'wall_s': round(wall, 2),
+            'requests': {op: dict(percentiles(v), status=self.statuses[op]) for op, v in self.latency.items()},
+            'sse': {'subscribers': len(self.sse['ttfe']) + self.sse['errors'],
+                    'first_event': percentiles(self.sse['ttfe']), 'finished': percentiles(self.sse['finish']),
+                    'events': self.sse['events'], 'mb': round(self.sse['bytes'] / 2 ** 20, 1),
+                    'incomplete': self.sse['incomplete'], 'errors': self.sse['errors']},
+        }
+
+
+def client_main(cfg: Dict) -> int:
+    print(json.dumps(asyncio.run(Client(cfg).run())), flush=True)
+    return 0
+
+
+# server-side probes ---------------------------------------------------------------------
+
+class IndexProbe:
+    """
+    Wraps TestIndexStore's lock and connection: time spent waiting for the
+    lock, and how long each hold lasted, split into write transactions
+    (BEGIN IMMEDIATE) and reads. SQLite busy errors are counted.
+    """
+
+    def __init__(self, store):
+        self.store = store
+        self.lock = store._lock
+        self.conn = store._conn
+        self.waits: List[float] = []
+        self.write_holds: List[float] = []
+        self.read_holds: List[float] = []
+        self.busy = 0
+        self._tls = threading.local()
+        store._lock = self
+        store._conn = self
+
+    # lock protocol
+    def __enter__(self):
+        t0 = time.perf_counter()
+        self.lock.acquire()
+        st = self._tls
+        if getattr(st, 'depth', 0) == 0:
+            st.acquired = time.perf_counter()
+            st.wait = st.acquired - t0
+            st.write = False
+        st.depth = getattr(st, 'depth', 0) + 1
+        return self
+
+    def __exit__(self, *exc):
+        st = self._tls
+        st.depth -= 1
+        if st.depth == 0:
+            self.waits.append(st.wait)
+            (self.write_holds if st.write else self.read_holds).append(time.perf_counter() - st.acquired)
+        self.lock.release()
+
+    # connection protocol
+    def execute(self, sql: str, *args):
+        if sql.startswith('BEGIN'):
+            self._tls.write = True
+        try:
+            return self.conn.execute(sql, *args)
+        except sqlite3.OperationalError as e:
+            if 'locked' in str(e) or 'busy' in str(e):
+                self.busy += 1
+            raise
+
+    def __getattr__(self, name):
+        return getattr(self.conn, name)
+
+    def report(self) -> Dict:
+        return {'lock_wait': percentiles(self.waits), 'write_tx': percentiles(self.write_holds),
+                'write_tx_total_s': round(sum(self.write_holds), 3), 'read': percentiles(self.read_holds),
+                'busy_errors': self.busy}
+
+
+def _rss() -> Optional[int]:
+    try:
+        with open('/proc/self/statm', 'rb') as f:
+            return int(f.read().split()[1]) * _PAGE
+    except OSError:
+        return None
+
+
+async def _monitor(server, stop: asyncio.Event, lag: List[float], timeline: List[Dict],
+                   interval: float = 0.05, every: int = 10) -> None:
+    """Event-loop lag every `interval`; RUNS and RSS every `every` ticks."""
+    tick = 0
+    t_start = time.perf_counter()
+    while not stop.is_set():
+        t0 = time.perf_counter()
+        await asyncio.sleep(interval)
+        lag.append(max(0.0, time.perf_counter() - t0 - interval))
+        tick += 1
+        if tick % every == 0:
+            runs = list(server.RUNS.values())
+            timeline.append({'t': round(time.perf_counter() - t_start, 2), 'runs': len(runs),
+                             'events': sum(len(r['q'].events) for r in runs),
+                             'rss_mb': round((_rss() or 0) / 2 ** 20, 1),
+                             'lag_max_ms': round(max(lag[-every:]) * 1000, 1)})
+
+
+def _runs_snapshot(server) -> Dict:
+    runs = list(server.RUNS.values())
+    line_bytes = sum(len(m.get('line', '')) for r in runs for _, m in r['q'].events)
+    return {'runs': len(runs), 'finished': sum(1 for r in runs if r['q'].finished),
+            'events': sum(len(r['q'].events) for r in runs), 'line_mb': round(line_bytes / 2 ** 20, 1)}
+
+
+async def serve_and_load(server, args, port: int) -> Dict:
+    import uvicorn
+
+    srv = uvicorn.Server(uvicorn.Config(server.app, host='127.0.0.1', port=port, log_level='warning',
+                                        access_log=False))
+    serving = asyncio.create_task(srv.serve())
+    while not srv.started:
+        if serving.done():
+            serving.result()
+        await asyncio.sleep(0.05)
+
+    stop = asyncio.Event()
+    lag: List[float] = []
+    timeline: List[Dict] = []
+    rss_start = _rss()
+    monitor = asyncio.create_task(_monitor(server, stop, lag, timeline))
+    cfg = {'port': port, 'runs': args.runs, 'run_tests': args.run_tests, 'subscribers': args.subscribers,
+           'pollers': args.pollers, 'poll_interval': args.poll_interval, 'ramp_s': args.ramp_s,
+           'timeout': args.timeout}
+    proc = await asyncio.create_subprocess_exec(sys.executable, __file__, '--client', json.dumps(cfg),
+                                                stdout=asyncio.subprocess.PIPE)
+    out, _ = await proc.communicate()
+    stop.set()
+    await monitor
+    after = _runs_snapshot(server)
+    srv.should_exit = True
+    await serving
+    lines = [line for line in out.decode().splitlines() if line.startswith('{')]
+    client = json.loads(lines[-1]) if lines else {'error': f'client exited with {proc.returncode}'}
+    rss_end = _rss()
+    peak = max(timeline, key=lambda s: s['events'], default={})
+    return {
+        'client': client,
+        'server': {
+            'loop_lag': percentiles(lag),
+            'rss_mb': {'start': round((rss_start or 0) / 2 ** 20, 1), 'end': round((rss_end or 0) / 2 ** 20, 1),
+                       'peak': max((s['rss_mb'] for s in timeline), default=None)},
+            'runs_peak': peak,
+            'runs_after': after,
+            'rss_per_run_kb': round(((rss_end or 0) - (rss_start or 0)) / 1024 / max(1, args.runs + args.run_tests),
+                                    1),
+            'timeline': timeline,
+        },
+    }
+
+
+def _fake(kind: str, args) -> List[str]:
+    lines, duration = (args.crew_lines, args.crew_duration) if kind == 'crew' else (args.pw_lines, args.pw_duration)
+    return [sys.executable, str(FAKE_PROC), kind, '--lines', str(lines), '--duration', str(duration),
+            '--line-bytes', str(args.line_bytes), '--fail-rate', str(args.fail_rate),
+            '--exit-code', str(args.exit_code)]
+
+
+def print_report(r: Dict) -> None:
+    c, s = r['client'], r['server']
+    if 'error' in c:
+        print(f"client failed: {c['error']}")
+    else:
+        print(f"load finished in {c['wall_s']}s")
+        print(f"{'request':<22} {'n':>6} {'p50 ms':>8} {'p90 ms':>8} {'p99 ms':>8} {'max ms':>8}  status")
+        for op, p in sorted(c['requests'].items()):
+            print(f"{op:<22} {p['n']:>6} {p['p50_ms']:>8} {p['p90_ms']:>8} {p['p99_ms']:>8} {p['max_ms']:>8}  "
+                  f"{p['status']}")
+        sse = c['sse']
+        for label, key in (('SSE first event', 'first_event'), ('SSE finished', 'finished')):
+            p = sse[key]
+            if p['n']:
+                print(f"{label:<22} {p['n']:>6} {p['p50_ms']:>8} {p['p90_ms']:>8} {p['p99_ms']:>8} {p['max_ms']:>8}")
+        print(f"SSE: {sse['subscribers']} subscribers, {sse['events']} events, {sse['mb']} MB, "
+              f"{sse['incomplete']} incomplete, {sse['errors']} errors")
+    lag = s['loop_lag']
+    if lag['n']:
+        worst = max(s['timeline'], key=lambda t: t['lag_max_ms'], default={})
+        print(f"event-loop lag: p50 {lag['p50_ms']} ms, p99 {lag['p99_ms']} ms, max {lag['max_ms']} ms"
+              + (f" (around t={worst['t']}s)" if worst else ''))
+    print(f"RSS: {s['rss_mb']['start']} -> {s['rss_mb']['end']} MB (peak {s['rss_mb']['peak']}), "
+          f"{s['rss_per_run_kb']} KB per run")
+    a = s['runs_after']
+    print(f"RUNS after load: {a['runs']} runs ({a['finished']} finished), {a['events']} buffered events, "
+          f"{a['line_mb']} MB of log lines")
+    idx = r['index']
+    w, lw = idx['write_tx'], idx['lock_wait']
+    if w['n']:
+        print(f"index: {w['n']} write tx, p50 {w['p50_ms']} ms, p99 {w['p99_ms']} ms, max {w['max_ms']} ms, "
+              f"{idx['write_tx_total_s']}s total on the loop; lock wait p99 {lw['p99_ms']} ms, "
+              f"max {lw['max_ms']} ms; {idx['busy_errors']} busy errors")
+
+
+def main() -> int:
+    ap = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    ap.add_argument('--client', help=argparse.SUPPRESS)
+    ap.add_argument('--ref', default='HEAD', help="git ref to load-test, or '.' for the working tree")
+    ap.add_argument('--runs', type=int, default=200, help='POST /api/run requests')
+    ap.add_argument('--run-tests', type=int, default=100, help='POST /api/run-test requests')
+    ap.add_argument('--subscribers', type=int, default=2, help='SSE clients per /api/run')
+    ap.add_argument('--pollers', type=int, default=20, help='clients polling GET /api/tests')
+    ap.add_argument('--poll-interval', type=float, default=0.5)
+    ap.add_argument('--ramp-s', type=float, default=2.0, help='seconds over which the runs are started')
+    ap.add_argument('--crew-lines', type=int, default=400)
+    ap.add_argument('--crew-duration', type=float, default=3.0)
+    ap.add_argument('--pw-lines', type=int, default=200)
+    ap.add_argument('--pw-duration', type=float, default=1.0)
+    ap.add_argument('--line-bytes', type=int, default=120)
+    ap.add_argument('--fail-rate', type=float, default=0.05)
+    ap.add_argument('--exit-code', type=int, default=1)
+    ap.add_argument('--crew-concurrency', type=int, default=64, help='SCHED_CREW_CONCURRENCY')
+    ap.add_argument('--playwright-concurrency', type=int, default=16, help='SCHED_PLAYWRIGHT_CONCURRENCY')
+    ap.add_argument('--max-backlog', type=int, default=1000, help='SCHED_MAX_BACKLOG')
+    ap.add_argument('--timeout', type=float, default=900.0)
+    ap.add_argument('--out', help='result file (default output/benchmarks/load-<commit>.json)')
+    ap.add_argument('--keep', action='store_true', help='keep the scratch tree')
+    args = ap.parse_args()
+    if args.client:
+        return client_main(json.loads(args.client))
+
+    scratch = Path(tempfile.mkdtemp(prefix='load-test-'))
+    root = scratch / 'tree'
+    root.mkdir()
+    try:
+        tree = export_tree(args.ref, root)
+        os.environ.pop('TEST_INDEX_DB', None)
+        os.environ.update({
+            'CREW_POOL_SIZE': '0',
+            'PLAYWRIGHT_MCP_SERVER': '0',
+            'PLAYWRIGHT_BROWSER_SERVER': '0',
+            'SCHED_CREW_CONCURRENCY': str(args.crew_concurrency),
+            'SCHED_PLAYWRIGHT_CONCURRENCY': str(args.playwright_concurrency),
+            'SCHED_MAX_BACKLOG': str(args.max_backlog),
+            'npm_config_offline': 'true',
+        })
+        sys.path.insert(0, str(root))
+        t0 = time.perf_counter()
+        import backend.server as server
+        import_s = time.perf_counter() - t0
+        server._crewai_cmd = lambda: _fake('crew', args)
+        server._find_playwright_cmd = lambda: _fake('playwright', args)
+        index = IndexProbe(server.INDEX)
+        print(f"load-testing {tree['commit'][:10]} ({args.ref}{', dirty' if tree['dirty'] else ''}): "
+              f"{args.runs} runs x {args.subscribers} subscribers, {args.run_tests} run-tests, "
+              f"{args.pollers} pollers", flush=True)
+        result = asyncio.run(serve_and_load(server, args, _free_port()))
+        result['index'] = index.report()
+        result.update(tree=tree, import_s=round(import_s, 3),
+                      config={k: v for k, v in vars(args).items() if k not in ('client', 'out', 'keep')})
+        print_report(result)
+        out = Path(args.out) if args.out else REPO_ROOT / 'output' / 'benchmarks' / f"load-{tree['commit'][:10]}.json"
+        out.parent.mkdir(parents=True, exist_ok=True)
+        out.write_text(json.dumps(result, indent=2), encoding='utf-8')
+        print(f'\nresults: {out}')
+    finally:
+        if args.keep:
+            print(f'scratch tree: {scratch}')
+        else:
+            shutil.rmtree(scratch, ignore_errors=True)
+    return 0 if 'error' not in result['client'] else 1
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,85 @@
+"""
+Backend startup benchmark.
+
+Times, in fresh interpreters, how long `import backend.server` takes and how
+long the first `GET /api/tests` takes after that. Fails when the median
+import exceeds the budget or the import pulls in crewai/mcp, so heavy
+imports cannot creep back into the API process.
+
+    python benchmarks/startup.py [--runs 5] [--budget 1.0]
+"""
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+from pathlib import Path
+
+REPO_ROOT = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(Path(__file__).resolve().parent))
+
+from e2e import export_tree  # noqa: E402
+
+_PROBE = r"""
+import asyncio, json, sys, time
+t0 = time.perf_counter()
+import backend.server as srv
+t1 = time.perf_counter()
+heavy = [m for m in ('crewai', 'mcp', 'test_agent.crew') if m in sys.modules]
+import httpx
+
+async def first_request():
+    transport = httpx.ASGITransport(app=srv.app)
+    async with httpx.AsyncClient(transport=transport, base_url='http://bench') as c:
+        r = await c.get('/api/tests')
+        r.raise_for_status()
+
+asyncio.run(first_request())
+t2 = time.perf_counter()
+print(json.dumps({'import_s': t1 - t0, 'first_request_s': t2 - t1, 'heavy': heavy}))
+"""
+
+
+def run_once(root: Path, env) -> dict:
+    out = subprocess.run([sys.executable, '-c', _PROBE], cwd=str(root), env=env,
+                         capture_output=True, text=True, check=True)
+    return json.loads(out.stdout.strip().splitlines()[-1])
+
+
+def main() -> int:
+    ap = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    ap.add_argument('--ref', default='.', help="git ref to measure, or '.' for the working tree")
+    ap.add_argument('--runs', type=int, default=5)
+    ap.add_argument('--budget', type=float, default=1.0, help='max median import time in seconds')
+    args = ap.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        root = Path(tmp) / 'tree'
+        root.mkdir()
+        export_tree(args.ref, root)
+        env = dict(os.environ, PLAYWRIGHT_MCP_SERVER='0', CREW_POOL_SIZE='0',
+                   PYTHONPATH=os.pathsep.join(filter(None, [str(root / 'src'), os.environ.get('PYTHONPATH')])))
+        env.pop('TEST_INDEX_DB', None)
+        samples = [run_once(root, env) for _ in range(max(1, args.runs))]
+
+    imports = [s['import_s'] for s in samples]
+    firsts = [s['first_request_s'] for s in samples]
+    median = statistics.median(imports)
+    print(f'import backend.server  median {median * 1000:.0f} ms  '
+          f'min {min(imports) * 1000:.0f} ms  max {max(imports) * 1000:.0f} ms')
+    print(f'first GET /api/tests   median {statistics.median(firsts) * 1000:.0f} ms')
+    heavy = sorted({m for s in samples for m in s['heavy']})
+    if heavy:
+        print(f"FAIL: importing the backend pulled in {', '.join(heavy)}")
+        return 1
+    if median > args.budget:
+        print(f'FAIL: startup over budget ({median:.2f}s > {args.budget:.2f}s)')
+        return 1
+    print(f'OK: within {args.budget:.2f}s budget')
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
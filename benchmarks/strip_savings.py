@@ -0,0 +1,104 @@
+"""
+Savings from cleaning task outputs in-process instead of with LLM tasks.
+
+Reads the crew telemetry spans in the test index and compares, per crew
+mode, runs that still had the `strip_*_backticks_task` stages with runs
+that did not: average wall-clock and tokens per run, and what the strip
+stages themselves cost. Then times `strip_code_fences` on representative
+outputs to show the guardrail's own cost.
+
+    python benchmarks/strip_savings.py [--db data/tests_index.sqlite3] [--runs 200]
+"""
+import argparse
+import os
+import sqlite3
+import statistics
+import sys
+import time
+from pathlib import Path
+
+REPO_ROOT = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(REPO_ROOT / 'src'))
+
+from test_agent.extraction import strip_code_fences  # noqa: E402
+
+STRIP_TASK = 'strip_%backticks%'
+
+_SAMPLES = {
+    'exploration': 'Here is the exploration data:\n```json\n'
+                   + ',\n'.join('{"role": "button", "label": "Item %d", "selector": "getByRole(\'button\')"}' % i
+                                for i in range(200))
+                   + '\n```\nLet me know if you need more.',
+    'script': 'Sure!\n```typescript\nimport { test, expect } from \'@playwright/test\';\n'
+              + '\n'.join("test('case %d', async ({ page }) => {\n  await page.goto('/');\n});" % i
+                          for i in range(50))
+              + '\n```\nThis covers every scenario.',
+}
+
+
+def _per_run(conn, where: str, params, runs: int):
+    sql = (
+        "SELECT run_id, mode, SUM(duration_s) AS duration_s, SUM(total_tokens) AS tokens, "
+        "SUM(CASE WHEN task LIKE ? THEN duration_s ELSE 0 END) AS strip_s, "
+        "SUM(CASE WHEN task LIKE ? THEN total_tokens ELSE 0 END) AS strip_tokens "
+        f"FROM task_spans GROUP BY run_id HAVING {where} ORDER BY MAX(id) DESC LIMIT ?"
+    )
+    return conn.execute(sql, [STRIP_TASK, STRIP_TASK] + list(params) + [runs]).fetchall()
+
+
+def _avg(rows, key):
+    vals = [r[key] or 0 for r in rows]
+    return statistics.mean(vals) if vals else None
+
+
+def report_spans(db: str, runs: int) -> None:
+    if not os.path.exists(db):
+        print(f'no telemetry database at {db}; skipping span comparison')
+        return
+    conn = sqlite3.connect(db)
+    conn.row_factory = sqlite3.Row
+    try:
+        before = _per_run(conn, 'SUM(task LIKE ?) > 0', [STRIP_TASK], runs)
+        after = _per_run(conn, 'SUM(task LIKE ?) = 0', [STRIP_TASK], runs)
+    except sqlite3.OperationalError as e:
+        print(f'cannot read task_spans from {db}: {e}')
+        return
+    finally:
+        conn.close()
+    modes = sorted({r['mode'] or '-' for r in before + after})
+    print(f"{'mode':<8} {'runs b/a':>9} {'strip s/run':>12} {'strip tok/run':>14} "
+          f"{'run s before':>13} {'run s after':>12} {'tok before':>11} {'tok after':>10}")
+    for mode in modes:
+        b = [r for r in before if (r['mode'] or '-') == mode]
+        a = [r for r in after if (r['mode'] or '-') == mode]
+        fmt = lambda v, spec: format(v, spec) if v is not None else '-'  # noqa: E731
+        print(f"{mode:<8} {f'{len(b)}/{len(a)}':>9} {fmt(_avg(b, 'strip_s'), '12.2f')} "
+              f"{fmt(_avg(b, 'strip_tokens'), '14.0f')} {fmt(_avg(b, 'duration_s'), '13.2f')} "
+              f"{fmt(_avg(a, 'duration_s'), '12.2f')} {fmt(_avg(b, 'tokens'), '11.0f')} "
+              f"{fmt(_avg(a, 'tokens'), '10.0f')}")
+    if not before:
+        print('no runs with strip tasks recorded; the before columns need telemetry from an older crew')
+
+
+def report_guardrail(iterations: int = 200) -> None:
+    for name, text in _SAMPLES.items():
+        t0 = time.perf_counter()
+        for _ in range(iterations):
+            strip_code_fences(text)
+        per_call = (time.perf_counter() - t0) / iterations
+        print(f'strip_code_fences({name}, {len(text)} chars): {per_call * 1e6:.0f} us per call, 0 tokens')
+
+
+def main() -> int:
+    ap = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    ap.add_argument('--db', default=os.environ.get('TEST_INDEX_DB')
+                    or str(REPO_ROOT / 'data' / 'tests_index.sqlite3'))
+    ap.add_argument('--runs', type=int, default=200, help='newest runs to compare on each side')
+    args = ap.parse_args()
+    report_spans(args.db, max(1, args.runs))
+    report_guardrail()
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
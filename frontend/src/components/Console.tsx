@@ -1,6 +1,21 @@
 import React, { useEffect, useRef } from 'react'
 
-export default function Console({ logs }: { logs: { line?: string; status?: string }[] }) {
+type QueueInfo = { position: number; eta_s: number; started: boolean; waited_s?: number }
+type ScenarioInfo = { index: number; titles: string[]; status: string; attempt?: number; position?: number }
+type LogMsg = { line?: string; status?: string; queue?: QueueInfo; scenario?: ScenarioInfo }
+
+function queueText(q: QueueInfo) {
+  if (q.started) return `== started (waited ${Math.round(q.waited_s ?? 0)}s) ==`
+  return `== queued: position ${q.position}, ETA ~${Math.round(q.eta_s)}s ==`
+}
+
+function scenarioText(s: ScenarioInfo) {
+  const where = s.status === 'queued' && s.position ? ` (position ${s.position})` : ''
+  const attempt = s.attempt && s.attempt > 1 ? `, attempt ${s.attempt}` : ''
+  return `== scenario ${s.index} ${s.titles.join(' / ')}: ${s.status}${where}${attempt} ==`
+}
+
+export default function Console({ logs }: { logs: LogMsg[] }) {
   const endRef = useRef<HTMLDivElement | null>(null)
   useEffect(() => { endRef.current?.scrollIntoView({ behavior: 'smooth' }) }, [logs])
   return (
@@ -8,8 +23,8 @@ export default function Console({ logs }: { logs: { line?: string; status?: stri
       <h2 className="text-white text-lg font-medium mb-3">Live Logs</h2>
       <div className="max-h-[50vh] overflow-auto">
         {logs.map((l, i) => (
-          <div key={i} className={l.status === 'finished' ? 'text-emerald-300' : ''}>
-            {l.line ?? (l.status ? `== ${l.status.toUpperCase()} ==` : '')}
+          <div key={i} className={l.status === 'finished' ? 'text-emerald-300' : l.queue ? 'text-amber-300' : l.scenario ? (l.scenario.status === 'failed' ? 'text-rose-300' : 'text-sky-300') : ''}>
+            {l.line ?? (l.queue ? queueText(l.queue) : l.scenario ? scenarioText(l.scenario) : l.status ? `== ${l.status.toUpperCase()} ==` : '')}
           </div>
         ))}
         <div ref={endRef} />
@@ -1,4 +1,7 @@
 import { useState } from "react";
+import { streamLogsUntilFinished } from "../lib/api";
+
+const MAX_LINES = 500;
 
 export default function RunTestButton({
   specSlug,
@@ -17,7 +20,7 @@ export default function RunTestButton({
       const res = await fetch(`/api/run-test`, {
         method: "POST",
         headers: { "Content-Type": "application/json" },
-        body: JSON.stringify({ spec, headed }),
+        body: JSON.stringify({ spec, headed, stream: true }),
       });
       const raw = await res.text();
       let data: any = {};
@@ -26,11 +29,23 @@ export default function RunTestButton({
         setOut(`HTTP ${res.status} ${res.statusText}\n${raw || "(no response body)"}`);
         return;
       }
-      setOut(
-        `Command: ${data.ran}\nStatus: ${data.status} (code ${data.returncode})\n\n${data.stdout}` +
-        (data.stderr ? `\n--- stderr ---\n${data.stderr}` : "")
-      );
-      if (onDone) onDone(data);    
+      // output arrives on the run's stream; keep only the last lines on screen
+      let lines: string[] = [];
+      let result: any = null;
+      await streamLogsUntilFinished(data.run_id, (msg) => {
+        if (msg?.line !== undefined) {
+          lines = [...lines, msg.line].slice(-MAX_LINES);
+          setOut(lines.join("\n"));
+        }
+        if (msg?.status === "finished") result = msg.result;
+      });
+      if (result) {
+        setOut(
+          `Command: ${result.ran ?? ""}\nStatus: ${result.status}${result.timed_out ? " (timed out)" : ""} (code ${result.returncode})\n` +
+          `Full log: ${result.log_url}\n\n${lines.join("\n")}`
+        );
+        if (onDone) onDone(result);
+      }
     } catch (e: any) {
       setOut(`Request failed: ${e?.message || e}`);
     } finally {
@@ -16,10 +16,22 @@ export async function startRun(payload: RunPayload): Promise<RunResponse> {
   return res.json();
 }
 
+// Each SSE event carries a batch (array) of messages; EventSource resends the
+// last event id on reconnect, so the server resumes where the stream left off.
+function eachMessage(data: string, fn: (msg: any) => void) {
+  const parsed = JSON.parse(data);
+  (Array.isArray(parsed) ? parsed : [parsed]).forEach(fn);
+}
+
 export function streamLogs(runId: string, onMessage: (data: any) => void) {
   const es = new EventSource(`/api/stream/${runId}`);
   es.onmessage = (e) => {
-    try { onMessage(JSON.parse(e.data)); } catch { /* ignore */ }
+    try {
+      eachMessage(e.data, (msg) => {
+        onMessage(msg);
+        if (msg?.status === 'finished') es.close();
+      });
+    } catch { /* ignore */ }
   };
   return () => es.close();
 }
@@ -37,8 +49,11 @@ export async function listArtifacts(): Promise<string[]> {
   return res.json();
 }
 
-export async function listTests(): Promise<any[]> {
-  const res = await fetch(`/api/tests?bust=${Date.now()}`, { cache: 'no-store' })
+export async function listTests(params: { status?: string; sort?: string; order?: 'asc' | 'desc'; limit?: number; offset?: number } = {}): Promise<any[]> {
+  // the server answers with an ETag; the browser revalidates and reuses the cached body on 304
+  const qs = new URLSearchParams()
+  for (const [k, v] of Object.entries(params)) if (v !== undefined && v !== '') qs.set(k, String(v))
+  const res = await fetch(`/api/tests${qs.toString() ? `?${qs}` : ''}`)
   if (!res.ok) throw new Error(await res.text())
   return res.json()
 }
@@ -94,18 +109,33 @@ export type Scenario = {
 export async function getScenarios(
   name: string,
   url: string,
-  desc: string
+  desc: string,
+  onProgress?: (msg: any) => void
 ): Promise<Scenario[]> {
-  const qs = new URLSearchParams({
-    application_url: url,
-    test_description: desc,
-  });
-  const res = await fetch(`/api/tests/${encodeURIComponent(name)}/scenarios?${qs.toString()}`, {
-    headers: { "Accept": "application/json" },
-    cache: "no-store",
+  // Ask for the scenarios; if they still have to be generated the backend answers
+  // 202 with a run id and we follow its progress before fetching the result.
+  const res = await fetch(`/api/tests/${encodeURIComponent(name)}/scenarios`, {
+    method: 'POST',
+    headers: { 'Content-Type': 'application/json', 'Accept': 'application/json' },
+    body: JSON.stringify({ application_url: url, test_description: desc }),
   });
   if (!res.ok) throw new Error(await res.text());
-  const data = await res.json();
+  const body = await res.json();
+  let data = body?.scenarios;
+  if (body?.status === 'generating') {
+    let failure: string | null = null;
+    await streamLogsUntilFinished(body.run_id, (msg) => {
+      if (msg?.scenarios === 'failed') failure = msg.error || 'Scenario generation failed.';
+      onProgress?.(msg);
+    });
+    if (failure) throw new Error(failure);
+    const again = await fetch(`/api/tests/${encodeURIComponent(name)}/scenarios`, {
+      headers: { "Accept": "application/json" },
+      cache: "no-store",
+    });
+    if (!again.ok) throw new Error(await again.text());
+    data = await again.json();
+  }
   if (!Array.isArray(data)) {
     throw new Error(`Expected array of scenarios, got ${typeof data}: ${JSON.stringify(data).slice(0, 100)}`);
   }
@@ -132,12 +162,13 @@ export function streamLogsUntilFinished(runId: string, onMessage: (data: any) =>
     const es = new EventSource(`/api/stream/${runId}`);
     es.onmessage = (e) => {
       try {
-        const msg = JSON.parse(e.data);
-        onMessage(msg);
-        if (msg?.status === 'finished') {
-          es.close();
-          resolve();
-        }
+        eachMessage(e.data, (msg) => {
+          onMessage(msg);
+          if (msg?.status === 'finished') {
+            es.close();
+            resolve();
+          }
+        });
       } catch {
 
       }
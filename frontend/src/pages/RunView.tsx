@@ -4,7 +4,7 @@ import Report from '../components/Report'
 import { streamLogs, fetchReport, listArtifacts } from '../lib/api'
 import { useParams } from 'react-router-dom'
 
-type LogMsg = { line?: string; status?: string }
+type LogMsg = { line?: string; status?: string; queue?: any; scenario?: any }
 
 export default function RunView() {
   const { runId } = useParams()
@@ -28,19 +28,20 @@ export default function ScenarioSelect() {
   const [rows, setRows] = useState<Row[]>([])
   const [loading, setLoading] = useState(true)
   const [err, setErr] = useState<string | null>(null)
+  const [planLogs, setPlanLogs] = useState<{ line?: string; status?: string; queue?: any; scenario?: any }[]>([])
 
   // Runner state
   const [running, setRunning] = useState(false)
   const [current, setCurrent] = useState<{ id: string; runId: string } | null>(null)
-  const [logs, setLogs] = useState<{ line?: string; status?: string }[]>([])
+  const [logs, setLogs] = useState<{ line?: string; status?: string; queue?: any; scenario?: any }[]>([])
   const [results, setResults] = useState<{ scenarioId: string; testName: string; reportUrl?: string }[]>([])
   const stopRef = useRef<null | (() => void)>(null)
 
   useEffect(() => {
     (async () => {
-      setLoading(true); setErr(null)
+      setLoading(true); setErr(null); setPlanLogs([])
       try {
-        const data = await getScenarios(name, application_url, fallbackDesc)
+        const data = await getScenarios(name, application_url, fallbackDesc, (msg) => setPlanLogs(prev => [...prev, msg]))
         setRows(data.map(d => ({ ...d, selected: true })))
       } catch (e:any) {
         setErr(e?.message || String(e))
@@ -90,7 +91,12 @@ export default function ScenarioSelect() {
 
   useEffect(() => () => { if (stopRef.current) stopRef.current() }, [])
 
-  if (loading) return <div className="text-white/80">Loading scenarios…</div>
+  if (loading) return (
+    <div className="space-y-4">
+      <div className="text-white/80">Loading scenarios…</div>
+      {!!planLogs.length && <Console logs={planLogs} />}
+    </div>
+  )
   if (err) return <div className="text-red-300">Error: {err}</div>
   if (!rows.length) return <div className="text-white/80">No scenarios were generated for this test.</div>
 
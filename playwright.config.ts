@@ -3,14 +3,17 @@ import * as dotenv from 'dotenv';
 dotenv.config();
 
 export default defineConfig({
-  testDir: 'tests',
+  // Crew runs point these at their own workspace so parallel runs don't collide.
+  testDir: process.env.PW_TEST_DIR || 'tests',
+  outputDir: process.env.PW_OUTPUT_DIR || 'test-results',
   timeout: 30 * 1000,
   expect: {
     timeout: 5000
   },
   fullyParallel: true,
   retries: 0,
-  workers: 1,
+  // PW_WORKERS (or --workers) raises parallelism, e.g. for /api/run-suite
+  workers: process.env.PW_WORKERS ? Number(process.env.PW_WORKERS) : 1,
   reporter: 'list',
   use: {
     actionTimeout: 0,
@@ -19,6 +22,8 @@ export default defineConfig({
     screenshot: 'only-on-failure', 
     viewport: { width: 1280, height: 720 },
     navigationTimeout: 30000,
+    // Set by CustomPlaywrightTool when a warm browser server is up (scripts/browser-server.mjs)
+    connectOptions: process.env.PW_BROWSER_WS ? { wsEndpoint: process.env.PW_BROWSER_WS } : undefined,
   },
 
   projects: [
@@ -0,0 +1,27 @@
+// Persistent Chromium for Playwright test runs. Prints its ws endpoint and the
+// cold launch time, then keeps the browser up until stdin closes or it is
+// signalled. Runs connect via `use.connectOptions` (PW_BROWSER_WS, see
+// playwright.config.ts) and each test still gets a fresh browser context.
+import { chromium } from 'playwright';
+
+const t0 = Date.now();
+const server = await chromium.launchServer({
+  headless: true,
+  host: process.env.PW_BROWSER_HOST || '127.0.0.1',
+  port: Number(process.env.PW_BROWSER_PORT || 0) || undefined,
+});
+console.log(`[browser-server] ws=${server.wsEndpoint()} launch_ms=${Date.now() - t0}`);
+
+let closing = false;
+const stop = async () => {
+  if (closing) return;
+  closing = true;
+  await server.close().catch(() => {});
+  process.exit(0);
+};
+process.on('SIGTERM', stop);
+process.on('SIGINT', stop);
+// the parent holds our stdin open; EOF means it went away
+process.stdin.on('end', stop);
+process.stdin.on('close', stop);
+process.stdin.resume();
@@ -1,38 +1,144 @@
 import os
+import time
 from dotenv import load_dotenv
 from typing import List
 from crewai import Agent, Crew, Task, Process
-from crewai.project import CrewBase, agent, crew, task
-from crewai_tools import MCPServerAdapter
-from mcp import StdioServerParameters
+from crewai.project import CrewBase, agent, task
+from crewai.tasks.task_output import TaskOutput
 
 from .tools.custom_tool import CustomPlaywrightTool
-from .tools.custom_tool import StripTripleBackticksTool
+from .extraction import strip_code_fences
+from .servers import endpoint_reachable
+from .llm_cache import build_llm
 from crewai.agents.agent_builder.base_agent import BaseAgent
 import re
 
 env_path = os.path.join(os.path.dirname(__file__), '..', '..', '..', '.env')
 load_dotenv(env_path)
 
-server_params = StdioServerParameters(
-    command="npx",
-    args=["-y", "@playwright/mcp@latest", "--isolated"]
+MCP_STDIO_ARGS = ["-y", "@playwright/mcp@latest", "--isolated"]
+
+# Shared Playwright MCP server (started by the backend, or by hand with
+# `npx @playwright/mcp@latest --port 8931 --isolated`). PLAYWRIGHT_MCP_URL=stdio
+# always launches a private server.
+DEFAULT_MCP_URL = "http://127.0.0.1:8931/sse"
+
+_stdio_adapter = None
+
+
+def _connect_mcp():
+    """
+    Return (adapter, owned). Over SSE every crew opens its own session, which the
+    isolated server backs with a fresh browser context; the adapter is owned by the
+    crew and closed after the run. Without a server, fall back to one stdio server
+    per process.
+    """
+    global _stdio_adapter
+    # crewai_tools and mcp take about a second to import; only MCP stages pay for it
+    from crewai_tools import MCPServerAdapter
+    from mcp import StdioServerParameters
+
+    t0 = time.perf_counter()
+    url = os.environ.get("PLAYWRIGHT_MCP_URL", DEFAULT_MCP_URL).strip()
+    if url not in ("", "stdio") and endpoint_reachable(url):
+        adapter = MCPServerAdapter({"url": url, "transport": "sse"})
+        print(f"[mcp] transport=sse ready in {time.perf_counter() - t0:.2f}s", flush=True)
+        return adapter, True
+    if _stdio_adapter is None:
+        _stdio_adapter = MCPServerAdapter(StdioServerParameters(command="npx", args=MCP_STDIO_ARGS))
+        print(f"[mcp] transport=stdio ready in {time.perf_counter() - t0:.2f}s", flush=True)
+    return _stdio_adapter, False
+
+
+def warm_up_mcp():
+    """
+    For long-lived workers: load the MCP client libraries, and start the stdio
+    fallback ahead of the first run when no shared server is up.
+    """
+    import crewai_tools, mcp  # noqa: F401
+    url = os.environ.get("PLAYWRIGHT_MCP_URL", DEFAULT_MCP_URL).strip()
+    if url in ("", "stdio") or not endpoint_reachable(url):
+        _connect_mcp()
+
+
+def fence_guardrail(output: TaskOutput):
+    """Strip code fences and surrounding prose in-process, so downstream context is clean."""
+    return True, strip_code_fences(output.raw)
+
+
+class FencedOutputTask(Task):
+    """
+    Task whose output is cleaned by `fence_guardrail`. crewai writes
+    `output_file` from the agent's raw answer rather than the guardrail's
+    result, so the saved file is cleaned here as well.
+    """
+
+    def _save_file(self, result):
+        super()._save_file(strip_code_fences(result) if isinstance(result, str) else result)
+
+
+# Pipeline stages in order: (task, agent that runs it, workspace file that can
+# stand in for its output when a mode starts after it). Agents are wired here
+# rather than in tasks.yaml, where CrewBase would build all of them (and
+# connect to MCP) as soon as the crew is instantiated.
+STAGES = (
+    ("exploration_task", "app_explorer", "exploration_data.json"),
+    ("test_case_writing_task", "test_case_writer", os.path.join("Testcases", "{test_name}_test_cases.json")),
+    ("script_generation_task", "script_generator", os.path.join("tests", "{test_name}.spec.ts")),
+    ("test_execution_and_fix_task", "test_executor", None),
 )
+MODE_STAGES = {
+    "full": tuple(name for name, _, _ in STAGES),
+    "plan": ("exploration_task", "test_case_writing_task"),
+    "explore": ("exploration_task",),
+    "script": ("script_generation_task",),
+    "execute": ("test_execution_and_fix_task",),
+}
+
 
 @CrewBase
 class TestAutomationCrew:
     agents: List[BaseAgent]
     tasks: List[Task]
 
-    mcp_adapter = MCPServerAdapter(server_params)
-    playwright_tool_runner = CustomPlaywrightTool()
-    strip_backticks_tool = StripTripleBackticksTool()
+    def __init__(self):
+        self._created = time.perf_counter()
+        self._mcp_adapter = None
+        self._owns_mcp_adapter = False
+        self._mcp_s = 0.0
+        self._playwright_tool = None
+        self.startup = None
+
+    def mcp_tools(self):
+        if self._mcp_adapter is None:
+            t0 = time.perf_counter()
+            self._mcp_adapter, self._owns_mcp_adapter = _connect_mcp()
+            self._mcp_s += time.perf_counter() - t0
+        return self._mcp_adapter.tools
+
+    def playwright_tool(self) -> CustomPlaywrightTool:
+        if self._playwright_tool is None:
+            self._playwright_tool = CustomPlaywrightTool()
+        return self._playwright_tool
+
+    def close(self):
+        """Release this run's MCP session (the shared stdio server stays up)."""
+        if self._mcp_adapter is not None and self._owns_mcp_adapter:
+            try:
+                self._mcp_adapter.stop()
+            except Exception:
+                pass
+        self._mcp_adapter = None
+
+    def _llm(self, name: str):
+        return build_llm(self.agents_config[name].get('llm'))
 
     @agent
     def app_explorer(self) -> Agent:
         return Agent(
             config=self.agents_config['app_explorer'],
-            tools=self.mcp_adapter.tools,
+            llm=self._llm('app_explorer'),
+            tools=self.mcp_tools(),
             verbose=False,
             allow_delegation=False,
             reasoning=True
@@ -42,6 +148,7 @@ class TestAutomationCrew:
     def test_case_writer(self) -> Agent:
         return Agent(
             config=self.agents_config['test_case_writer'],
+            llm=self._llm('test_case_writer'),
             verbose=False,
             allow_delegation=True,
             reasoning=True
@@ -51,7 +158,8 @@ class TestAutomationCrew:
     def script_generator(self) -> Agent:
         return Agent(
             config=self.agents_config['script_generator'],
-            tools=self.mcp_adapter.tools,
+            llm=self._llm('script_generator'),
+            tools=self.mcp_tools(),
             verbose=False,
             allow_delegation=True,
             reasoning=True
@@ -61,91 +169,111 @@ class TestAutomationCrew:
     def test_executor(self) -> Agent:
         return Agent(
             config=self.agents_config['test_executor'],
-            tools=[self.playwright_tool_runner] + list(self.mcp_adapter.tools),
+            llm=self._llm('test_executor'),
+            tools=[self.playwright_tool()] + list(self.mcp_tools()),
             verbose=False,
             allow_delegation=True,
             multimodal=True,
             reasoning=True
         )
-    
-    @agent
-    def post_processing_agent(self) -> Agent:
-        return Agent(
-            config=self.agents_config['post_processing_agent'],
-            tools=[self.strip_backticks_tool],
-            verbose=False,
-            allow_delegation=False,
-            reasoning=False
-      )
 
-    
+    # exploration, test case and script outputs are cleaned by a guardrail
+    # instead of a separate post-processing agent/LLM round-trip
     @task
     def exploration_task(self) -> Task:
-        return Task(config=self.tasks_config['exploration_task'])
-    
-    @task
-    def strip_exploration_backticks_task(self) -> Task:
-        return Task(config=self.tasks_config['strip_exploration_backticks_task'])
+        return FencedOutputTask(config=self.tasks_config['exploration_task'], guardrail=fence_guardrail)
 
     @task
     def test_case_writing_task(self) -> Task:
-        return Task(config=self.tasks_config['test_case_writing_task'])
-    
-    @task
-    def strip_testcases_backticks_task(self) -> Task:
-        return Task(config=self.tasks_config['strip_testcases_backticks_task'])
+        return FencedOutputTask(config=self.tasks_config['test_case_writing_task'], guardrail=fence_guardrail,
+                                context=[self.exploration_task()])
 
     @task
     def script_generation_task(self) -> Task:
-        return Task(config=self.tasks_config['script_generation_task'])
-    
-    @task
-    def strip_testscript_backticks_task(self) -> Task:
-        return Task(config=self.tasks_config['strip_testscript_backticks_task'])
+        return FencedOutputTask(config=self.tasks_config['script_generation_task'], guardrail=fence_guardrail,
+                                context=[self.exploration_task(), self.test_case_writing_task()])
 
     @task
     def test_execution_and_fix_task(self) -> Task:
-        return Task(config=self.tasks_config['test_execution_and_fix_task'])
+        return Task(config=self.tasks_config['test_execution_and_fix_task'],
+                    context=[self.script_generation_task()])
+
+    def _seed_output(self, task: Task, agent: str, filename: str) -> bool:
+        """
+        Use an artifact already present in the run workspace as a task's output:
+        downstream tasks read it through `context`, so the producing task (and
+        its agent) can be skipped.
+        """
+        path = os.path.join(os.environ.get("RUN_WORKSPACE", "output"), filename)
+        try:
+            with open(path, "r", encoding="utf-8") as f:
+                raw = f.read()
+        except OSError:
+            return False
+        task.output = TaskOutput(description=task.description, agent=agent, raw=raw)
+        print(f"[crew] using {path} for {agent}", flush=True)
+        return True
+
+    @staticmethod
+    def mode() -> str:
+        """
+        CREW_MODE selects the stages to run:
+          full     explore, write test cases, generate and execute the script (default)
+          plan     explore and write test cases (same as FAST_PLAN_ONLY=1)
+          explore  only explore the application
+          script   generate a script from the exploration data and test cases
+                   already in the workspace
+          execute  run and repair the script already in the workspace
+        """
+        mode = os.environ.get("CREW_MODE", "").strip().lower()
+        if not mode:
+            mode = "plan" if os.environ.get("FAST_PLAN_ONLY") == "1" else "full"
+        if mode not in ("full", "plan", "explore", "script", "execute"):
+            raise ValueError(f"Unknown CREW_MODE {mode!r}")
+        return mode
 
-    @crew
     def crew(self) -> Crew:
-        plan_only = os.environ.get("FAST_PLAN_ONLY") == "1"
-
-        base_tasks = [
-            self.exploration_task(),
-            self.strip_exploration_backticks_task(),
-            self.test_case_writing_task(),
-            self.strip_testcases_backticks_task(),
-        ]
-
-        full_tasks = base_tasks + [
-            self.script_generation_task(),
-            self.strip_testscript_backticks_task(),
-            self.test_execution_and_fix_task(),
-        ]
-
-        if plan_only:
-            agents = [
-                self.app_explorer(),
-                self.post_processing_agent(),
-                self.test_case_writer(),
-                self.post_processing_agent(),
-            ]
-            tasks = base_tasks
-        else:
-            agents = [
-                self.app_explorer(),
-                self.post_processing_agent(),
-                self.test_case_writer(),
-                self.post_processing_agent(),
-                self.script_generator(),
-                self.post_processing_agent(),
-                self.test_executor()
-            ]
-            tasks = full_tasks
+        """
+        Build the crew for CREW_MODE. Only the stages the mode runs get their
+        agent, so tools and the MCP connection are set up only when one of
+        them needs it; outputs of earlier stages come from the workspace.
+        """
+        mode = self.mode()
+        test_name = os.environ.get("TEST_NAME", "").strip()
+        agents = {name: agent_name for name, agent_name, _ in STAGES}
+        seeds = {name: seed for name, _, seed in STAGES if seed}
+        names = list(MODE_STAGES[mode])
+
+        if "exploration_task" in names and os.environ.get("EXPLORATION_CACHE_HIT") == "1" \
+                and self._seed_output(self.exploration_task(), "app_explorer", seeds["exploration_task"]):
+            if mode == "explore":
+                raise RuntimeError("CREW_MODE=explore with a cached exploration has nothing to do")
+            print("[crew] exploration cache hit, skipping app_explorer", flush=True)
+            names.remove("exploration_task")
+
+        tasks = [getattr(self, name)() for name in names]
+        for t in tasks:
+            for dep in t.context if isinstance(t.context, list) else []:
+                if dep.name in names or dep.output is not None:
+                    continue
+                filename = seeds[dep.name].format(test_name=test_name)
+                if not self._seed_output(dep, agents[dep.name], filename):
+                    raise RuntimeError(f"CREW_MODE={mode} needs {filename} in the workspace")
+        for t in tasks:
+            t.agent = getattr(self, agents[t.name])()
 
+        self.tasks = tasks
+        self.agents = list({id(t.agent): t.agent for t in tasks}.values())
+        self.startup = {
+            "mode": mode,
+            "stages": names,
+            "startup_s": round(time.perf_counter() - self._created, 3),
+            "mcp_s": round(self._mcp_s, 3),
+        }
+        print(f"[crew] mode={mode} stages={','.join(names)} startup={self.startup['startup_s']:.2f}s "
+              f"(mcp {self.startup['mcp_s']:.2f}s)", flush=True)
         return Crew(
-            agents=agents,
+            agents=self.agents,
             tasks=tasks,
             process=Process.sequential,
             verbose=True
@@ -0,0 +1,184 @@
+"""
+Pull structured content out of LLM output.
+
+Agents wrap their answers in code fences and prose ("Here is the plan:",
+"Let me know if..."). `find_json` locates the JSON document with
+`JSONDecoder.raw_decode`, trying '[' / '{' candidates in one forward pass
+and skipping everything a decoded document covers. `extract_spec` cuts a
+Playwright spec from its `@playwright/test` import to the last top-level
+closing bracket with a balanced-bracket scanner. It jumps from one bracket,
+quote, slash, backtick or fence line to the next, skips strings, comments,
+regex literals and the text of template literals, and stops at a closing
+fence.
+
+Only the standard library is used, so the backend can import this without
+pulling in crewai.
+"""
+import json
+import re
+from typing import Any, Optional, Tuple
+
+_DECODER = json.JSONDecoder()
+_MISSING = object()
+
+_JSON_START_RE = re.compile(r"[\[{]")
+_LINE_JSON_START_RE = re.compile(r"^[ \t]*([\[{])", re.M)
+_FENCE_LINE_RE = re.compile(r"^[ \t]*```[^\n]*\n?", re.M)
+_SPEC_IMPORT_RE = re.compile(r"""^[ \t]*import\b[^\n]*?from\s+['"]@playwright/test['"]""", re.M)
+
+# what the scanner stops at: a run of opening brackets, a closing bracket, a
+# whole string or comment, a slash, a backtick or a fence line; everything in
+# between is plain code
+_TOKEN_RE = re.compile(
+    r"""[\[{(]+|[\]})]
+    |'(?:[^'\\\n]|\\.)*'?|"(?:[^"\\\n]|\\.)*"?
+    |//[^\n]*|/\*.*?(?:\*/|\Z)
+    |[/`]
+    |\n[ \t]*```""",
+    re.S | re.X,
+)
+# rest of a template literal: up to its closing backtick or the next ${
+_TEMPLATE_RE = re.compile(r"(?:[^`\\$]|\\.|\$(?!\{))*(`|\$\{)?", re.S)
+# rest of a regex literal after its opening slash, e.g. /don't|[/]x/i
+_REGEX_BODY_RE = re.compile(r"(?:[^/\\\[\n]|\\.|\[(?:[^\]\\\n]|\\.)*\])+/[a-z]*")
+# a slash after one of these (or at the start) begins a regex, not a division
+_BEFORE_REGEX = set("(,=:[!&|?{};+-*%<>~^")
+_STATEMENT_END_RE = re.compile(r"[ \t]*;?")
+
+
+def _line_start(text: str, pos: int) -> bool:
+    i = pos - 1
+    while i >= 0 and text[i] in " \t":
+        i -= 1
+    return i < 0 or text[i] == "\n"
+
+
+def find_json(text: str, anywhere: bool = True) -> Optional[Tuple[int, int, Any]]:
+    """
+    (start, end, value) of the JSON array/object in `text`, or None.
+
+    Candidates at the start of a line win over ones inside a sentence;
+    with `anywhere=False` only line starts are considered. Each character is
+    decoded at most once.
+    """
+    fallback = None
+    candidates = (_JSON_START_RE if anywhere else _LINE_JSON_START_RE).finditer(text)
+    skip_to = 0
+    for m in candidates:
+        start = m.start(m.lastindex or 0)
+        if start < skip_to:
+            continue
+        at_line_start = not anywhere or _line_start(text, start)
+        if fallback is not None and not at_line_start:
+            continue
+        try:
+            value, end = _DECODER.raw_decode(text, start)
+        except json.JSONDecodeError as e:
+            # candidates nested in a document that broke off (e.g. truncated
+            # output) would only yield fragments of it; skipping them keeps this linear
+            skip_to = max(skip_to, e.pos)
+            continue
+        if at_line_start:
+            return start, end, value
+        fallback = fallback or (start, end, value)
+        skip_to = end
+    return fallback
+
+
+def extract_json(text: str, default: Any = _MISSING) -> Any:
+    """The JSON array/object in LLM output; `default` (or ValueError) when there is none."""
+    found = find_json(text)
+    if found is None:
+        if default is _MISSING:
+            raise ValueError("no JSON document found")
+        return default
+    return found[2]
+
+
+def _regex_start(code: str, slash: int) -> bool:
+    i = slash - 1
+    while i >= 0 and code[i] in " \t\r\n":
+        i -= 1
+    return i < 0 or code[i] in _BEFORE_REGEX or code[max(0, i - 5):i + 1] == "return"
+
+
+def _scan(code: str, pos: int, last_end: int, single_block: bool = False) -> int:
+    """
+    Walk balanced brackets from `pos`. Returns the index just past the last
+    bracket that brought the depth back to zero (and its ';'), or `last_end`
+    if none did. A fence line outside any bracket ends the code; with
+    `single_block` the first balanced block does.
+    """
+    depth = 0
+    # the depth each open `${` of a template literal started at, innermost last
+    templates: list = []
+    in_template = False
+    while True:
+        if in_template:
+            m = _TEMPLATE_RE.match(code, pos)
+            pos = m.end()
+            if m.group(1) is None:
+                return last_end  # unterminated template
+            if m.group(1) == "${":
+                templates.append(depth)
+            in_template = False
+            continue
+        m = _TOKEN_RE.search(code, pos)
+        if m is None:
+            return last_end
+        tok, pos = m.group(), m.end()
+        if tok[0] in "([{":
+            depth += len(tok)
+        elif tok in ")]}":
+            if tok == "}" and templates and templates[-1] == depth:
+                templates.pop()  # end of a `${`, back inside the template literal
+                in_template = True
+            else:
+                depth = max(0, depth - 1)
+                if depth == 0:
+                    if single_block:
+                        return pos
+                    last_end = _STATEMENT_END_RE.match(code, pos).end()
+        elif tok == "`":
+            in_template = True
+        elif tok == "/":
+            if _regex_start(code, m.start()):
+                body = _REGEX_BODY_RE.match(code, pos)
+                if body:
+                    pos = body.end()
+        elif tok[0] == "\n":
+            if depth == 0 and not templates:
+                return last_end  # fence line
+        # strings and comments carry no brackets
+
+
+def block_end(code: str, open_pos: int) -> int:
+    """Index just past the bracket closing the one at `open_pos`, or -1 if it never closes."""
+    return _scan(code, open_pos, -1, single_block=True)
+
+
+def extract_spec(text: str) -> Optional[str]:
+    """The Playwright spec in LLM output, from its `@playwright/test` import; None without one."""
+    # the regex tries every line start; the substring test rules most text out in C
+    m = _SPEC_IMPORT_RE.search(text) if "@playwright/test" in text else None
+    if m is None:
+        return None
+    start = m.start() + len(m.group()) - len(m.group().lstrip())
+    line_end = text.find("\n", m.end())
+    line_end = len(text) if line_end < 0 else line_end
+    return text[start:_scan(text, line_end, line_end)].rstrip()
+
+
+def strip_code_fences(text: str) -> str:
+    """
+    Clean generated output: a Playwright spec from its import to its last
+    top-level bracket, else the JSON document starting a line, else the text
+    with fence lines removed.
+    """
+    spec = extract_spec(text)
+    if spec is not None:
+        return spec
+    found = find_json(text, anywhere=False)
+    if found is not None:
+        return text[found[0]:found[1]]
+    return _FENCE_LINE_RE.sub("", text).replace("```", "").strip()
@@ -0,0 +1,180 @@
+"""
+Disk-backed cache of LLM responses for the crew agents.
+
+Responses are keyed on the model, the rendered messages, the tool schemas and
+the sampling parameters, and stored one file per key under LLM_CACHE_DIR.
+The run workspace path is masked in both keys and stored responses, so reruns
+of the same test in a fresh workspace still hit.
+
+LLM_CACHE selects the mode:
+  off           every call goes to the provider (default)
+  read-through  serve hits from disk, call the provider and store on a miss
+  replay        serve hits only; a miss raises LLMCacheMiss (offline runs)
+
+The directory is bounded to LLM_CACHE_MAX_MB; least recently used entries
+(by file mtime, refreshed on every hit) are evicted first.
+"""
+import hashlib
+import json
+import os
+import time
+from typing import Any, Dict, Optional
+
+from crewai import LLM
+
+MODES = ("off", "read-through", "replay")
+DEFAULT_DIR = os.path.join("output", "cache", "llm")
+_WORKSPACE_TOKEN = "<<RUN_WORKSPACE>>"
+
+
+class LLMCacheMiss(RuntimeError):
+    """Raised in replay mode when a prompt has no recorded response."""
+
+
+def cache_mode() -> str:
+    mode = os.environ.get("LLM_CACHE", "off").strip().lower() or "off"
+    if mode not in MODES:
+        raise ValueError(f"LLM_CACHE must be one of {', '.join(MODES)}; got {mode!r}")
+    return mode
+
+
+class LLMResponseCache:
+    def __init__(self, root: str, max_bytes: int):
+        self.root = root
+        self.max_bytes = max(1, max_bytes)
+        os.makedirs(root, exist_ok=True)
+        self.hits = 0
+        self.misses = 0
+        self.stores = 0
+        self.evictions = 0
+
+    def _path(self, key: str) -> str:
+        return os.path.join(self.root, f"{key}.json")
+
+    def get(self, key: str) -> Optional[Any]:
+        path = self._path(key)
+        try:
+            with open(path, "r", encoding="utf-8") as f:
+                entry = json.load(f)
+        except (OSError, ValueError):
+            self.misses += 1
+            return None
+        try:
+            os.utime(path)  # LRU bookkeeping
+        except OSError:
+            pass
+        self.hits += 1
+        return entry["response"]
+
+    def put(self, key: str, model: str, response: Any) -> None:
+        entry = {"model": model, "created_at": time.time(), "response": response}
+        path = self._path(key)
+        tmp = f"{path}.{os.getpid()}.tmp"
+        with open(tmp, "w", encoding="utf-8") as f:
+            json.dump(entry, f, ensure_ascii=False)
+        os.replace(tmp, path)
+        self.stores += 1
+        self._evict()
+
+    def _evict(self) -> None:
+        try:
+            entries = [e for e in os.scandir(self.root) if e.name.endswith(".json")]
+        except OSError:
+            return
+        sized = [(e.stat().st_mtime, e.stat().st_size, e.path) for e in entries]
+        total = sum(size for _, size, _ in sized)
+        if total <= self.max_bytes:
+            return
+        for _, size, path in sorted(sized):
+            try:
+                os.remove(path)
+            except OSError:
+                continue
+            self.evictions += 1
+            total -= size
+            if total <= self.max_bytes:
+                break
+
+    def stats(self) -> Dict:
+        lookups = self.hits + self.misses
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "stores": self.stores,
+            "evictions": self.evictions,
+            "hit_rate": round(self.hits / lookups, 3) if lookups else None,
+        }
+
+
+_cache: Optional[LLMResponseCache] = None
+
+
+def response_cache() -> LLMResponseCache:
+    """The process-wide cache, shared by every agent (and every job of a pool worker)."""
+    global _cache
+    if _cache is None:
+        _cache = LLMResponseCache(
+            os.environ.get("LLM_CACHE_DIR", DEFAULT_DIR),
+            max_bytes=int(float(os.environ.get("LLM_CACHE_MAX_MB", "512")) * 1024 * 1024),
+        )
+    return _cache
+
+
+def _mask(text: str, workspace: str) -> str:
+    return text.replace(workspace, _WORKSPACE_TOKEN) if workspace else text
+
+
+def _unmask(value: Any, workspace: str) -> Any:
+    if isinstance(value, str):
+        return value.replace(_WORKSPACE_TOKEN, workspace or "output")
+    return value
+
+
+class CachedLLM(LLM):
+    """crewai LLM whose `call` goes through the response cache first."""
+
+    def _cache_key(self, messages, tools) -> str:
+        workspace = os.environ.get("RUN_WORKSPACE", "").strip()
+        payload = json.dumps(
+            {
+                "model": self.model,
+                "messages": messages,
+                "tools": tools,
+                "stop": self.stop,
+                "temperature": self.temperature,
+                "top_p": self.top_p,
+                "seed": self.seed,
+                "response_format": getattr(self.response_format, "__name__", self.response_format),
+            },
+            sort_keys=True,
+            default=str,
+            ensure_ascii=False,
+        )
+        return hashlib.sha256(_mask(payload, workspace).encode("utf-8")).hexdigest()
+
+    def call(self, messages, tools=None, callbacks=None, available_functions=None,
+             from_task=None, from_agent=None):
+        mode = cache_mode()
+        if mode == "off":
+            return super().call(messages, tools, callbacks, available_functions, from_task, from_agent)
+
+        cache = response_cache()
+        workspace = os.environ.get("RUN_WORKSPACE", "").strip()
+        key = self._cache_key(messages, tools)
+        cached = cache.get(key)
+        if cached is not None:
+            return _unmask(cached, workspace)
+        if mode == "replay":
+            raise LLMCacheMiss(f"no recorded response for {self.model} (key {key[:12]}) in replay mode")
+
+        response = super().call(messages, tools, callbacks, available_functions, from_task, from_agent)
+        if isinstance(response, str):
+            cache.put(key, self.model, _mask(response, workspace))
+        return response
+
+
+def build_llm(llm: Any) -> Any:
+    """Wrap an agent's configured model in CachedLLM unless caching is off."""
+    if cache_mode() == "off" or not isinstance(llm, str):
+        return llm
+    return CachedLLM(model=llm)
@@ -1,12 +1,50 @@
 import asyncio
 import sys
 import os
+import shutil
+import time
 from test_agent.crew import TestAutomationCrew
+from test_agent.llm_cache import cache_mode, response_cache
+from test_agent.telemetry import TELEMETRY
 
 if sys.platform.startswith("win"):
     asyncio.set_event_loop_policy(asyncio.WindowsSelectorEventLoopPolicy())
 
 
+def _promote(src: str, dest: str):
+    # copy next to the destination first so the final rename is atomic
+    if not os.path.isfile(src):
+        return
+    os.makedirs(os.path.dirname(dest), exist_ok=True)
+    tmp = f"{dest}.{os.getpid()}.tmp"
+    shutil.copyfile(src, tmp)
+    os.replace(tmp, dest)
+
+
+def kickoff(inputs: dict):
+    TELEMETRY.start({"test_name": inputs.get("test_name"), "mode": TestAutomationCrew.mode(),
+                     "workspace": inputs.get("workspace")})
+    status = "failed"
+    automation = TestAutomationCrew()
+    try:
+        crew = automation.crew()
+        TELEMETRY.annotate(startup=automation.startup)
+        result = crew.kickoff(inputs=inputs)
+        status = "completed"
+    finally:
+        automation.close()
+        if cache_mode() != "off":
+            print(f"[llm-cache] mode={cache_mode()} {response_cache().stats()}", flush=True)
+        path = TELEMETRY.finish(inputs.get("workspace"), status)
+        if path:
+            print(f"[telemetry] {path}", flush=True)
+
+    print("\n=== Final Report ===\n")
+    print(result.raw)
+    print(f"\nSaved as {inputs['workspace']}/final_report.md")
+    return result
+
+
 def run():
     def _read(prompt: str, env_key: str) -> str:
         val = os.getenv(env_key)
@@ -19,18 +57,28 @@ def run():
     test_name         = _read("Enter test name: ", "TEST_NAME")
     test_description  = _read("Enter test description: ", "TEST_DESC")
 
+    # Every run writes into its own workspace. The backend passes one in and
+    # promotes the results itself; standalone CLI runs promote them here.
+    workspace = os.getenv("RUN_WORKSPACE", "").strip()
+    standalone = not workspace
+    if standalone:
+        workspace = f"output/runs/cli-{int(time.time() * 1000)}"
+        os.environ["RUN_WORKSPACE"] = workspace
+
     inputs = dict(
         application_url=application_url,
         test_name=test_name,
-        test_description=test_description
+        test_description=test_description,
+        workspace=workspace,
     )
 
-    crew = TestAutomationCrew().crew()
-    result = crew.kickoff(inputs=inputs)
+    kickoff(inputs)
 
-    print("\n=== Final Report ===\n")
-    print(result.raw)
-    print("\nSaved as output/final_report.md")
+    if not standalone:
+        return
+    _promote(f"{workspace}/tests/{test_name}.spec.ts", f"tests/{test_name}.spec.ts")
+    _promote(f"{workspace}/Testcases/{test_name}_test_cases.json", f"output/Testcases/{test_name}_test_cases.json")
+    _promote(f"{workspace}/final_report.md", "output/final_report.md")
 
 if __name__ == "__main__":
     run()
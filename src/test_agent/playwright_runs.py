@@ -0,0 +1,107 @@
+"""
+Stdlib-only helpers for Playwright runs, shared by the backend and
+CustomPlaywrightTool.
+
+Runs start in their own process group (session on POSIX) so a timeout can
+take down the whole tree: test runner, workers and browsers.
+`kill_process_group` stops a `subprocess.Popen` run (the tool) and
+`kill_process_group_async` an asyncio one (the backend). `iter_tests` walks
+the JSON reporter's nested suites once for both the backend's per-test rows
+and the tool's failure digest.
+"""
+import asyncio
+import os
+import re
+import signal
+import subprocess
+from typing import Dict, Iterator, List, Optional, Tuple
+
+ANSI_RE = re.compile(r"\x1b\[[0-9;]*[A-Za-z]")
+
+
+def process_group_kwargs() -> Dict:
+    if os.name == "nt":
+        return {"creationflags": subprocess.CREATE_NEW_PROCESS_GROUP}
+    return {"start_new_session": True}
+
+
+def _signal_group(pid: int, sig: int) -> bool:
+    try:
+        os.killpg(pid, sig)
+        return True
+    except ProcessLookupError:
+        return False
+
+
+def _taskkill(pid: int) -> None:
+    subprocess.run(["taskkill", "/F", "/T", "/PID", str(pid)], capture_output=True)
+
+
+def kill_process_group(proc: subprocess.Popen, grace_s: float = 5.0) -> None:
+    """Terminate the process and everything it spawned; SIGKILL after `grace_s`."""
+    if proc.poll() is not None:
+        return
+    if os.name == "nt":
+        _taskkill(proc.pid)
+        proc.wait()
+        return
+    if not _signal_group(proc.pid, signal.SIGTERM):
+        return
+    try:
+        proc.wait(timeout=grace_s)
+    except subprocess.TimeoutExpired:
+        _signal_group(proc.pid, signal.SIGKILL)
+        proc.wait()
+
+
+async def kill_process_group_async(proc: asyncio.subprocess.Process, grace_s: float = 5.0) -> None:
+    """`kill_process_group` for a process started with asyncio."""
+    if proc.returncode is not None:
+        return
+    if os.name == "nt":
+        _taskkill(proc.pid)
+        await proc.wait()
+        return
+    if not _signal_group(proc.pid, signal.SIGTERM):
+        return
+    try:
+        await asyncio.wait_for(proc.wait(), grace_s)
+    except asyncio.TimeoutError:
+        _signal_group(proc.pid, signal.SIGKILL)
+        await proc.wait()
+
+
+def strip_ansi(text: Optional[str]) -> str:
+    return ANSI_RE.sub("", text or "").strip()
+
+
+def _walk(suite: Dict, titles: List[str]) -> Iterator[tuple]:
+    for spec in suite.get("specs") or []:
+        yield titles, spec
+    for child in suite.get("suites") or []:
+        yield from _walk(child, titles + [child.get("title") or ""])
+
+
+def iter_tests(report: Dict) -> Iterator[Tuple[str, Optional[int], str, Dict]]:
+    """(file, line, 'describe › test' title, test entry) for every test in a JSON report."""
+    for file_suite in report.get("suites") or []:
+        for titles, spec in _walk(file_suite, []):
+            file = (spec.get("file") or file_suite.get("file") or "").replace("\\", "/")
+            title = " › ".join([t for t in titles if t] + [spec.get("title") or ""])
+            for test in spec.get("tests") or []:
+                yield file, spec.get("line"), title, test
+
+
+def final_result(test: Dict) -> Dict:
+    """The test's last attempt, or {} if it never ran."""
+    results = test.get("results") or []
+    return results[-1] if results else {}
+
+
+def result_error(result: Dict) -> Optional[Dict]:
+    return result.get("error") or next(iter(result.get("errors") or []), None)
+
+
+def error_location(err: Dict) -> Optional[str]:
+    loc = err.get("location") or {}
+    return f"{loc['file']}:{loc.get('line', 0)}:{loc.get('column', 0)}" if loc.get("file") else None
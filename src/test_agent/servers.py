@@ -0,0 +1,101 @@
+"""
+Stdlib-only helpers for the local servers shared by the backend and the crews.
+
+`endpoint_reachable` is the TCP probe both sides run before trusting an MCP
+or browser-server URL. `BrowserServer` owns one `scripts/browser-server.mjs`
+process (Playwright's `launchServer`): it starts it, waits for the ready line
+carrying the ws endpoint and the cold launch time, forwards the rest of its
+output and stops it through stdin EOF. The backend keeps one up for its
+lifetime (backend/browser_server.py); a crew started on its own launches one
+lazily (test_agent/tools/browser_server.py).
+"""
+import atexit
+import queue
+import re
+import socket
+import subprocess
+import threading
+import time
+from pathlib import Path
+from shutil import which
+from typing import Optional
+from urllib.parse import urlparse
+
+BROWSER_SERVER_SCRIPT = Path("scripts") / "browser-server.mjs"
+BROWSER_READY_RE = re.compile(r"\[browser-server\] ws=(\S+) launch_ms=(\d+)")
+
+
+def endpoint_reachable(url: str, timeout: float = 0.5) -> bool:
+    """True when something accepts TCP connections at the URL's host and port."""
+    parsed = urlparse(url)
+    try:
+        with socket.create_connection((parsed.hostname or "127.0.0.1", parsed.port or 80), timeout=timeout):
+            return True
+    except OSError:
+        return False
+
+
+class BrowserServer:
+    def __init__(self, cwd: Optional[str] = None, script: Path = BROWSER_SERVER_SCRIPT):
+        self.cwd = cwd
+        self.script = Path(script)
+        self.proc: Optional[subprocess.Popen] = None
+        self.ws: Optional[str] = None
+        self.launch_s: Optional[float] = None
+
+    @property
+    def running(self) -> bool:
+        return self.proc is not None and self.proc.poll() is None
+
+    def start(self, timeout: float = 60.0) -> bool:
+        """Launch the server and wait for its ws endpoint; False (and nothing left running) on failure."""
+        node = which("node")
+        if node is None or not (Path(self.cwd or ".") / self.script).exists():
+            return False
+        try:
+            self.proc = subprocess.Popen(
+                [node, str(self.script)], cwd=self.cwd, stdin=subprocess.PIPE, stdout=subprocess.PIPE,
+                stderr=subprocess.STDOUT, text=True, encoding="utf-8", errors="ignore",
+            )
+        except OSError as e:
+            print(f"[browser-server] failed to launch: {e}")
+            return False
+        lines: "queue.Queue[str]" = queue.Queue()
+        proc = self.proc
+
+        def drain():
+            # lines go to start() until the server is ready, then straight to our stdout
+            for line in proc.stdout:
+                if self.ws is None:
+                    lines.put(line.rstrip())
+                else:
+                    print(f"[browser-server] {line.rstrip()}", flush=True)
+
+        threading.Thread(target=drain, name="browser-server-drain", daemon=True).start()
+        atexit.register(self.stop)
+        deadline = time.monotonic() + timeout
+        while time.monotonic() < deadline:
+            try:
+                line = lines.get(timeout=0.25)
+            except queue.Empty:
+                if proc.poll() is not None:
+                    break
+                continue
+            m = BROWSER_READY_RE.search(line)
+            if m:
+                self.ws, self.launch_s = m.group(1), int(m.group(2)) / 1000
+                print(f"[browser-server] warm browser at {self.ws} (cold launch {self.launch_s:.2f}s)")
+                return True
+            print(f"[browser-server] {line}")
+        self.stop()
+        return False
+
+    def stop(self, timeout: float = 10.0) -> None:
+        if not self.running:
+            return
+        try:
+            self.proc.stdin.close()  # the script shuts down on EOF
+            self.proc.wait(timeout=timeout)
+        except (OSError, subprocess.TimeoutExpired):
+            self.proc.kill()
+            self.proc.wait()
@@ -0,0 +1,244 @@
+"""
+Per-task and per-agent telemetry for one crew kickoff.
+
+Listens on crewai's event bus and records, for every task: start and end
+time, LLM call count and time, prompt/completion/cached tokens (the delta of
+the agent's token counter over the task), estimated cost, tool calls split
+into MCP, CustomPlaywrightTool and other, tool errors and retries. `finish`
+writes the spans plus per-agent rollups to `{RUN_WORKSPACE}/telemetry.json`,
+which the backend ingests after each crew job.
+"""
+import json
+import os
+import threading
+import time
+from typing import Any, Dict, List, Optional
+
+from crewai.events import (
+    LLMCallCompletedEvent,
+    LLMCallFailedEvent,
+    LLMCallStartedEvent,
+    TaskCompletedEvent,
+    TaskFailedEvent,
+    TaskStartedEvent,
+    ToolUsageErrorEvent,
+    ToolUsageFinishedEvent,
+    crewai_event_bus,
+)
+
+TELEMETRY_FILE = "telemetry.json"
+_TOKEN_FIELDS = ("prompt_tokens", "completion_tokens", "cached_prompt_tokens", "total_tokens")
+
+
+def _tool_kind(name: str, tool_class: Any) -> str:
+    if name == "CustomPlaywrightTool":
+        return "playwright"
+    if "mcp" in str(tool_class).lower() or name.startswith("browser_"):
+        return "mcp"
+    return "other"
+
+
+def _tokens(agent: Any) -> Dict[str, int]:
+    proc = getattr(agent, "_token_process", None)
+    return {f: int(getattr(proc, f, 0) or 0) for f in _TOKEN_FIELDS}
+
+
+def _cost(model: Optional[str], prompt: int, completion: int) -> Optional[float]:
+    if not model or not (prompt or completion):
+        return None
+    try:
+        from litellm import cost_per_token
+        p, c = cost_per_token(model=model, prompt_tokens=prompt, completion_tokens=completion)
+        return round(p + c, 6)
+    except Exception:
+        return None
+
+
+class CrewTelemetry:
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._installed = False
+        self.reset()
+
+    def reset(self, meta: Optional[Dict] = None) -> None:
+        self.meta = dict(meta or {})
+        self.started_at = time.time()
+        self.spans: Dict[str, Dict] = {}
+        self.order: List[str] = []
+        self._llm_started: Dict[str, float] = {}
+        self._tokens_at_start: Dict[str, Dict[str, int]] = {}
+
+    def _span(self, task_id: Optional[str]) -> Optional[Dict]:
+        return self.spans.get(str(task_id)) if task_id is not None else None
+
+    # event handlers -----------------------------------------------------------
+
+    def on_task_started(self, _source, event: TaskStartedEvent) -> None:
+        task = event.task
+        if task is None:
+            return
+        tid = str(task.id)
+        agent = task.agent
+        with self._lock:
+            span = self.spans.get(tid)
+            if span is None:
+                span = self.spans[tid] = {
+                    "task": task.name or (task.description or "")[:60],
+                    "agent": getattr(agent, "role", None),
+                    "model": getattr(getattr(agent, "llm", None), "model", None),
+                    "started_at": time.time(),
+                    "ended_at": None,
+                    "duration_s": None,
+                    "status": "running",
+                    "attempts": 0,
+                    "llm_calls": 0,
+                    "llm_failures": 0,
+                    "llm_s": 0.0,
+                    **{f: 0 for f in _TOKEN_FIELDS},
+                    "cost_usd": None,
+                    "tool_calls": {"mcp": 0, "playwright": 0, "other": 0},
+                    "tool_s": 0.0,
+                    "tool_errors": 0,
+                    "tool_retries": 0,
+                }
+                self.order.append(tid)
+                self._tokens_at_start[tid] = _tokens(agent)
+            span["attempts"] += 1
+
+    def _end_task(self, task: Any, status: str) -> None:
+        if task is None:
+            return
+        tid = str(task.id)
+        with self._lock:
+            span = self.spans.get(tid)
+            if span is None:
+                return
+            now = _tokens(task.agent)
+            before = self._tokens_at_start.get(tid, {})
+            for f in _TOKEN_FIELDS:
+                span[f] = max(0, now[f] - before.get(f, 0))
+            span["ended_at"] = time.time()
+            span["duration_s"] = round(span["ended_at"] - span["started_at"], 3)
+            span["status"] = status
+            span["llm_s"] = round(span["llm_s"], 3)
+            span["tool_s"] = round(span["tool_s"], 3)
+            span["cost_usd"] = _cost(span["model"], span["prompt_tokens"], span["completion_tokens"])
+
+    def on_task_completed(self, _source, event: TaskCompletedEvent) -> None:
+        self._end_task(event.task, "completed")
+
+    def on_task_failed(self, _source, event: TaskFailedEvent) -> None:
+        self._end_task(event.task, "failed")
+
+    def on_llm_started(self, _source, event: LLMCallStartedEvent) -> None:
+        with self._lock:
+            span = self._span(event.task_id)
+            if span is not None:
+                span["llm_calls"] += 1
+                self._llm_started[str(event.task_id)] = time.perf_counter()
+
+    def _llm_done(self, task_id: Optional[str], failed: bool) -> None:
+        with self._lock:
+            span = self._span(task_id)
+            t0 = self._llm_started.pop(str(task_id), None)
+            if span is None:
+                return
+            if t0 is not None:
+                span["llm_s"] += time.perf_counter() - t0
+            if failed:
+                span["llm_failures"] += 1
+
+    def on_llm_completed(self, _source, event: LLMCallCompletedEvent) -> None:
+        self._llm_done(event.task_id, False)
+
+    def on_llm_failed(self, _source, event: LLMCallFailedEvent) -> None:
+        self._llm_done(event.task_id, True)
+
+    def on_tool_finished(self, _source, event: ToolUsageFinishedEvent) -> None:
+        with self._lock:
+            span = self._span(event.task_id)
+            if span is None:
+                return
+            span["tool_calls"][_tool_kind(event.tool_name, event.tool_class)] += 1
+            span["tool_retries"] += max(0, int(event.run_attempts or 1) - 1)
+            if event.started_at and event.finished_at:
+                span["tool_s"] += (event.finished_at - event.started_at).total_seconds()
+
+    def on_tool_error(self, _source, event: ToolUsageErrorEvent) -> None:
+        with self._lock:
+            span = self._span(event.task_id)
+            if span is not None:
+                span["tool_errors"] += 1
+
+    def install(self) -> None:
+        """Register the handlers on crewai's event bus (once per process)."""
+        if self._installed:
+            return
+        for event_type, handler in (
+            (TaskStartedEvent, self.on_task_started),
+            (TaskCompletedEvent, self.on_task_completed),
+            (TaskFailedEvent, self.on_task_failed),
+            (LLMCallStartedEvent, self.on_llm_started),
+            (LLMCallCompletedEvent, self.on_llm_completed),
+            (LLMCallFailedEvent, self.on_llm_failed),
+            (ToolUsageFinishedEvent, self.on_tool_finished),
+            (ToolUsageErrorEvent, self.on_tool_error),
+        ):
+            crewai_event_bus.on(event_type)(handler)
+        self._installed = True
+
+    # run lifecycle ------------------------------------------------------------
+
+    def start(self, meta: Dict) -> None:
+        self.install()
+        with self._lock:
+            self.reset(meta)
+
+    def annotate(self, **fields) -> None:
+        """Add run-level fields (e.g. crew startup) to the report."""
+        with self._lock:
+            self.meta.update(fields)
+
+    def report(self, status: str) -> Dict:
+        with self._lock:
+            tasks = [dict(self.spans[tid], tool_calls=dict(self.spans[tid]["tool_calls"])) for tid in self.order]
+        agents: Dict[str, Dict] = {}
+        for span in tasks:
+            a = agents.setdefault(span["agent"] or "unknown", {
+                "tasks": 0, "duration_s": 0.0, "llm_calls": 0, "llm_s": 0.0,
+                **{f: 0 for f in _TOKEN_FIELDS}, "cost_usd": None,
+                "tool_calls": {"mcp": 0, "playwright": 0, "other": 0}, "tool_errors": 0,
+            })
+            a["tasks"] += 1
+            a["duration_s"] = round(a["duration_s"] + (span["duration_s"] or 0), 3)
+            a["llm_calls"] += span["llm_calls"]
+            a["llm_s"] = round(a["llm_s"] + span["llm_s"], 3)
+            for f in _TOKEN_FIELDS:
+                a[f] += span[f]
+            if span["cost_usd"] is not None:
+                a["cost_usd"] = round((a["cost_usd"] or 0) + span["cost_usd"], 6)
+            for k, v in span["tool_calls"].items():
+                a["tool_calls"][k] += v
+            a["tool_errors"] += span["tool_errors"]
+        ended = time.time()
+        return {
+            "run": {**self.meta, "status": status, "started_at": self.started_at, "ended_at": ended,
+                    "duration_s": round(ended - self.started_at, 3)},
+            "tasks": tasks,
+            "agents": agents,
+        }
+
+    def finish(self, workspace: str, status: str) -> Optional[str]:
+        """Write the run's telemetry into the workspace; returns the path."""
+        path = os.path.join(workspace or "output", TELEMETRY_FILE)
+        try:
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            with open(path, "w", encoding="utf-8") as f:
+                json.dump(self.report(status), f, indent=2, default=str)
+        except OSError as e:
+            print(f"[telemetry] could not write {path}: {e}", flush=True)
+            return None
+        return path
+
+
+TELEMETRY = CrewTelemetry()
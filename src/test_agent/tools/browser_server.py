@@ -0,0 +1,49 @@
+"""
+Warm Chromium shared by CustomPlaywrightTool runs.
+
+`playwright test` normally cold-launches a browser on every call, and the
+repair loop calls it several times per test. With a browser server up,
+runs connect to it through `connectOptions` (PW_BROWSER_WS) and only open a
+fresh context per test.
+
+The backend starts one server for its lifetime and hands the endpoint to
+crews as PLAYWRIGHT_BROWSER_WS (plus PLAYWRIGHT_BROWSER_LAUNCH_S, the cold
+launch time it measured). A crew started on its own launches a server
+lazily for the life of the process. PLAYWRIGHT_BROWSER_SERVER=0 disables
+both, and any failure falls back to a cold launch. The process lifecycle
+lives in test_agent.servers, shared with the backend.
+"""
+import os
+import threading
+from typing import Optional, Tuple
+
+from ..servers import BrowserServer, endpoint_reachable
+
+
+class CrewBrowser:
+    def __init__(self):
+        self.server = BrowserServer()
+        self._failed = False
+        self._lock = threading.Lock()
+
+    def endpoint(self) -> Tuple[Optional[str], Optional[float]]:
+        """(ws endpoint, cold launch seconds) of a usable server, or (None, None)."""
+        if os.environ.get("PLAYWRIGHT_BROWSER_SERVER", "1") == "0":
+            return None, None
+        shared = os.environ.get("PLAYWRIGHT_BROWSER_WS", "").strip()
+        if shared:
+            if endpoint_reachable(shared):
+                launch = os.environ.get("PLAYWRIGHT_BROWSER_LAUNCH_S")
+                return shared, float(launch) if launch else None
+            return None, None
+        with self._lock:
+            if self.server.ws is None and not self._failed:
+                self._failed = not self.server.start()
+                if self._failed:
+                    print("[browser-server] did not start; running with cold browsers")
+            if self.server.ws and self.server.running:
+                return self.server.ws, self.server.launch_s
+        return None, None
+
+
+BROWSER_SERVER = CrewBrowser()
@@ -1,13 +1,34 @@
 from crewai.tools import BaseTool
 import os
 import subprocess
+import time
 from pathlib import Path
 from shutil import which
 
+from ..extraction import strip_code_fences
+from ..playwright_runs import kill_process_group, process_group_kwargs
+from .browser_server import BROWSER_SERVER
+from .failure_digest import digest
+
+# hard bound on one tool call, and on how much output goes back to the agent
+TOOL_TIMEOUT_S = float(os.environ.get("PLAYWRIGHT_TOOL_TIMEOUT_S", "300"))
+TOOL_OUTPUT_CAP = int(os.environ.get("PLAYWRIGHT_TOOL_OUTPUT_CAP", "4000"))
+
+
+def _clip(text: str, cap: int) -> str:
+    """Keep the head and the tail of `text` within about `cap` characters."""
+    if len(text) <= cap:
+        return text
+    half = cap // 2
+    return f"{text[:half]}\n[... {len(text) - 2 * half} chars truncated ...]\n{text[-half:]}"
+
+
+
 class CustomPlaywrightTool(BaseTool):
     name: str = "CustomPlaywrightTool"
     description: str = (
-        "Runs a Playwright .spec.ts file by name (e.g., tests/login.spec.ts) and returns result."
+        "Runs a Playwright .spec.ts file by name (e.g., tests/login.spec.ts) and returns result. "
+        "On failure, 'failures' lists each failing test with its error, locator, code frame and screenshot."
     )
 
     def _find_playwright_cmd(self):
@@ -20,11 +41,16 @@ class CustomPlaywrightTool(BaseTool):
         return None
 
     def _run(self, filename: str, **kwargs):
+        workspace = os.environ.get("RUN_WORKSPACE", "").strip()
         p = Path(filename)
         if not p.exists():
-            alt = Path("tests") / filename
-            if alt.exists():
-                p = alt
+            candidates = [Path("tests") / filename]
+            if workspace:
+                candidates.insert(0, Path(workspace) / "tests" / Path(filename).name)
+            for alt in candidates:
+                if alt.exists():
+                    p = alt
+                    break
         if not p.exists():
             return {"status": "fail", "stdout": "", "stderr": f"Spec not found: {filename}", "returncode": 2}
 
@@ -37,17 +63,69 @@ class CustomPlaywrightTool(BaseTool):
                 "returncode": 127,
             }
 
-        cmd = cmd_base + ["test", str(p)]
-        if os.environ.get("PLAYWRIGHT_HEADED", "").lower() in ("1", "true", "yes"):
+        # list for the agent to read, json for the backend to ingest per-test results
+        cmd = cmd_base + ["test", str(p), "--reporter=list,json"]
+        headed = os.environ.get("PLAYWRIGHT_HEADED", "").lower() in ("1", "true", "yes")
+        if headed:
             cmd.append("--headed")
 
-        result = subprocess.run(cmd, capture_output=True, text=True)
-        return {
-            "status": "pass" if result.returncode == 0 else "fail",
-            "stdout": result.stdout,
-            "stderr": result.stderr,
-            "returncode": result.returncode,
+        # Specs outside tests/ (per-run workspaces) need their own testDir/outputDir
+        env = os.environ.copy()
+        if p.resolve().parent != Path("tests").resolve():
+            env["PW_TEST_DIR"] = str(p.parent)
+        if workspace:
+            env["PW_OUTPUT_DIR"] = str(Path(workspace) / "test-results")
+        results_file = Path(workspace or "output") / "playwright-results.json"
+        env["PLAYWRIGHT_JSON_OUTPUT_NAME"] = env["PLAYWRIGHT_JSON_OUTPUT_FILE"] = str(results_file)
+
+        # connect to the warm browser server (headless only); each test gets a fresh context
+        ws, launch_s = (None, None) if headed else BROWSER_SERVER.endpoint()
+        env.pop("PW_BROWSER_WS", None)
+        if ws:
+            env["PW_BROWSER_WS"] = ws
+
+        try:
+            results_file.unlink()  # never digest a previous attempt's report
+        except OSError:
+            pass
+
+        t0 = time.perf_counter()
+        proc = subprocess.Popen(cmd, stdout=subprocess.PIPE, stderr=subprocess.PIPE, text=True,
+                                encoding="utf-8", errors="replace", env=env, **process_group_kwargs())
+        timed_out = False
+        try:
+            stdout, stderr = proc.communicate(timeout=TOOL_TIMEOUT_S)
+        except subprocess.TimeoutExpired:
+            timed_out = True
+            kill_process_group(proc)
+            stdout, stderr = proc.communicate()
+        duration = time.perf_counter() - t0
+        saved = launch_s if ws else None
+        print(f"[browser] mode={'warm' if ws else 'cold'} run={duration:.2f}s"
+              + (f" saved~{saved:.2f}s" if saved is not None else ""))
+
+        passed = proc.returncode == 0 and not timed_out
+        out = {
+            "status": "pass" if passed else "fail",
+            "returncode": proc.returncode,
+            "results_file": str(results_file),
+            "browser": "warm" if ws else "cold",
+            "duration_s": round(duration, 2),
+            "browser_launch_saved_s": round(saved, 2) if saved is not None else None,
         }
+        if timed_out:
+            out["error"] = f"Timed out after {TOOL_TIMEOUT_S:.0f}s; the test run was killed."
+        summary = None if passed else digest(str(results_file), cap=TOOL_OUTPUT_CAP)
+        if summary is not None:
+            # the digest replaces raw output; keep just the runner's closing lines
+            out.update(summary)
+            out["stdout"] = stdout[-600:]
+            out["stderr"] = stderr[-600:]
+        else:
+            out["stdout"] = _clip(stdout, TOOL_OUTPUT_CAP)
+            out["stderr"] = _clip(stderr, TOOL_OUTPUT_CAP // 2)
+        return out
+
 
 class StripTripleBackticksTool(BaseTool):
     name: str = "StripTripleBackticksTool"
@@ -57,42 +135,7 @@ class StripTripleBackticksTool(BaseTool):
         try:
             with open(filename, "r", encoding="utf-8") as f:
                 content = f.read()
-            cleaned = content.strip()
-            # Remove triple backticks from the start
-            if cleaned.startswith("```"):
-                cleaned = cleaned[3:].lstrip('\n')
-            # Remove triple backticks from the end
-            if cleaned.endswith("```"):
-                cleaned = cleaned[:-3].rstrip('\n')
-            # Remove any remaining triple backticks anywhere
-            cleaned = cleaned.replace("```", "")
-
-            lines = cleaned.splitlines()
-
-            # Content-based cleaning for Playwright test files
-            import_line = "import { test, expect } from '@playwright/test';"
-            if any(import_line in line for line in lines):
-                for idx, line in enumerate(lines):
-                    if import_line in line:
-                        lines = lines[idx:]
-                        break
-            # Content-based cleaning for JSON files
-            elif any(line.lstrip().startswith(('[', '{')) for line in lines):
-                while lines and not lines[0].lstrip().startswith(("[", "{")):
-                    lines.pop(0)
-
-            # Remove all lines after the last closing bracket (for code files)
-            brackets = ('}', ']', ')')
-            last_bracket_idx = None
-            for idx in range(len(lines) - 1, -1, -1):
-                if lines[idx].strip().endswith(brackets):
-                    last_bracket_idx = idx
-                    break
-            if last_bracket_idx is not None:
-                lines = lines[:last_bracket_idx + 1]
-
-            cleaned = "\n".join(lines)
-
+            cleaned = strip_code_fences(content)
             with open(filename, "w", encoding="utf-8") as f:
                 f.write(cleaned)
             return {"status": "success", "message": f"Backticks and extra text removed from {filename}"}
@@ -0,0 +1,99 @@
+"""
+Compact failure digests from Playwright's JSON report.
+
+The repair loop only needs, per failing test: which test, the error message,
+the locator it was waiting on, the code frame and the screenshot. Raw
+runner output is mostly progress lines, retries and call logs, and it grows
+every fix round's prompt. `digest` pulls those fields out of
+playwright-results.json (walked as the backend walks it, see
+test_agent.playwright_runs) and keeps the whole digest under a character cap.
+"""
+import json
+import re
+from typing import Dict, List, Optional
+
+from ..playwright_runs import ANSI_RE, error_location, final_result, iter_tests, result_error, strip_ansi
+
+_LOCATOR_RES = (
+    re.compile(r"(?m)^\s*Locator:\s*(.+?)\s*$"),
+    re.compile(r"waiting for ((?:locator|getBy\w+|frameLocator)\(.+?\))(?:\s|$)"),
+)
+MESSAGE_MAX_LINES = 8
+MESSAGE_MAX_CHARS = 800
+FRAME_MAX_LINES = 12
+
+
+def _message(raw: str) -> str:
+    # the call log repeats what the message and locator already say
+    text = raw.split("Call log:", 1)[0].rstrip()
+    lines = [l for l in text.splitlines() if l.strip()][:MESSAGE_MAX_LINES]
+    return "\n".join(lines)[:MESSAGE_MAX_CHARS]
+
+
+def _locator(raw: str) -> Optional[str]:
+    for rx in _LOCATOR_RES:
+        m = rx.search(raw)
+        if m:
+            return m.group(1)[:200]
+    return None
+
+
+def _frame(snippet: Optional[str]) -> Optional[str]:
+    lines = ANSI_RE.sub("", snippet or "").strip("\n").splitlines()
+    return "\n".join(lines[:FRAME_MAX_LINES]) or None
+
+
+def _entry(test: Optional[str], err: Dict, screenshot: Optional[str] = None) -> Dict:
+    raw = strip_ansi(err.get("message") or err.get("value") or err.get("stack"))
+    return {
+        "test": test,
+        "error": _message(raw),
+        "location": error_location(err),
+        "locator": _locator(raw),
+        "code_frame": _frame(err.get("snippet")),
+        "screenshot": screenshot,
+    }
+
+
+def failures(report: Dict) -> List[Dict]:
+    out = []
+    # errors outside any test: syntax errors, failed imports, bad config
+    for err in report.get("errors") or []:
+        out.append(_entry(None, err))
+    for file, line, title, test in iter_tests(report):
+        if test.get("status") != "unexpected":
+            continue
+        final = final_result(test)
+        err = result_error(final) or {}
+        shot = next((a.get("path") for a in final.get("attachments") or []
+                     if a.get("name") == "screenshot" and a.get("path")), None)
+        out.append(_entry(f"{file}:{line} › {title}", err, shot))
+    return out
+
+
+def digest(report_path: str, cap: int = 4000) -> Optional[Dict]:
+    """Failures from a JSON report, trimmed to about `cap` characters; None if unreadable."""
+    try:
+        with open(report_path, "r", encoding="utf-8") as f:
+            report = json.load(f)
+    except (OSError, ValueError):
+        return None
+    if not isinstance(report, dict):
+        return None
+    stats = report.get("stats") or {}
+    items = failures(report)
+    kept, size = [], 0
+    for item in items:
+        n = len(json.dumps(item, ensure_ascii=False))
+        if kept and size + n > cap:
+            break
+        kept.append(item)
+        size += n
+    return {
+        "passed": int(stats.get("expected") or 0),
+        "failed": int(stats.get("unexpected") or 0),
+        "flaky": int(stats.get("flaky") or 0),
+        "skipped": int(stats.get("skipped") or 0),
+        "failures": kept,
+        "omitted_failures": len(items) - len(kept),
+    }
@@ -0,0 +1,70 @@
+"""
+Long-lived crew worker used by the backend's worker pool.
+
+The worker imports the crew once and then reads one JSON job per line from
+stdin: {"id": str, "env": {...}}. The job env carries the same variables a
+`crewai run` would get (APP_URL, TEST_NAME, TEST_DESC, RUN_WORKSPACE, ...);
+they are applied for the duration of the job and restored afterwards.
+Crew output goes to stdout as usual and every job ends with a JOB_DONE line.
+"""
+import json
+import os
+import sys
+import traceback
+
+READY = "\x1e[crew-worker] ready"
+JOB_DONE = "\x1e[crew-worker] job-done "
+
+
+def _run_job(job: dict) -> int:
+    from test_agent.main import kickoff
+
+    job_env = {k: str(v) for k, v in (job.get("env") or {}).items()}
+    saved = {k: os.environ.get(k) for k in job_env}
+    os.environ.update(job_env)
+    try:
+        inputs = dict(
+            application_url=os.environ.get("APP_URL", "").strip(),
+            test_name=os.environ.get("TEST_NAME", "").strip(),
+            test_description=os.environ.get("TEST_DESC", "").strip(),
+            workspace=os.environ.get("RUN_WORKSPACE", "output").strip(),
+        )
+        kickoff(inputs)
+        return 0
+    except Exception:
+        traceback.print_exc(file=sys.stdout)
+        return 1
+    finally:
+        for k, v in saved.items():
+            if v is None:
+                os.environ.pop(k, None)
+            else:
+                os.environ[k] = v
+
+
+def serve():
+    # pay for the heavy imports (crewai, crewai_tools, mcp, pydantic) once
+    from test_agent.crew import warm_up_mcp
+
+    try:
+        warm_up_mcp()
+    except Exception as e:
+        print(f"[crew-worker] MCP warm-up failed: {e}", flush=True)
+
+    print(READY, flush=True)
+    for raw in sys.stdin:
+        raw = raw.strip()
+        if not raw:
+            continue
+        try:
+            job = json.loads(raw)
+        except ValueError:
+            print(f"[crew-worker] ignoring malformed job: {raw[:200]}", flush=True)
+            continue
+        rc = _run_job(job)
+        sys.stdout.flush()
+        print(JOB_DONE + json.dumps({"id": job.get("id"), "returncode": rc}), flush=True)
+
+
+if __name__ == "__main__":
+    serve()